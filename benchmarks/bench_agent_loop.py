@@ -0,0 +1,118 @@
+"""
+Benchmark: full run_agent_loop passes, non-interactive and offline. LinkedIn is replaced by the
+fixture site (signed-in feed, one search results page, job pages) and Ollama by the stub with
+simulated model speed. Every pass runs in a fresh working directory, so history, the store
+and the near-duplicate index start empty.
+
+Needs Chrome; reports the run as skipped otherwise.
+
+Usage: python -m benchmarks.bench_agent_loop [--passes 2] [--workers 1] [--http-fetch]
+                                             [--browser-workers 0] [--json results.json]
+"""
+import io
+import os
+import time
+import sqlite3
+import argparse
+import tempfile
+import contextlib
+from src.ollama_client import OllamaClient, DEFAULT_NUM_CTX
+from benchmarks.fixture_server import FixtureServer, LINKEDIN_ROUTES
+from benchmarks.stub_ollama import StubOllamaServer, AGENT_RESPONSE
+from benchmarks.report import summarize, start_browser, write_results
+
+def _count(db_path, sql):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(sql).fetchone()[0]
+    except sqlite3.Error:
+        return 0
+    finally:
+        conn.close()
+
+def run_pass(config, client):
+    """One run_agent_loop in a temporary working directory. Returns (seconds, drafts, log text)."""
+    from main import run_agent_loop # main.py lives at the repository root
+    cwd = os.getcwd()
+    log = io.StringIO()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(log):
+                run_agent_loop(dict(config), client, cache=None)
+            elapsed = time.perf_counter() - start
+            drafts = _count(os.path.join(tmp, "applications", "jobaru.db"), "SELECT COUNT(*) FROM drafts")
+        finally:
+            os.chdir(cwd)
+    return elapsed, drafts, log.getvalue()
+
+def run(passes=2, workers=1, http_fetch=False, browser_workers=0, latency=0.05, tokens_per_sec=400.0,
+        prefill_tps=4000.0, resume="sample_resume.txt"):
+    # Checked up front so a missing Chrome is reported as skipped rather than as a failed loop
+    browser, reason = start_browser()
+    if browser is None:
+        print(f"Skipped: {reason}")
+        return {"skipped": reason}
+    browser.quit()
+
+    with open(resume, "r", encoding="utf-8") as f:
+        resume_text = f.read()
+    samples, drafts, errors = [], [], 0
+    with FixtureServer(routes=LINKEDIN_ROUTES) as site, \
+         StubOllamaServer(response_text=AGENT_RESPONSE, latency=latency, tokens_per_sec=tokens_per_sec,
+                          prefill_tps=prefill_tps) as ollama:
+        client = OllamaClient(base_url=ollama.base_url, verbose=False, options={"num_ctx": DEFAULT_NUM_CTX})
+        config = {
+            "linkedin_base_url": site.base_url,
+            "headless": True,
+            "chrome_profile_dir": "",
+            "job_roles": ["Python Developer", "Data Engineer"],
+            "locations": ["Remote"],
+            "search_max_pages": 1,
+            "model": "stub",
+            "resume_text": resume_text,
+            "auto_apply": False,
+            "inference_workers": workers,
+            "http_fetch": http_fetch,
+            "browser_workers": browser_workers
+        }
+        for n in range(passes):
+            elapsed, count, log = run_pass(config, client)
+            if "Critical Error" in log:
+                errors += 1
+                print(f"Pass {n + 1}: failed - {log[log.index('Critical Error'):].splitlines()[0]}")
+                continue
+            samples.append(elapsed)
+            drafts.append(count)
+            print(f"Pass {n + 1}: {elapsed:.2f}s, {count} drafts")
+        metrics = client.metrics_summary()
+        client.close()
+    return {
+        "pass": summarize(samples),
+        "drafts_per_pass": drafts,
+        "failed_passes": errors,
+        "ollama_calls": metrics["calls"],
+        "settings": {"workers": workers, "http_fetch": http_fetch, "browser_workers": browser_workers,
+                     "latency": latency, "tokens_per_sec": tokens_per_sec, "prefill_tps": prefill_tps}
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline end-to-end agent loop benchmark")
+    parser.add_argument("--passes", type=int, default=2)
+    parser.add_argument("--workers", type=int, default=1, help="Inference workers")
+    parser.add_argument("--http-fetch", action="store_true", help="Fetch descriptions over HTTP first")
+    parser.add_argument("--browser-workers", type=int, default=0)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--tokens-per-sec", type=float, default=400.0)
+    parser.add_argument("--prefill-tps", type=float, default=4000.0)
+    parser.add_argument("--resume", default="sample_resume.txt")
+    parser.add_argument("--json", help="Write the results to this file")
+    args = parser.parse_args()
+    results = run(args.passes, args.workers, args.http_fetch, args.browser_workers, args.latency,
+                  args.tokens_per_sec, args.prefill_tps, args.resume)
+    if args.json:
+        write_results(args.json, {"agent_loop": results})
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Benchmark: the in-browser work of the agent loop against saved fixtures in headless Chrome.
+
+- cards: search-result card extraction with one injected script (LinkedIn.extract_cards)
+  vs. walking the cards element by element over WebDriver
+- description: DescriptionExtractor on each job page fixture
+- form: SmartFiller's one-script form snapshot vs. the element-by-element question scan
+
+Needs Chrome; reports the sections as skipped otherwise.
+
+Usage: python -m benchmarks.bench_browser [--rounds 20] [--json results.json]
+"""
+import io
+import os
+import argparse
+import tempfile
+import contextlib
+from selenium.webdriver.common.by import By
+from src.description import DescriptionExtractor, SelectorStats
+from src.filler import SmartFiller, FormSnapshot
+from src.history import ApplicationHistory
+from src.platforms.linkedin import LinkedIn, CARD_SELECTOR, CARD_ANCHOR_SELECTORS
+from benchmarks.fixture_server import FixtureServer, LINKEDIN_ROUTES
+from benchmarks.report import time_calls, start_browser, write_results
+
+JOB_PAGES = ["job_signed_in.html", "job_guest.html", "job_data_engineer.html", "job_frontend.html"]
+
+def _quiet(fn):
+    """fn with its progress prints swallowed, so timed loops don't flood the terminal."""
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            return fn()
+    return run
+
+def _walk_cards(driver):
+    """The per-element way: one WebDriver round-trip per card and per attribute."""
+    jobs = []
+    for card in driver.find_elements(By.CSS_SELECTOR, CARD_SELECTOR):
+        for sel in CARD_ANCHOR_SELECTORS:
+            anchors = card.find_elements(By.CSS_SELECTOR, sel)
+            if anchors and anchors[0].get_attribute("href"):
+                jobs.append({"title": anchors[0].text, "url": anchors[0].get_attribute("href")})
+                break
+    return jobs
+
+def bench_cards(browser, server, rounds):
+    with tempfile.TemporaryDirectory() as tmp:
+        history = ApplicationHistory(db_path=os.path.join(tmp, "bench.db"), legacy_path=None)
+        linkedin = LinkedIn(browser, {"linkedin_base_url": server.base_url}, history=history)
+        browser.navigate(linkedin.search_url("Python Developer", "Remote"), wait_for=CARD_SELECTOR, label="search results")
+        script, cards = time_calls(lambda: [linkedin._parse_card(c) for c in linkedin.extract_cards()], rounds)
+        walk, _ = time_calls(lambda: _walk_cards(browser.driver), rounds)
+        history.close()
+    print(f"Cards: {len(cards)} per page | one script {script['median_ms']:.1f} ms | "
+          f"element by element {walk['median_ms']:.1f} ms (median)")
+    return {"cards": len(cards), "script": script, "webdriver_walk": walk}
+
+def bench_description(browser, server, rounds):
+    extractor = DescriptionExtractor(stats=SelectorStats(path=None))
+    results = {}
+    for name in JOB_PAGES:
+        browser.navigate(server.url(name), label="job description")
+        timing, text = time_calls(_quiet(lambda: extractor.extract(browser)), rounds)
+        results[name] = {**timing, "chars": len(text)}
+        print(f"Description {name:24s} {timing['median_ms']:7.1f} ms (median)  {len(text):5d} chars")
+    return results
+
+def bench_form(browser, server, rounds):
+    browser.navigate(server.url("easy_apply_form.html"), label="easy apply form")
+    filler = SmartFiller(browser, {})
+    snapshot, snap = time_calls(lambda: FormSnapshot.capture(browser.driver), rounds)
+    decide, _ = time_calls(lambda: bool(snap.unanswered()) or bool(snap.errors), rounds)
+    legacy, _ = time_calls(_quiet(filler._has_unanswered_questions_legacy), rounds)
+    print(f"Form: {len(snap.fields)} fields | snapshot {snapshot['median_ms']:.1f} ms + decisions "
+          f"{decide['median_ms']:.3f} ms | element by element {legacy['median_ms']:.1f} ms (median)")
+    return {"fields": len(snap.fields), "snapshot": snapshot, "snapshot_decisions": decide, "legacy_scan": legacy}
+
+def run(rounds=20):
+    browser, reason = start_browser()
+    if browser is None:
+        print(f"Skipped: {reason}")
+        return {"skipped": reason}
+    try:
+        with FixtureServer(routes=LINKEDIN_ROUTES) as server:
+            return {
+                "cards": bench_cards(browser, server, rounds),
+                "description": bench_description(browser, server, rounds),
+                "form": bench_form(browser, server, rounds)
+            }
+    finally:
+        browser.quit()
+
+def main():
+    parser = argparse.ArgumentParser(description="In-browser extraction and form scan benchmark")
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--json", help="Write the results to this file")
+    args = parser.parse_args()
+    results = run(args.rounds)
+    if args.json:
+        write_results(args.json, {"browser": results})
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Benchmark: HTTP fast path for job descriptions (pooled requests session + BeautifulSoup)
+against saved job pages served locally. Also checks each fixture lands on the expected
+path: server-rendered pages are extracted, the client-rendered shell falls back.
+
+Usage: python -m benchmarks.bench_description_fetch [--rounds 200]
+"""
+import argparse
+import time
+from src.description import HttpDescriptionFetcher, MIN_DESCRIPTION_CHARS
+from benchmarks.fixture_server import FixtureServer
+
+# fixture -> expected to be served by the fast path
+FIXTURES = {
+    "job_guest.html": True,
+    "job_signed_in.html": True,
+    "job_spa_shell.html": False
+}
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP description fetch benchmark")
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    failures = 0
+    with FixtureServer() as server:
+        fetcher = HttpDescriptionFetcher()
+        for name, expect_hit in FIXTURES.items():
+            url = server.url(name)
+            fetcher.fetch(url) # Warm the connection
+            start = time.perf_counter()
+            for _ in range(args.rounds):
+                text = fetcher.fetch(url)
+            elapsed = time.perf_counter() - start
+            hit = len(text) >= MIN_DESCRIPTION_CHARS
+            status = "ok" if hit == expect_hit else "UNEXPECTED"
+            failures += hit != expect_hit
+            path = "fast path" if hit else "browser fallback"
+            print(f"{name:22s} {elapsed * 1000 / args.rounds:7.2f} ms/page  {len(text):5d} chars  {path:16s} [{status}]")
+        fetcher.close()
+
+    print(f"Rounds per fixture: {args.rounds}")
+    if failures:
+        raise SystemExit(f"{failures} fixture(s) took an unexpected path")
+
+if __name__ == "__main__":
+    main()
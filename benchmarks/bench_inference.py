@@ -0,0 +1,101 @@
+"""
+Benchmark: process_job_application against the stub Ollama server with simulated model speed,
+per mode (two calls per job vs. single pass) and candidate text (raw resume vs. compiled profile).
+Reports wall time per job, prompt tokens per call and the generation rate seen by the client.
+Also checks the section headings found in each job page: body lines that merely start with a
+section keyword ("Experience with BigQuery ...", "About 20% travel ...") must stay body text.
+
+Usage: python -m benchmarks.bench_inference [--jobs 5] [--latency 0.05] [--tokens-per-sec 400]
+                                            [--prefill-tps 4000] [--json results.json]
+"""
+import io
+import os
+import time
+import argparse
+import contextlib
+from src.agent import process_job_application
+from src.candidate import compile_profile, render_profile
+from src.description import extract_from_html
+from src.prompts import split_sections
+from src.ollama_client import OllamaClient, DEFAULT_NUM_CTX
+from benchmarks.fixture_server import FIXTURES_DIR
+from benchmarks.stub_ollama import StubOllamaServer, AGENT_RESPONSE
+from benchmarks.report import summarize, write_results
+
+# fixture -> expected section headings, in document order
+JOB_PAGES = {
+    "job_signed_in.html": ["About the job", "What you'll do", "What we're looking for"],
+    "job_data_engineer.html": ["About the job", "Responsibilities", "Qualifications", "Nice to have", "About Northwind"],
+    "job_frontend.html": ["About the job", "What you will do", "Requirements", "Benefits"]
+}
+
+def load_descriptions():
+    descriptions = []
+    failures = 0
+    for name, expected in JOB_PAGES.items():
+        with open(os.path.join(FIXTURES_DIR, name), "r", encoding="utf-8") as f:
+            descriptions.append(extract_from_html(f.read()))
+        headings = [s["heading"] for s in split_sections(descriptions[-1]) if s["heading"]]
+        status = "ok" if headings == expected else f"UNEXPECTED: {headings}"
+        failures += headings != expected
+        print(f"Sections {name:24s} {len(headings)} headings [{status}]")
+    if failures:
+        raise SystemExit(f"{failures} fixture(s) split into unexpected sections")
+    return descriptions
+
+def bench_case(client, candidate, descriptions, jobs, single_pass):
+    client.metrics.clear()
+    samples = []
+    for i in range(jobs):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = process_job_application(candidate, descriptions[i % len(descriptions)], model="stub",
+                                             client=client, single_pass=single_pass)
+        samples.append(time.perf_counter() - start)
+        if "error" in result:
+            raise SystemExit(f"process_job_application failed: {result}")
+    calls = list(client.metrics)
+    eval_ms = sum(c["eval_ms"] for c in calls)
+    return {
+        **summarize(samples),
+        "calls_per_job": len(calls) / jobs,
+        "prompt_tokens_per_call": round(sum(c["prompt_eval_count"] for c in calls) / len(calls)),
+        "tokens_per_sec": round(sum(c["eval_count"] for c in calls) / (eval_ms / 1000), 1) if eval_ms else None
+    }
+
+def run(jobs=5, latency=0.05, tokens_per_sec=400.0, prefill_tps=4000.0, resume="sample_resume.txt"):
+    with open(resume, "r", encoding="utf-8") as f:
+        resume_text = f.read()
+    descriptions = load_descriptions()
+    results = {}
+    with StubOllamaServer(response_text=AGENT_RESPONSE, latency=latency, tokens_per_sec=tokens_per_sec,
+                          prefill_tps=prefill_tps) as server:
+        client = OllamaClient(base_url=server.base_url, verbose=False, options={"num_ctx": DEFAULT_NUM_CTX})
+        profile = compile_profile(resume_text, "stub", client=client)
+        candidates = {"resume": resume_text, "profile": render_profile(profile)}
+        for mode, single_pass in (("two_pass", False), ("single_pass", True)):
+            for kind, candidate in candidates.items():
+                case = f"{mode}.{kind}"
+                results[case] = bench_case(client, candidate, descriptions, jobs, single_pass)
+                r = results[case]
+                print(f"{case:20s} {r['median_ms']:8.1f} ms/job (median) | {r['calls_per_job']:.0f} calls/job | "
+                      f"{r['prompt_tokens_per_call']:5d} prompt tokens/call | {r['tokens_per_sec']} tok/s")
+        client.close()
+    results["settings"] = {"jobs": jobs, "latency": latency, "tokens_per_sec": tokens_per_sec, "prefill_tps": prefill_tps}
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="process_job_application benchmark against a simulated model")
+    parser.add_argument("--jobs", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds added to every generation")
+    parser.add_argument("--tokens-per-sec", type=float, default=400.0, help="Simulated generation speed")
+    parser.add_argument("--prefill-tps", type=float, default=4000.0, help="Simulated prompt evaluation speed")
+    parser.add_argument("--resume", default="sample_resume.txt")
+    parser.add_argument("--json", help="Write the results to this file")
+    args = parser.parse_args()
+    results = run(args.jobs, args.latency, args.tokens_per_sec, args.prefill_tps, args.resume)
+    if args.json:
+        write_results(args.json, {"inference": results})
+
+if __name__ == "__main__":
+    main()
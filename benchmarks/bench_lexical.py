@@ -0,0 +1,50 @@
+"""
+Benchmark: batch BM25 scoring of synthetic job descriptions with LexicalScorer.
+
+Usage: python -m benchmarks.bench_lexical [--jobs 3000] [--resume sample_resume.txt]
+"""
+import argparse
+import random
+import time
+from src.lexical import LexicalScorer, SKILL_TERMS
+
+FILLER = ("we are a fast growing company building products customers love our engineers own features end to end "
+          "you will collaborate with product design and data partners to ship reliable services at scale "
+          "benefits include health dental vision equity and flexible remote work").split()
+
+def synthetic_descriptions(n, seed=42):
+    rng = random.Random(seed)
+    skills = sorted(SKILL_TERMS)
+    docs = []
+    for _ in range(n):
+        words = rng.choices(FILLER, k=rng.randint(150, 400)) + rng.sample(skills, rng.randint(5, 20))
+        rng.shuffle(words)
+        docs.append(" ".join(words))
+    return docs
+
+def main():
+    parser = argparse.ArgumentParser(description="Lexical scorer throughput benchmark")
+    parser.add_argument("--jobs", type=int, default=3000)
+    parser.add_argument("--resume", default="sample_resume.txt")
+    args = parser.parse_args()
+
+    with open(args.resume, "r", encoding="utf-8") as f:
+        resume_text = f.read()
+    docs = synthetic_descriptions(args.jobs)
+
+    start = time.perf_counter()
+    scorer = LexicalScorer(resume_text)
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    ranked = scorer.score_batch(docs)
+    elapsed = time.perf_counter() - start
+
+    print(f"Vocabulary: {len(scorer.vocab)} resume terms (built in {build * 1000:.2f} ms)")
+    print(f"Scored {len(docs)} descriptions in {elapsed * 1000:.1f} ms ({elapsed * 1e6 / len(docs):.1f} us/job)")
+    best = ranked[0]
+    print(f"Top match: #{best['index']} bm25={best['bm25']} score={best['match_score']} "
+          f"matched={best['matched_skills'][:5]} missing={best['missing_skills'][:5]}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Micro-benchmark: per-call overhead of a fresh connection per request
+(module-level requests.post, the old behaviour) vs. the pooled OllamaClient.
+
+Usage: python -m benchmarks.bench_ollama_client [--calls 500]
+"""
+import argparse
+import time
+import requests
+from src.ollama_client import OllamaClient
+from benchmarks.stub_ollama import StubOllamaServer
+
+def bench_unpooled(base_url, calls):
+    payload = {"model": "stub", "prompt": "ping", "stream": False}
+    start = time.perf_counter()
+    for _ in range(calls):
+        requests.post(f"{base_url}/api/generate", json=payload).json()
+    return time.perf_counter() - start
+
+def bench_pooled(base_url, calls):
+    client = OllamaClient(base_url=base_url, verbose=False)
+    start = time.perf_counter()
+    for _ in range(calls):
+        client.generate_response("ping", model="stub")
+    elapsed = time.perf_counter() - start
+    client.close()
+    return elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="Ollama client connection overhead benchmark")
+    parser.add_argument("--calls", type=int, default=500)
+    args = parser.parse_args()
+
+    with StubOllamaServer() as server:
+        # Warm up both paths once so imports/DNS don't skew the first sample
+        bench_unpooled(server.base_url, 5)
+        bench_pooled(server.base_url, 5)
+
+        before = bench_unpooled(server.base_url, args.calls)
+        after = bench_pooled(server.base_url, args.calls)
+
+    print(f"Calls per path: {args.calls}")
+    print(f"Before (new connection per call): {before * 1000 / args.calls:.3f} ms/call")
+    print(f"After  (pooled keep-alive session): {after * 1000 / args.calls:.3f} ms/call")
+    print(f"Speedup: {before / after:.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Serves the saved HTML pages in benchmarks/fixtures over local HTTP/1.1 (keep-alive),
+so page fetching and parsing can be measured without touching the network.
+With LINKEDIN_ROUTES it also stands in for the LinkedIn pages the agent loop visits.
+"""
+import os
+import re
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# URL (regex over the path, or the path and query string) -> fixture file, first match wins.
+# The search fixtures' job links end in digits that spread them over near-duplicate and
+# distinct job pages. Data Engineer searches get a page with date-only <time datetime>
+# values, as LinkedIn often serves them.
+LINKEDIN_ROUTES = [
+    (r"/feed/?", "linkedin_feed.html"),
+    (r"/robots\.txt", "robots.txt"),
+    (r"/jobs/search/?\?(.*&)?keywords=Data\+Engineer(&.*)?", "search_results_date_only.html"),
+    (r"/jobs/search/?", "search_results.html"),
+    (r"/jobs/view/\d*[1-3]/?", "job_signed_in.html"),
+    (r"/jobs/view/\d*[45]/?", "job_guest.html"),
+    (r"/jobs/view/\d*[6-8]/?", "job_data_engineer.html"),
+    (r"/jobs/view/\d*[90]/?", "job_frontend.html")
+]
+
+class QuietFixtureHandler(SimpleHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass # Keep benchmark output clean
+
+    def translate_path(self, path):
+        route = path.split("?", 1)[0]
+        for pattern, name in self.server.routes:
+            if re.fullmatch(pattern, path) or re.fullmatch(pattern, route):
+                return super().translate_path("/" + name)
+        return super().translate_path(path)
+
+class FixtureServer:
+    """Runs a static file server for the fixtures on a background thread. Use as a context manager."""
+    def __init__(self, directory=FIXTURES_DIR, host="127.0.0.1", port=0, routes=()):
+        """
+        :param routes: [(path regex, fixture name)] served instead of the literal path (e.g. LINKEDIN_ROUTES)
+        """
+        self.httpd = ThreadingHTTPServer((host, port), partial(QuietFixtureHandler, directory=directory))
+        self.httpd.daemon_threads = True
+        self.httpd.routes = list(routes)
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def url(self, name):
+        return f"{self.base_url}/{name}"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -0,0 +1,101 @@
+"""
+Shared helpers for the benchmark runners: timing statistics, JSON results files and
+comparison against a baseline run, plus a headless browser for the browser benchmarks.
+"""
+import os
+import sys
+import json
+import time
+import platform
+import statistics
+import subprocess
+
+def summarize(samples):
+    """Timing statistics in ms for a list of durations in seconds."""
+    ms = sorted(s * 1000 for s in samples)
+    if not ms:
+        return {"runs": 0}
+    return {
+        "runs": len(ms),
+        "min_ms": round(ms[0], 3),
+        "median_ms": round(statistics.median(ms), 3),
+        "mean_ms": round(statistics.fmean(ms), 3),
+        "p95_ms": round(ms[min(len(ms) - 1, int(len(ms) * 0.95))], 3)
+    }
+
+def time_calls(fn, rounds, warmup=1):
+    """Calls fn() warmup + rounds times; returns (summary of the timed rounds, last result)."""
+    result = None
+    for _ in range(warmup):
+        result = fn()
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - start)
+    return summarize(samples), result
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+def write_results(path, results):
+    """Writes {"meta": ..., "results": results} to path, for comparison with later runs."""
+    data = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "commit": _git_commit(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform()
+        },
+        "results": results
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    print(f"Results written to {path}")
+
+def _medians(results, prefix=""):
+    """{"bench.case": median_ms} for every timing summary nested in results."""
+    out = {}
+    for key, value in results.items():
+        if isinstance(value, dict):
+            if "median_ms" in value:
+                out[f"{prefix}{key}"] = value["median_ms"]
+            else:
+                out.update(_medians(value, f"{prefix}{key}."))
+    return out
+
+def compare(results, baseline_path, tolerance=0.2):
+    """
+    Prints the median change of every timing also present in the baseline file.
+    Returns the names of the timings more than `tolerance` slower than the baseline.
+    """
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    before, after = _medians(baseline.get("results", {})), _medians(results)
+    regressions = []
+    print(f"\nCompared with {baseline_path} ({baseline.get('meta', {}).get('commit')}):")
+    for name in sorted(set(before) & set(after)):
+        old, new = before[name], after[name]
+        change = (new - old) / old if old else 0.0
+        flag = ""
+        if change > tolerance:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        print(f"   {name:55s} {old:10.2f} -> {new:10.2f} ms ({change:+.0%}){flag}")
+    return regressions
+
+def start_browser():
+    """
+    A headless, profile-less BrowserEngine for the browser benchmarks.
+    Returns (browser, None), or (None, reason) when Chrome can't be started here.
+    """
+    try:
+        from src.browser import BrowserEngine
+        return BrowserEngine(headless=True, verbose_waits=False, profile_dir=None), None
+    except Exception as e:
+        return None, f"Chrome unavailable: {str(e).splitlines()[0] if str(e) else type(e).__name__}"
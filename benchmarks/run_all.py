@@ -0,0 +1,42 @@
+"""
+Runs the offline benchmark suite and writes one JSON results file, optionally comparing it
+with an earlier one to catch regressions.
+
+Usage: python -m benchmarks.run_all [--json benchmarks/results/latest.json]
+                                    [--baseline benchmarks/results/previous.json] [--tolerance 0.2]
+                                    [--skip agent_loop]
+"""
+import argparse
+from benchmarks import bench_browser, bench_inference, bench_agent_loop
+from benchmarks.report import write_results, compare
+
+SUITE = {
+    "browser": lambda quick: bench_browser.run(rounds=5 if quick else 20),
+    "inference": lambda quick: bench_inference.run(jobs=2 if quick else 5),
+    "agent_loop": lambda quick: bench_agent_loop.run(passes=1 if quick else 2)
+}
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline Jobaru benchmark suite")
+    parser.add_argument("--json", default="benchmarks/results/latest.json", help="Results file to write")
+    parser.add_argument("--baseline", help="Earlier results file to compare medians against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Slowdown that counts as a regression (0.2 = 20%%)")
+    parser.add_argument("--skip", nargs="*", default=[], choices=sorted(SUITE), help="Benchmarks to leave out")
+    parser.add_argument("--quick", action="store_true", help="Fewer rounds, for a smoke test")
+    args = parser.parse_args()
+
+    results = {}
+    for name, bench in SUITE.items():
+        if name in args.skip:
+            continue
+        print(f"\n=== {name} ===")
+        results[name] = bench(args.quick)
+    write_results(args.json, results)
+
+    if args.baseline:
+        regressions = compare(results, args.baseline, args.tolerance)
+        if regressions:
+            raise SystemExit(f"{len(regressions)} timing(s) regressed by more than {args.tolerance:.0%}")
+
+if __name__ == "__main__":
+    main()
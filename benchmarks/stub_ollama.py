@@ -0,0 +1,188 @@
+"""
+Minimal local stand-in for the Ollama HTTP API, used by the benchmarks.
+Speaks HTTP/1.1 so clients can keep connections alive.
+
+Generation timing can be simulated: a fixed latency per call, prefill at prefill_tps
+prompt tokens/sec and generation at tokens_per_sec, reported back in Ollama's timing fields.
+Requests with a JSON schema `format` get a response shaped by that schema.
+"""
+import json
+import time
+import zlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Chars per token, same estimate as src/prompts.py
+CHARS_PER_TOKEN = 4
+
+# Returned for free-form JSON requests: every key any Jobaru prompt asks for
+AGENT_RESPONSE = json.dumps({
+    "match_score": 82,
+    "matched_skills": ["Python", "AWS", "Docker", "SQL"],
+    "missing_skills": ["Kubernetes"],
+    "analysis": "Strong backend match; limited Kubernetes exposure.",
+    "cover_letter": "Dear Hiring Manager,\n\nI am excited to apply for this role. " * 8,
+    "intro_email": "Subject: Application\n\nHello, I would love to talk about the role.",
+    "roles": ["Senior Python Developer", "Backend Engineer", "Data Engineer"]
+})
+
+_SAMPLE_VALUES = {"string": "sample text", "integer": 42, "number": 3, "boolean": True}
+
+def sample_from_schema(schema):
+    """A value that validates against a (src/schema.py subset) JSON schema."""
+    kind = schema.get("type")
+    if kind == "object":
+        return {key: sample_from_schema(sub) for key, sub in schema.get("properties", {}).items()}
+    if kind == "array":
+        return [sample_from_schema(schema.get("items", {"type": "string"})) for _ in range(3)]
+    value = _SAMPLE_VALUES.get(kind, "")
+    if kind in ("integer", "number"):
+        value = min(max(value, schema.get("minimum", value)), schema.get("maximum", value))
+    return value
+
+def hashed_embedding(text, dim=64):
+    """Deterministic bag-of-words vector, so texts sharing words get similar embeddings."""
+    vec = [0.0] * dim
+    for word in text.lower().split():
+        vec[zlib.crc32(word.encode("utf-8")) % dim] += 1.0
+    return vec
+
+class StubOllamaHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True # Avoid 40ms delayed-ACK stalls on kept-alive connections
+
+    def log_message(self, format, *args):
+        pass # Keep benchmark output clean
+
+    def _send_json(self, payload, status=200):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length", 0))
+        raw = self.rfile.read(length) if length else b"{}"
+        return json.loads(raw or b"{}")
+
+    def do_GET(self):
+        if self.path == "/":
+            body = b"Ollama is running"
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        else:
+            self._send_json({"error": "not found"}, status=404)
+
+    def do_POST(self):
+        payload = self._read_json()
+        if self.path == "/api/generate":
+            text = self._response_for(payload)
+            timing = self._timing(payload, text)
+            if payload.get("stream"):
+                self._stream_tokens(text, timing)
+                return
+            time.sleep(timing["total_duration"] / 1e9)
+            self._send_json({"model": payload.get("model"), "response": text, "done": True, **timing})
+        elif self.path == "/api/embeddings":
+            self._send_json({"embedding": hashed_embedding(payload.get("prompt", ""), self.server.embedding_dim)})
+        else:
+            self._send_json({"error": "not found"}, status=404)
+
+    def _response_for(self, payload):
+        fmt = payload.get("format")
+        if not isinstance(fmt, dict):
+            return self.server.response_text
+        # Prefer the canned response's values when it has every key the schema asks for
+        try:
+            canned = json.loads(self.server.response_text)
+        except ValueError:
+            canned = None
+        if isinstance(canned, dict) and all(k in canned for k in fmt.get("required", [])):
+            return json.dumps({k: canned[k] for k in fmt.get("properties", {}) if k in canned})
+        return json.dumps(sample_from_schema(fmt))
+
+    def _timing(self, payload, text):
+        """Simulated Ollama timing fields (nanoseconds) for this request and response."""
+        server = self.server
+        prompt_tokens = -(-len(payload.get("system", "") + payload.get("prompt", "")) // CHARS_PER_TOKEN)
+        eval_tokens = -(-len(text) // CHARS_PER_TOKEN)
+        prompt_s = prompt_tokens / server.prefill_tps if server.prefill_tps else 0.0
+        eval_s = eval_tokens / server.tokens_per_sec if server.tokens_per_sec else 0.0
+        return {
+            "prompt_eval_count": prompt_tokens,
+            "prompt_eval_duration": int(prompt_s * 1e9),
+            "eval_count": eval_tokens,
+            "eval_duration": int(eval_s * 1e9),
+            "total_duration": int((server.latency + prompt_s + eval_s) * 1e9)
+        }
+
+    def _stream_tokens(self, text, timing):
+        """Streams the response as NDJSON chunks (chunked transfer encoding), like Ollama."""
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        step = self.server.chunk_chars
+        chunks = [{"response": text[i:i + step], "done": False} for i in range(0, len(text), step)]
+        chunks.append({"response": "", "done": True, **timing})
+        # Generation speed sets the pace between chunks unless a fixed delay is given
+        delay = self.server.chunk_delay
+        if not delay and self.server.tokens_per_sec:
+            delay = step / CHARS_PER_TOKEN / self.server.tokens_per_sec
+        first_delay = (timing["total_duration"] - timing["eval_duration"]) / 1e9
+        if first_delay:
+            time.sleep(first_delay)
+        self.server.streamed_chunks = 0
+        try:
+            for chunk in chunks:
+                line = (json.dumps(chunk) + "\n").encode("utf-8")
+                self.wfile.write(f"{len(line):X}\r\n".encode() + line + b"\r\n")
+                self.wfile.flush()
+                self.server.streamed_chunks += 1
+                if delay:
+                    time.sleep(delay)
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            # Client stopped reading early: this is how Ollama sees a cancelled generation
+            self.close_connection = True
+
+class StubOllamaServer:
+    """Runs the stub on a background thread. Use as a context manager."""
+    def __init__(self, host="127.0.0.1", port=0, response_text='{"ok": true}', chunk_chars=4, chunk_delay=0.0,
+                 latency=0.0, tokens_per_sec=0.0, prefill_tps=0.0):
+        """
+        :param response_text: Returned for requests without a schema format (AGENT_RESPONSE fits every prompt)
+        :param chunk_chars: Characters per streamed chunk
+        :param chunk_delay: Fixed seconds between streamed chunks (overrides tokens_per_sec pacing)
+        :param latency: Seconds added to every generation (model load, scheduling)
+        :param tokens_per_sec: Simulated generation speed; 0 = instant
+        :param prefill_tps: Simulated prompt evaluation speed in tokens/sec; 0 = instant
+        """
+        self.httpd = ThreadingHTTPServer((host, port), StubOllamaHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.response_text = response_text
+        self.httpd.chunk_chars = chunk_chars
+        self.httpd.chunk_delay = chunk_delay
+        self.httpd.latency = latency
+        self.httpd.tokens_per_sec = tokens_per_sec
+        self.httpd.prefill_tps = prefill_tps
+        self.httpd.streamed_chunks = 0
+        self.httpd.embedding_dim = 64
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
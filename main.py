@@ -2,13 +2,23 @@ import argparse
 import os
 import json
 import time
-from src.resume_utils import load_resume_text # Replaces src.parser
-from src.ollama_client import check_connection
-from src.agent import process_job_application
-from src.browser import BrowserEngine
+import functools
+from src.resume_utils import load_resume
+from src.candidate import load_candidate_profile
+from src.ollama_client import OllamaClient, DEFAULT_BASE_URL, DEFAULT_KEEP_ALIVE, DEFAULT_EMBED_MODEL, DEFAULT_NUM_CTX
+from src.pipeline import JobPipeline
+from src.cache import ResultCache
+from src.embeddings import EmbeddingFilter
+from src.lexical import LexicalScorer
+from src.store import ApplicationStore
+from src.dedup import NearDuplicateIndex, DEFAULT_THRESHOLD
+from src.browser import BrowserEngine, BrowserPool, DEFAULT_PROFILE_DIR
+from src.description import DESCRIPTION_SELECTORS, MIN_DESCRIPTION_CHARS, HttpDescriptionFetcher, get_default_extractor
 from src.platforms.linkedin import LinkedIn
 
 CONFIG_FILE = "config.json"
+# Filled in at runtime (resume text comes from the resume cache), never written to config.json
+RUNTIME_KEYS = ('resume_text', 'candidate_profile')
 
 def load_config():
     if os.path.exists(CONFIG_FILE):
@@ -18,9 +28,29 @@ def load_config():
 
 def save_config(config):
     with open(CONFIG_FILE, 'w') as f:
-        json.dump(config, f, indent=2)
+        json.dump({k: v for k, v in config.items() if k not in RUNTIME_KEYS}, f, indent=2)
 
-def interactive_wizard():
+def split_list(text):
+    """Splits a comma-separated answer into its non-empty, trimmed items."""
+    return [item.strip() for item in text.split(",") if item.strip()]
+
+def choose_roles(suggestions):
+    """Lets the user pick one or more suggested roles (e.g. "1,3" or "all"). Returns [] to type their own."""
+    print("\nSuggested Roles:")
+    for i, role in enumerate(suggestions):
+        print(f"{i+1}. {role}")
+    print(f"{len(suggestions)+1}. Type my own")
+
+    choice = input("Select roles (e.g. 1,3 or 'all'): ").strip().lower()
+    if choice == 'all':
+        return list(suggestions)
+    picked = []
+    for part in split_list(choice):
+        if part.isdigit() and 1 <= int(part) <= len(suggestions) and suggestions[int(part)-1] not in picked:
+            picked.append(suggestions[int(part)-1])
+    return picked
+
+def interactive_wizard(client=None):
     print("\n--- Jobaru Interactive Agent Setup ---")
     config = load_config()
     
@@ -32,7 +62,7 @@ def interactive_wizard():
                 print("Found 'resume.txt' in current directory.")
                 if input("Use 'resume.txt'? (y/n): ").lower() == 'y':
                      config['resume_path'] = os.path.abspath("resume.txt")
-                     config['resume_text'] = load_resume_text("resume.txt")
+                     resume = load_resume("resume.txt")
                      break
 
             path = input("Where is your resume? (path to PDF/TXT, or type 'paste' to enter text): ").strip()
@@ -51,14 +81,14 @@ def interactive_wizard():
                     f.write(content)
                 
                 config['resume_path'] = os.path.abspath("resume.txt")
-                config['resume_text'] = content
+                resume = load_resume("resume.txt")
                 print("Saved pasted text to resume.txt and loaded successfully.")
                 break
 
             elif os.path.exists(path):
                 config['resume_path'] = os.path.abspath(path)
                 try:
-                    config['resume_text'] = load_resume_text(path)
+                    resume = load_resume(path)
                     print("Resume loaded successfully.")
                     break
                 except Exception as e:
@@ -67,63 +97,59 @@ def interactive_wizard():
                 print("File not found. Please try again.")
     else:
         print(f"Using resume: {config['resume_path']}")
-        if 'resume_text' not in config:
-             config['resume_text'] = load_resume_text(config['resume_path'])
+        # Served from the resume cache unless the file changed
+        resume = load_resume(config['resume_path'])
+    config['resume_text'] = resume.text
+    # Compiled once per resume content; every prompt sends this instead of the raw text
+    profile = load_candidate_profile(resume, config.get('model', 'mistral'), client=client)
+    if profile:
+        config['candidate_profile'] = profile
 
     # JOB PREFERENCES
-    if 'job_role' not in config:
+    # Older configs hold a single role/location
+    if 'job_role' in config:
+        config.setdefault('job_roles', [config.pop('job_role')])
+    if 'location' in config:
+        config.setdefault('locations', [config.pop('location')])
+
+    if not config.get('job_roles'):
         print("\n--- Role Selection ---")
         use_ai = input("Do you want me to analyze your resume and suggest job roles? (y/n): ").lower()
         
-        selected_role = None
+        selected_roles = []
         if use_ai == 'y':
             from src.agent import suggest_roles_from_resume
             print("Analyzing resume... (this may take a few seconds)")
             print(f"Resume text length: {len(config.get('resume_text', ''))} chars")
             
-            suggestions = suggest_roles_from_resume(config['resume_text'], config.get('model', 'mistral'))
+            suggestions = suggest_roles_from_resume(config.get('candidate_profile') or config['resume_text'], config.get('model', 'mistral'), client=client)
             if suggestions:
-                print("\nSuggested Roles:")
-                for i, role in enumerate(suggestions):
-                    print(f"{i+1}. {role}")
-                print(f"{len(suggestions)+1}. Type my own")
-                
-                choice = input("Select a role (number): ").strip()
-                if choice.isdigit() and 1 <= int(choice) <= len(suggestions):
-                    selected_role = suggestions[int(choice)-1]
+                selected_roles = choose_roles(suggestions)
         
-        if selected_role:
-            config['job_role'] = selected_role
+        if selected_roles:
+            config['job_roles'] = selected_roles
         else:
-            config['job_role'] = input("What job role should I search for? (e.g. Python Developer): ").strip()
+            config['job_roles'] = split_list(input("What job role(s) should I search for? (comma-separated, e.g. Python Developer, Data Engineer): "))
             
     else:
-        print(f"Target Role: {config['job_role']}")
-        if input("Change role (or analyze resume)? (y/n): ").lower() == 'y':
+        print(f"Target Roles: {', '.join(config['job_roles'])}")
+        if input("Change roles (or analyze resume)? (y/n): ").lower() == 'y':
              # Offer AI here too?
              if input("Suggest from resume? (y/n): ").lower() == 'y':
                  from src.agent import suggest_roles_from_resume
-                 suggestions = suggest_roles_from_resume(config['resume_text'], config.get('model', 'mistral'))
-                 print("\nSuggested Roles:")
-                 for i, role in enumerate(suggestions):
-                    print(f"{i+1}. {role}")
-                 print(f"{len(suggestions)+1}. Type my own")
-                 c = input("Select: ").strip()
-                 if c.isdigit() and 1 <= int(c) <= len(suggestions):
-                     config['job_role'] = suggestions[int(c)-1]
-                 else:
-                     config['job_role'] = input("New role: ").strip()
+                 suggestions = suggest_roles_from_resume(config.get('candidate_profile') or config['resume_text'], config.get('model', 'mistral'), client=client)
+                 config['job_roles'] = choose_roles(suggestions) or split_list(input("New roles (comma-separated): "))
              else:
-                config['job_role'] = input("New role: ").strip()
+                config['job_roles'] = split_list(input("New roles (comma-separated): "))
 
-    if 'location' not in config:
-        config['location'] = input("Target Location? (e.g. Remote, San Francisco): ").strip()
+    if not config.get('locations'):
+        config['locations'] = split_list(input("Target Location(s)? (comma-separated, e.g. Remote, San Francisco): "))
     else:
 
-        print(f"Target Location: {config['location']}")
-        user_input = input("Change location? (enter new location or press Enter to keep): ").strip()
+        print(f"Target Locations: {', '.join(config['locations'])}")
+        user_input = input("Change locations? (enter new comma-separated locations or press Enter to keep): ").strip()
         if user_input:
-            config['location'] = user_input
+            config['locations'] = split_list(user_input)
 
     # ACTION MODE: DRAFT or APPLY,
     if 'auto_apply' not in config:
@@ -140,158 +166,288 @@ def interactive_wizard():
     save_config(config)
     return config
 
-def run_agent_loop(config):
+def fetch_job_description(browser, job, http=None, extractor=None):
+    """
+    Gets a job's description. With an HttpDescriptionFetcher, tries the plain-HTTP fast path
+    first and only renders the page in the browser when that yields too little text.
+    Saves the page source for inspection when the description is too short to use.
+    Safe to run on any BrowserEngine.
+    """
+    extractor = extractor or get_default_extractor()
+    if http:
+        job_desc = http.fetch(job['url'])
+        if len(job_desc) >= MIN_DESCRIPTION_CHARS:
+            print(f"   [HTTP] Description fetched without rendering: {job['title']}")
+            return job_desc
+        print(f"   [HTTP] Fast path got {len(job_desc)} chars; rendering in browser: {job['title']}")
+
+    browser.navigate(job['url'], wait_for=", ".join(DESCRIPTION_SELECTORS), label="job description")
+    job_desc = extractor.extract(browser)
+    if len(job_desc) < MIN_DESCRIPTION_CHARS:
+        # Save debug HTML to understand why
+        debug_dir = os.path.join("applications", "debug_html")
+        os.makedirs(debug_dir, exist_ok=True)
+        safe_id = "".join(c for c in str(job.get('id', 'job')) if c.isalnum())
+        with open(os.path.join(debug_dir, f"fail_{safe_id}.html"), "w", encoding="utf-8") as f:
+            f.write(browser.get_source())
+        print(f"   [DEBUG] Saved page source to {debug_dir}/fail_{safe_id}.html for inspection.")
+    return job_desc
+
+def _usable_description(i, job, job_desc):
+    print(f"[{i+1}] Scraped: {job['title']} at {job['company']}")
+    print(f"   URL: {job['url']}")
+    print(f"   Description Length: {len(job_desc)} chars")
+    if len(job_desc) < MIN_DESCRIPTION_CHARS:
+        print("   Skipping: Insufficient description.")
+        return False
+    return True
+
+def scrape_job_descriptions(browser, jobs, pipeline, config, pool=None, http=None):
+    """
+    Browser-thread producer: yields (job, description) for every job with a usable description.
+    Pending auto-apply steps run between scrapes so the primary browser is never used concurrently.
+    With a BrowserPool, pages load in parallel on the headless workers and results arrive in
+    completion order; the primary window only searches and applies.
+    """
+    if pool:
+        scraped = pool.map(jobs, on_idle=pipeline.run_pending_applies)
+        for i, (job, job_desc) in enumerate(scraped):
+            if _usable_description(i, job, job_desc):
+                yield job, job_desc
+        return
+
+    last_nav = None
+    for i, job in enumerate(jobs):
+        # Optional politeness pacing between page loads (not a readiness wait). Time already
+        # spent extracting and applying counts towards it.
+        delay = config.get('scrape_delay', 0)
+        if last_nav is not None and delay:
+            remaining = delay - (time.perf_counter() - last_nav)
+            if remaining > 0:
+                print(f"   [Wait] scrape pacing: {remaining:.2f}s")
+                time.sleep(remaining)
+
+        # Browser-bound apply steps are serialized here, never concurrent with scraping
+        pipeline.run_pending_applies()
+
+        last_nav = time.perf_counter()
+        job_desc = fetch_job_description(browser, job, http=http)
+        if _usable_description(i, job, job_desc):
+            yield job, job_desc
+
+def run_agent_loop(config, client=None, cache=None):
     """
     Main autonomous loop:
     1. Launch Browser
-    2. Manual Login (to avoid bot detection)
-    3. Search & Scrape
-    4. AI Processing
+    2. Login (reuses the persistent profile's session; manual otherwise, to avoid bot detection)
+    3. Search & Scrape (browser thread)
+    4. AI Processing (inference workers) and saving (writer), pipelined behind the scraper
     """
     print("\n--- Starting Autonomous Agent Loop ---")
     print("1. Launching Browser...")
-    browser = BrowserEngine(headless=False)
+    # The visible window loads pages in full (the user watches and applies there)
+    browser = BrowserEngine(headless=config.get('headless', False), profile_dir=config.get('chrome_profile_dir', DEFAULT_PROFILE_DIR) or None,
+                            lean=config.get('lean_primary', False))
+    pool = None
+    http = None
+    dedup = None
+    store = None
+    pipeline = None
     
     try:
         # LOGIN
-        print("2. Please log in to LinkedIn in the opened browser window.")
-        browser.navigate("https://www.linkedin.com/login")
-        
-        # Simple wait for manual login
-        input("Please log in to LinkedIn in the browser window manually.\nPress Enter after you have logged in...")
-        
-        # SEARCH
-        print(f"3. Searching for '{config['job_role']}' in '{config['location']}'...")
+        print("2. Checking LinkedIn session...")
         linkedin = LinkedIn(browser, config)
-        jobs = linkedin.search_jobs(config['job_role'], config['location'])
+        linkedin.login()
+        timings = browser.startup_timings
+        print("   Startup: " + ", ".join(f"{k} {v:.2f}s" for k, v in timings.items()) + f" (total {sum(timings.values()):.2f}s)")
         
-        if not jobs:
-            print("No jobs found. Exiting loop.")
-            return
-
-        print(f"\nFound {len(jobs)} potential jobs. Starting processing...\n")
+        # SEARCH
+        roles, locations = config['job_roles'], config['locations']
+        print(f"3. Searching for {', '.join(roles)} in {', '.join(locations)}...")
+        # Lazy: result pages are fetched as the scraper asks for more jobs
+        jobs = linkedin.iter_jobs(
+            roles, locations,
+            limit=config.get('search_limit', 50),
+            max_pages=config.get('search_max_pages', 3)
+        )
         
         # PROCESS JOBS
         applications_dir = os.path.join(os.getcwd(), "applications")
         os.makedirs(applications_dir, exist_ok=True)
 
-        for i, job in enumerate(jobs):
-            print(f"[{i+1}/{len(jobs)}] Processing: {job['title']}")
-            print(f"   {job['title']} at {job['company']}")
-            print(f"   URL: {job['url']}")
-
-            browser.navigate(job['url'])
-            time.sleep(2)
-            
-            # Robust description extraction
-            job_desc = ""
-            
-            # 1. Try to expand the description first
+        def apply_job(job, result):
+            # Runs on this (browser) thread, between scrapes
+            print(f"   [Auto-Apply] Attempting to apply: {job['title']}")
             try:
-                # Look for "Show more" button
-                expand_btns = [
-                    browser.find_element("[data-testid='expandable-text-button']"),
-                    browser.find_element(".jobs-description__footer-button"),
-                    browser.find_element(".show-more-less-html__button")
-                ]
-                for btn in expand_btns:
-                    if btn:
-                        browser.driver.execute_script("arguments[0].click();", btn)
-                        print("   [DEBUG] Clicked 'Show more' button.")
-                        time.sleep(1)
-                        break
-            except:
-                pass # It might be already expanded or not present
-
-            # 2. Extract text from various containers
-            selectors = [
-                "[data-testid='expandable-text-box']",
-                ".jobs-description__content",
-                ".jobs-box__html-content",
-                "#job-details",
-                ".description__text",
-                ".show-more-less-html__markup",
-                "article.jobs-description__container",
-                ".job-view-layout .jobs-description"
-            ]
-            
-            for sel in selectors:
-                try:
-                    el = browser.find_element(sel)
-                    if el and len(el.text) > 50:
-                        job_desc = el.text
-                        print(f"   [DEBUG] Extracted description using: {sel}")
-                        break
-                except:
-                    continue
-            
-            if not job_desc:
-                job_desc = "Description not found."
+                # Get the cover letter text we just generated
+                cl_text = result["materials"].get("cover_letter", "")
+                outcome = linkedin.apply_to_job(job['url'], cover_letter=cl_text)
+            except Exception as e:
+                print(f"   [Auto-Apply] Failed: {e}")
+                outcome = "error"
+            store.record_outcome(job.get('id', job['url']), outcome or "unknown")
 
-            print(f"   Description Length: {len(job_desc)} chars")
-            
-            if len(job_desc) < 100:
-                print("   Skipping: Insufficient description.")
-                # Save debug HTML to understand why
-                debug_dir = os.path.join("applications", "debug_html")
-                os.makedirs(debug_dir, exist_ok=True)
-                with open(os.path.join(debug_dir, f"fail_{i}.html"), "w", encoding="utf-8") as f:
-                    f.write(browser.get_source())
-                print(f"   [DEBUG] Saved page source to {debug_dir}/fail_{i}.html for inspection.")
-                continue
-
-            # AI Processing
-            print("   Using Ollama to analyze and draft...")
-            result = process_job_application(config['resume_text'], job_desc, model=config['model'])
-            
-            if "error" in result:
-                print(f"   Error in analysis: {result['error']}")
-                continue
-                
-            # Saving
-            timestamp = time.strftime("%Y%m%d_%H%M%S")
-            safe_title = "".join([c for c in job.get('title', 'job') if c.isalnum() or c==' ']).strip().replace(' ', '_')
-            output_dir = os.path.join("applications", f"{timestamp}_{safe_title}")
-            os.makedirs(output_dir, exist_ok=True)
-            
-            # Save Cover Letter
-            with open(os.path.join(output_dir, "cover_letter.md"), "w", encoding="utf-8") as f:
-                f.write(str(result["materials"].get("cover_letter", "")))
-            
-            # Save Metadata
-            with open(os.path.join(output_dir, "job_data.json"), "w", encoding="utf-8") as f:
-                json.dump({**job, "analysis": result}, f, indent=2)
-                
-            print(f"   Success! Saved to {output_dir}")
-            
-            # AUTO APPLY
-            if config.get('auto_apply'):
-                print("   [Auto-Apply] Attempting to apply...")
-                try:
-                    # Get the cover letter text we just generated
-                    cl_text = result["materials"].get("cover_letter", "")
-                    linkedin.apply_to_job(job['url'], cover_letter=cl_text)
-                except Exception as e:
-                    print(f"   [Auto-Apply] Failed: {e}")
-            
-            print("   Waiting 5s before next job...")
-            time.sleep(5)
+        store = ApplicationStore()
+        if config.get('dedup', True):
+            # Reposts of an already analysed role reuse its analysis instead of running inference
+            dedup = NearDuplicateIndex(threshold=config.get('dedup_threshold', DEFAULT_THRESHOLD))
+        pipeline = JobPipeline(
+            config,
+            client=client,
+            apply_fn=apply_job,
+            inference_workers=config.get('inference_workers', 1),
+            queue_size=config.get('scrape_queue_size', 4),
+            applications_dir=applications_dir,
+            cache=cache,
+            history=linkedin.history,
+            store=store,
+            dedup=dedup
+        )
+        pipeline.start()
+
+        lexical = None
+        if config.get('lexical_min_score') is not None:
+            # Zero-LLM first stage: scrape the most plausible titles first, skip weak descriptions
+            lexical = LexicalScorer(config['resume_text'])
+            # Ranking needs every title, so this collects the whole search up front
+            jobs = lexical.rank_jobs(list(jobs))
+
+        if config.get('http_fetch'):
+            # Plain HTTP first, reusing the logged-in session; the browser renders only what that misses
+            http = HttpDescriptionFetcher(cookies=browser.driver.get_cookies(),
+                                          pool_size=max(4, config.get('browser_workers', 0)))
+
+        if config.get('browser_workers', 0) > 0:
+            pool = BrowserPool(
+                browser,
+                size=config['browser_workers'],
+                memory_limit_mb=config.get('browser_worker_memory_mb', 512),
+                recycle_after=config.get('browser_worker_recycle_after', 100),
+                session_url=f"{linkedin.base_url}/robots.txt",
+                delay=config.get('scrape_delay', 0),
+                lean=config.get('lean_workers', True)
+            )
+            pool.start(functools.partial(fetch_job_description, http=http))
+
+        scraped = scrape_job_descriptions(browser, jobs, pipeline, config, pool=pool, http=http)
+        if lexical:
+            scraped = lexical.filter(scraped, min_score=config['lexical_min_score'])
+        if config.get('embedding_threshold') is not None or config.get('embedding_top_k'):
+            prefilter = EmbeddingFilter(
+                config['resume_text'],
+                client=client,
+                model=config.get('embedding_model', DEFAULT_EMBED_MODEL),
+                threshold=config.get('embedding_threshold'),
+                top_k=config.get('embedding_top_k')
+            )
+            scraped = prefilter.filter(scraped)
+
+        submitted = 0
+        for job, job_desc in scraped:
+            # Hand off to the inference workers; blocks only when the queue is full
+            pipeline.submit(job, job_desc)
+            submitted += 1
+        if not submitted:
+            print("No new jobs with usable descriptions found.")
+
+        if pool:
+            pool.close()
+            print(f"Browser pool: {pool.size} workers loaded {pool.pages} pages ({pool.restarts} restarts).")
+            pool = None
+        extractor = get_default_extractor()
+        extractor.stats.save()
+        print("Description selector hit rates (python query.py selectors):")
+        for sel, tries, hits, rate in extractor.stats.hit_rates():
+            print(f"   {rate * 100:5.1f}%  {hits}/{tries}  {sel}")
+        if http:
+            stats = http.stats()
+            print(f"HTTP fast path: {stats['hits']} descriptions without rendering, {stats['misses']} browser fallbacks "
+                  f"({stats['avg_ms']:.0f} ms avg fetch+parse).")
+        print("\nScraping done. Waiting for remaining analyses...")
+        pipeline.close()
+        store.close()
+        db_path, store = store.db_path, None
+        if dedup:
+            clusters = dedup.summary()
+            if clusters:
+                print(f"Near-duplicates: {sum(len(c[2]) for c in clusters)} postings in {len(clusters)} clusters, "
+                      f"{dedup.reused} analyses reused without inference:")
+                for title, company, members in clusters:
+                    others = ", ".join(f"{job.get('company')} ({sim:.0%})" for job, sim in members)
+                    print(f"   {title} at {company}: {len(members)} reposts - {others}")
+        print(f"Saved {pipeline.saved} application drafts ({pipeline.failed} failed) to {db_path}.")
+        print("   Browse them with: python query.py jobs   (export markdown: python query.py export <job_id>)")
+        if cache:
+            stats = cache.stats()
+            print(f"LLM cache: {stats['hits']} hits, {stats['misses']} misses ({stats['hit_rate']:.0f}% hit rate).")
+        waits = browser.wait_summary()
+        if waits:
+            print("Time spent waiting for the page, per call site:")
+            for label, w in waits.items():
+                print(f"   {label}: {w['calls']} waits, {w['total_s']:.1f}s total, {w['avg_s']:.2f}s avg, {w['timeouts']} deadline hits")
+        pages = browser.page_summary()
+        if pages:
+            print("Page loads, per call site:")
+            for label, p in pages.items():
+                print(f"   {label}: {p['pages']} pages, {p['avg_kb']:.0f} KB avg, {p['avg_load_s']:.2f}s avg load")
+        if client:
+            summary = client.metrics_summary()
+            if summary["calls"]:
+                print(f"Ollama: {summary['calls']} calls, {summary['prompt_eval_tokens']} prompt tokens evaluated "
+                      f"({summary['prompt_eval_tokens'] // summary['calls']}/call), "
+                      f"avg prompt eval {summary['avg_prompt_eval_ms']:.0f} ms/call.")
             
     except KeyboardInterrupt:
         print("\nUser stopped the agent.")
     except Exception as e:
         print(f"\nCritical Error: {e}")
     finally:
+        if pipeline:
+            # No-op after a normal run; if interrupted, drafts already generated are still saved
+            pipeline.close(abort=True)
+        if store:
+            store.close()
+        if pool:
+            pool.close()
+        if http:
+            http.close()
+        if dedup:
+            dedup.close()
         browser.quit()
         print("Browser closed. Session ended.")
 
 def main():
     parser = argparse.ArgumentParser(description="Jobaru - Autonomous Agent")
     parser.add_argument("--reset", action="store_true", help="Reset configuration")
+    parser.add_argument("--workers", type=int, help="Number of parallel Ollama inference workers")
+    parser.add_argument("--single-pass", action="store_true", help="Analyze and draft in one schema-constrained generation per job")
+    parser.add_argument("--stream", action="store_true", help="Stream generations to the terminal and stop as soon as the JSON is complete "
+                                                               "(with --export-markdown, each cover_letter.md is also written as it is generated)")
+    parser.add_argument("--min-lexical-score", type=int, help="Skip jobs whose keyword (BM25) match score is below this (0-100), before any LLM call")
+    parser.add_argument("--min-similarity", type=float, help="Skip jobs whose embedding similarity to the resume is below this (0-1)")
+    parser.add_argument("--top-k", type=int, help="Only process the K jobs most similar to the resume")
+    parser.add_argument("--export-markdown", action="store_true", help="Also write a cover_letter.md/job_data.json folder per job")
+    parser.add_argument("--browser-workers", type=int, help="Scrape job descriptions with N parallel headless browsers (0 = primary window only)")
+    parser.add_argument("--http-fetch", action="store_true", help="Fetch job descriptions over plain HTTP first, rendering in Chrome only as a fallback")
+    parser.add_argument("--no-lean", action="store_true", help="Let browser workers load images, fonts, media and trackers")
+    parser.add_argument("--no-profile", action="store_true", help="Start Chrome with a fresh profile (no saved login)")
+    parser.add_argument("--no-dedup", action="store_true", help="Analyse near-duplicate postings (reposts) again instead of reusing the earlier analysis")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the LLM result cache for this run")
+    parser.add_argument("--clear-cache", action="store_true", help="Delete all cached LLM results before running")
     args = parser.parse_args()
     
     print("Initializing Jobaru...")
-    if not check_connection():
+    # One pooled client shared by the wizard and the agent loop for the whole run
+    saved = load_config()
+    client = OllamaClient(
+        base_url=saved.get('ollama_url', DEFAULT_BASE_URL),
+        pool_size=max(saved.get('ollama_pool_size', 4), args.workers or saved.get('inference_workers', 1)),
+        keep_alive=saved.get('ollama_keep_alive', DEFAULT_KEEP_ALIVE),
+        # Sent explicitly so the context window the prompts are budgeted for is the one in use
+        options={"num_ctx": saved.get('num_ctx', DEFAULT_NUM_CTX)}
+    )
+    if not client.check_connection():
         print("ERROR: Ollama is not running. Please start Ollama first.")
         return
 
@@ -299,8 +455,40 @@ def main():
         os.remove(CONFIG_FILE)
         print("Configuration reset.")
 
-    config = interactive_wizard()
-    run_agent_loop(config)
+    cache = ResultCache(enabled=not args.no_cache)
+    if args.clear_cache:
+        cache.clear()
+        print("LLM result cache cleared.")
+
+    config = interactive_wizard(client)
+    if args.workers:
+        config['inference_workers'] = args.workers
+    if args.browser_workers is not None:
+        config['browser_workers'] = args.browser_workers
+    if args.http_fetch:
+        config['http_fetch'] = True
+    if args.no_lean:
+        config['lean_workers'] = False
+    if args.no_dedup:
+        config['dedup'] = False
+    if args.no_profile:
+        config['chrome_profile_dir'] = ""
+    if args.single_pass:
+        config['single_pass'] = True
+    if args.stream:
+        config['stream'] = True
+    if args.export_markdown:
+        config['export_markdown'] = True
+    if args.min_lexical_score is not None:
+        config['lexical_min_score'] = args.min_lexical_score
+    if args.min_similarity is not None:
+        config['embedding_threshold'] = args.min_similarity
+    if args.top_k:
+        config['embedding_top_k'] = args.top_k
+    try:
+        run_agent_loop(config, client, cache)
+    finally:
+        client.close()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,80 @@
+import argparse
+import time
+from datetime import datetime
+from src.store import ApplicationStore
+from src.history import DEFAULT_DB_PATH
+from src.description import SelectorStats, DEFAULT_SELECTOR_STATS_PATH
+
+def cmd_jobs(store, args):
+    since = time.mktime(datetime.strptime(args.since, "%Y-%m-%d").timetuple()) if args.since else None
+    rows = store.query_jobs(company=args.company, min_score=args.min_score, since=since, limit=args.limit)
+    if not rows:
+        print("No matching jobs.")
+        return
+    for r in rows:
+        when = time.strftime("%Y-%m-%d", time.localtime(r["analysed_at"]))
+        score = "--" if r["match_score"] is None else f"{r['match_score']:>3}"
+        outcome = f" [{r['outcome']}]" if r["outcome"] else ""
+        print(f"{when}  {score}  {r['job_id']:<12} {r['title']} @ {r['company']}{outcome}")
+
+def cmd_missing(store, args):
+    for skill, count in store.missing_skill_counts(top=args.top):
+        print(f"{count:>5}  {skill}")
+
+def cmd_export(store, args):
+    job_ids = store.job_ids() if args.all else args.job_ids
+    for job_id in job_ids:
+        path = store.export_markdown(job_id, out_dir=args.out)
+        print(f"Exported {job_id} -> {path}" if path else f"Unknown job: {job_id}")
+
+def cmd_import(store, args):
+    count = store.import_legacy_dirs(args.dir)
+    print(f"Imported {count} job folders from {args.dir}.")
+
+def cmd_selectors(store, args):
+    rows = SelectorStats(path=args.stats).hit_rates()
+    if not rows:
+        print("No selector statistics yet.")
+        return
+    for sel, tries, hits, rate in rows:
+        print(f"{rate * 100:5.1f}%  {hits:>5}/{tries:<5}  {sel}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Jobaru - query the application store")
+    parser.add_argument("--db", default=DEFAULT_DB_PATH, help="Path to jobaru.db")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("jobs", help="List analysed jobs (latest first)")
+    p.add_argument("--company", help="Company name contains")
+    p.add_argument("--min-score", type=int, help="Minimum match score")
+    p.add_argument("--since", help="Only jobs analysed on/after YYYY-MM-DD")
+    p.add_argument("--limit", type=int, default=50)
+    p.set_defaults(func=cmd_jobs)
+
+    p = sub.add_parser("missing-skills", help="Skills most often missing from your resume")
+    p.add_argument("--top", type=int, default=20)
+    p.set_defaults(func=cmd_missing)
+
+    p = sub.add_parser("export", help="Write cover_letter.md/job_data.json folders on demand")
+    p.add_argument("job_ids", nargs="*")
+    p.add_argument("--all", action="store_true", help="Export every stored job")
+    p.add_argument("--out", default="applications", help="Output directory")
+    p.set_defaults(func=cmd_export)
+
+    p = sub.add_parser("import-dirs", help="Import old per-job folders into the store")
+    p.add_argument("--dir", default="applications")
+    p.set_defaults(func=cmd_import)
+
+    p = sub.add_parser("selectors", help="Hit rates of the job description selectors")
+    p.add_argument("--stats", default=DEFAULT_SELECTOR_STATS_PATH, help="Path to selector_stats.json")
+    p.set_defaults(func=cmd_selectors)
+
+    args = parser.parse_args()
+    store = ApplicationStore(db_path=args.db)
+    try:
+        args.func(store, args)
+    finally:
+        store.close()
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,65 @@
-from .ollama_client import generate_json
+import json
+from .ollama_client import get_default_client, extract_json
+from .cache import ResultCache
+from . import schema as json_schema
+from .prompts import render_with_description, trim_to_tokens
 
-def analyze_job_fit(resume_text, job_description, model):
+# Bump whenever a prompt template changes so cached results from the old template are not reused
+PROMPT_VERSION = 4
+
+# Every call sends the same system text + candidate as the system prompt, and only the
+# task-specific part as the prompt. The candidate is the compiled profile (src/candidate.py)
+# when there is one, the raw resume text otherwise. The rendered prompt therefore starts with an
+# identical prefix for every job, which Ollama keeps evaluated in the loaded model's
+# KV cache (held warm via keep_alive), so only the job-specific suffix is prefilled.
+RESUME_PREFIX_TEMPLATE = """You are Jobaru, an expert career coach, recruiter and professional copywriter.
+You help the candidate described below apply to jobs.
+Always be professional, concise, and persuasive.
+
+CANDIDATE:
+{resume}"""
+
+# Cap on the candidate part of the prefix (a compiled profile is far below it)
+CANDIDATE_TOKENS = 1000
+
+def build_resume_prefix(resume_text):
+    """The stable, shared prompt prefix (system text + profile or resume) reused across all calls in a run."""
+    return RESUME_PREFIX_TEMPLATE.format(resume=trim_to_tokens(resume_text, CANDIDATE_TOKENS))
+
+def _generate_json_to_file(client, prompt, model, system, stream, echo, cover_letter_path, format=None):
+    """generate_json, streaming the "cover_letter" field into cover_letter_path when given."""
+    if not (stream and cover_letter_path):
+        return client.generate_json(prompt, model=model, system=system, format=format, stream=stream, echo=echo)
+    with open(cover_letter_path, "w", encoding="utf-8") as f:
+        def write_chunk(text):
+            f.write(text)
+            f.flush()
+        return client.generate_json(prompt, model=model, system=system, format=format, stream=True, echo=echo,
+                                    field_sinks={"cover_letter": write_chunk})
+
+def analyze_job_fit(resume_text, job_description, model, client=None, cache=None, stream=False, echo=False):
     """
     Analyzes how well the resume matches the job description.
     Returns extracted skills and a fit score.
     """
-    prompt = f"""
-    You are an expert career coach and recruiter.
+    if cache:
+        key = ResultCache.make_key("fit", model, PROMPT_VERSION, resume_text, job_description)
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    client = client or get_default_client()
+    system = build_resume_prefix(resume_text)
+    template = """
+    TASK: Evaluate the candidate's fit for the job below.
     
-    1. Analyze the RESUME and JOB DESCRIPTION below.
-    2. Extract key skills from the resume that match the job.
+    1. Analyze the CANDIDATE and JOB DESCRIPTION.
+    2. Extract the candidate's key skills that match the job.
     3. Identify missing skills.
     4. Provide a match score (0-100).
     
-    RESUME:
-    {resume_text[:4000]}
-    
     JOB DESCRIPTION:
-    {job_description[:4000]}
+    {job_description}
     
     Output JSON format:
     {{
@@ -27,24 +69,36 @@ def analyze_job_fit(resume_text, job_description, model):
         "analysis": "Brief analysis of fit..."
     }}
     """
-    return generate_json(prompt, model=model)
+    prompt = render_with_description(template, job_description, client, system, "fit")
+    result = client.generate_json(prompt, model=model, system=system, stream=stream, echo=echo)
+    if cache and isinstance(result, dict) and "error" not in result:
+        cache.put(key, result)
+    return result
 
-def generate_application_materials(resume_text, job_description, fit_analysis, model):
+def generate_application_materials(resume_text, job_description, fit_analysis, model, client=None, cache=None,
+                                   stream=False, echo=False, cover_letter_path=None):
     """
     Generates a cover letter and email based on the fit analysis.
+    When streaming with cover_letter_path, the letter is written to that file as it is generated.
     """
-    prompt = f"""
-    You are a professional copywriter for job applications.
+    if cache:
+        key = ResultCache.make_key("materials", model, PROMPT_VERSION, resume_text, job_description,
+                                   fit_analysis.get('matched_skills', []))
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    client = client or get_default_client()
+    system = build_resume_prefix(resume_text)
+    template = """
+    TASK: Write application materials for the job below.
     
-    Using the RESUME and JOB DESCRIPTION provided, write a compelling Cover Letter and an Introduction Email.
-    Highlight the matched skills: {fit_analysis.get('matched_skills', [])}.
+    Using the CANDIDATE and JOB DESCRIPTION, write a compelling Cover Letter and an Introduction Email.
+    Highlight the matched skills: {matched_skills}.
     Address the missing skills if possible by emphasizing adaptability or related experience.
     
-    RESUME:
-    {resume_text[:4000]}
-    
     JOB DESCRIPTION:
-    {job_description[:4000]}
+    {job_description}
     
     Output JSON format:
     {{
@@ -52,7 +106,9 @@ def generate_application_materials(resume_text, job_description, fit_analysis, m
         "intro_email": "Subject: Application for [Role]... Body: ..."
     }}
     """
-    result = generate_json(prompt, model=model)
+    prompt = render_with_description(template, job_description, client, system, "materials",
+                                     matched_skills=fit_analysis.get('matched_skills', []))
+    result = _generate_json_to_file(client, prompt, model, system, stream, echo, cover_letter_path)
     
     # Sanitization to ensure string outputs
     if isinstance(result, dict):
@@ -70,20 +126,145 @@ def generate_application_materials(resume_text, job_description, fit_analysis, m
         elif not isinstance(email, str):
              result["intro_email"] = str(email) if email else ""
 
+        if cache and "error" not in result:
+            cache.put(key, result)
+
     return result
 
-def process_job_application(resume_text, job_description, model="llama3"):
+# Declared output of the single-pass mode; sent to Ollama as `format` and validated on return
+APPLICATION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "match_score": {"type": "integer", "minimum": 0, "maximum": 100},
+        "matched_skills": {"type": "array", "items": {"type": "string"}},
+        "missing_skills": {"type": "array", "items": {"type": "string"}},
+        "analysis": {"type": "string"},
+        "cover_letter": {"type": "string"},
+        "intro_email": {"type": "string"}
+    },
+    "required": ["match_score", "matched_skills", "missing_skills", "analysis", "cover_letter", "intro_email"]
+}
+
+ANALYSIS_KEYS = ["match_score", "matched_skills", "missing_skills", "analysis"]
+MATERIALS_KEYS = ["cover_letter", "intro_email"]
+
+def analyze_and_draft(resume_text, job_description, model, client=None, cache=None,
+                      stream=False, echo=False, cover_letter_path=None):
+    """
+    Single-pass mode: fit analysis and application materials in one schema-constrained generation.
+    Output that fails validation is repaired locally where possible, and only the still-missing
+    fields are re-requested, instead of re-running the whole generation.
+    Returns {"analysis": {...}, "materials": {...}} or a dict with "error".
+    """
+    if cache:
+        key = ResultCache.make_key("single_pass", model, PROMPT_VERSION, resume_text, job_description)
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    client = client or get_default_client()
+    system = build_resume_prefix(resume_text)
+    template = """
+    TASK: Evaluate the candidate's fit for the job below and write the application materials.
+    
+    1. Extract the candidate's key skills that match the job, and identify missing skills.
+    2. Provide a match score (0-100) and a brief analysis of fit.
+    3. Write a compelling Cover Letter and an Introduction Email that highlight the matched skills
+       and address the missing ones by emphasizing adaptability or related experience.
+    
+    JOB DESCRIPTION:
+    {job_description}
+    
+    Output JSON with the keys: match_score, matched_skills, missing_skills, analysis, cover_letter, intro_email.
+    """
+    prompt = render_with_description(template, job_description, client, system, "single_pass")
+    result = _generate_json_to_file(client, prompt, model, system, stream, echo, cover_letter_path,
+                                    format=APPLICATION_SCHEMA)
+    raw = result.get("raw_response", "")
+    if "error" in result:
+        # Usually a generation cut off by num_predict / num_ctx: keep what was produced,
+        # minus the last field if it was still being written when it stopped
+        salvaged, cut = json_schema.close_truncated_json(raw)
+        if salvaged and cut:
+            salvaged.popitem()
+        if not salvaged:
+            # Nothing usable to repair around: run the generation again
+            print("  - Output unusable, retrying the generation...")
+            salvaged = _generate_json_to_file(client, prompt, model, system, stream, echo, cover_letter_path,
+                                              format=APPLICATION_SCHEMA)
+            raw = salvaged.get("raw_response", raw)
+            if "error" in salvaged:
+                return {"error": "Single-pass generation failed", "details": salvaged.get("error"), "raw_response": raw}
+        result = salvaged
+
+    result = json_schema.coerce(result, APPLICATION_SCHEMA)
+    problems = json_schema.validate(result, APPLICATION_SCHEMA)
+    if problems:
+        bad_keys = sorted({path.split('.')[1].split('[')[0] for path, _ in problems if '.' in path})
+        if not bad_keys:
+            return {"error": "Single-pass output invalid", "details": problems, "raw_response": raw}
+        print(f"  - Repairing fields: {', '.join(bad_keys)}")
+        for k in bad_keys:
+            result.pop(k, None)
+        repair_schema = json_schema.sub_schema(APPLICATION_SCHEMA, bad_keys)
+        repair_template = """
+    TASK: Complete a partially written job application for the job below.
+    Already produced (do not repeat): {produced}
+    
+    JOB DESCRIPTION:
+    {job_description}
+    
+    Output JSON with ONLY these keys: {keys}.
+    """
+        repair_prompt = render_with_description(repair_template, job_description, client, system, "repair",
+                                                produced=trim_to_tokens(json.dumps(result), 400),
+                                                keys=', '.join(bad_keys))
+        patch = extract_json(client.generate_response(repair_prompt, model=model, system=system, format=repair_schema))
+        if "error" not in patch:
+            result.update(json_schema.coerce(patch, repair_schema))
+        problems = json_schema.validate(result, APPLICATION_SCHEMA)
+        if problems:
+            return {"error": "Single-pass output invalid after repair", "details": problems, "raw_response": raw}
+
+    split = {
+        "analysis": {k: result[k] for k in ANALYSIS_KEYS},
+        "materials": {k: result[k] for k in MATERIALS_KEYS}
+    }
+    if cache:
+        cache.put(key, split)
+    return split
+
+def process_job_application(resume_text, job_description, model="llama3", client=None, cache=None, single_pass=False,
+                            stream=False, echo=False, cover_letter_path=None):
     """
     Orchestrates the full application process.
+    resume_text is whatever describes the candidate: the pipeline passes the compiled profile
+    (src/candidate.py) when there is one.
+    With stream=True, generations are parsed incrementally and the cover letter is written
+    to cover_letter_path while it is being generated.
     """
+    if single_pass:
+        print("  - Analyzing fit and drafting (single pass)...")
+        combined = analyze_and_draft(resume_text, job_description, model, client=client, cache=cache,
+                                     stream=stream, echo=echo, cover_letter_path=cover_letter_path)
+        if "error" in combined:
+            return {"error": "Generation failed", "details": combined}
+        return {
+            "status": "ready",
+            "analysis": combined["analysis"],
+            "materials": combined["materials"]
+        }
+
     print("  - Analyzing fit...")
-    analysis = analyze_job_fit(resume_text, job_description, model)
+    analysis = analyze_job_fit(resume_text, job_description, model, client=client, cache=cache,
+                               stream=stream, echo=echo)
     
     if "error" in analysis:
         return {"error": "Analysis failed", "details": analysis}
 
     print("  - Drafting application materials...")
-    materials = generate_application_materials(resume_text, job_description, analysis, model)
+    materials = generate_application_materials(resume_text, job_description, analysis, model, client=client, cache=cache,
+                                               stream=stream, echo=echo, cover_letter_path=cover_letter_path)
     
     if "error" in materials:
         return {"error": "Generation failed", "details": materials}
@@ -94,38 +275,21 @@ def process_job_application(resume_text, job_description, model="llama3"):
         "materials": materials
     }
 
-def suggest_roles_from_resume(resume_text, model="mistral"):
+def suggest_roles_from_resume(resume_text, model="mistral", client=None):
     """
     Analyzes the resume and suggests top 3 job titles.
     """
-    prompt = f"""
-    You are an expert career consultant.
-    Analyze the RESUME provided below and list the top 3 most suitable job titles this candidate should apply for.
-    Rules:
-    - Provide ONLY the job titles as a comma-separated list.
-    - Be specific (e.g., "Senior Python Developer" instead of just "Developer").
-    - Do not output any other text or explanation.
-
-    RESUME:
-    {resume_text[:4000]}
-    """
-    
-    # We use generate_json generically but here we just want text.
-    # However, our ollama_client returns JSON usually.
-    # Let's use a simpler prompt wrapper or just parse the "response" key if using raw endpoint?
-    # Our extract_json checks for json blocks. Let's ask for JSON to be safe.
-    
-    json_prompt = f"""
-    Analyze the RESUME and suggest 3 job titles.
+    # We only want titles, but ask for JSON so extract_json can recover them reliably.
+    json_prompt = """
+    TASK: Analyze the CANDIDATE and suggest the 3 most suitable job titles for this candidate.
+    Be specific (e.g., "Senior Python Developer" instead of just "Developer").
     Output JSON format:
-    {{
+    {
         "roles": ["Role 1", "Role 2", "Role 3"]
-    }}
-    
-    RESUME:
-    {resume_text[:4000]}
+    }
     """
-    result = generate_json(json_prompt, model=model)
+    client = client or get_default_client()
+    result = client.generate_json(json_prompt, model=model, system=build_resume_prefix(resume_text))
     if isinstance(result, dict) and "roles" in result:
         return result["roles"]
     return ["Python Developer"] # Fallback
@@ -1,5 +1,11 @@
+import os
+import re
+import json
 import logging
+import subprocess
 import time
+import queue
+import threading
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
@@ -7,17 +13,158 @@ from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException, WebDriverException, SessionNotCreatedException
+
+MODAL_SELECTOR = ".jobs-easy-apply-content, [role='dialog']"
+DRIVER_CACHE_PATH = os.path.join("applications", "chromedriver.json")
+DEFAULT_PROFILE_DIR = os.path.join("applications", "chrome_profile")
+
+_driver_lock = threading.Lock()
+
+# Lean mode: URL patterns blocked via CDP Network.setBlockedURLs. Images, media and fonts by
+# extension and media host; third-party analytics/ad hosts by name. LinkedIn's own scripts
+# and styles (static.licdn.com) still load, so pages keep working.
+LEAN_BLOCKED_URLS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.mp4", "*.webm", "*.m3u8", "*.mp3", "*.ts",
+    "*media.licdn.com*", "*dms.licdn.com*",
+    "*doubleclick.net*", "*google-analytics.com*", "*googletagmanager.com*", "*googlesyndication.com*",
+    "*facebook.net*", "*bing.com*", "*demdex.net*", "*omtrdc.net*", "*hotjar.com*", "*adsrvr.org*",
+    "*px.ads.linkedin.com*", "*snap.licdn.com*"
+]
+
+# Content settings that stop the renderer from even requesting blocked resource types
+LEAN_PREFS = {
+    "profile.managed_default_content_settings.images": 2,
+    "profile.default_content_setting_values.notifications": 2,
+    "profile.managed_default_content_settings.media_stream": 2
+}
+
+# Bytes over the wire and load time of the current document, from the Performance API.
+# Cross-origin resources without Timing-Allow-Origin report 0 bytes, so this undercounts.
+PAGE_STATS_JS = """
+const nav = performance.getEntriesByType('navigation')[0] || {};
+const resources = performance.getEntriesByType('resource');
+let bytes = nav.transferSize || 0;
+for (const r of resources) bytes += r.transferSize || 0;
+return {
+    bytes: bytes,
+    resources: resources.length,
+    load_ms: nav.loadEventEnd ? nav.loadEventEnd - nav.startTime : performance.now()
+};
+"""
+
+def _add_stats(table, label, values):
+    stats = table.setdefault(label, [0] * len(values))
+    for i, value in enumerate(values):
+        stats[i] += value
+
+def _major(version):
+    match = re.search(r"(\d+)\.", version or "")
+    return match.group(1) if match else None
+
+def local_chrome_version():
+    """Version of the installed Chrome, or None if it can't be determined."""
+    try:
+        from webdriver_manager.core.os_manager import OperationSystemManager, ChromeType
+        return OperationSystemManager().get_browser_version_from_os(ChromeType.GOOGLE)
+    except Exception:
+        return None
+
+def _driver_version(path):
+    try:
+        out = subprocess.run([path, "--version"], capture_output=True, text=True, timeout=10).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    match = re.search(r"(\d+(?:\.\d+)+)", out)
+    return match.group(1) if match else None
+
+def resolve_driver_path(cache_path=DRIVER_CACHE_PATH, refresh=False):
+    """
+    Returns a chromedriver path matching the installed Chrome. The path is cached and
+    checked locally (file present, same major version as Chrome); ChromeDriverManager only
+    runs, with its version lookup and possible download, on a miss or a mismatch.
+    """
+    with _driver_lock:
+        chrome = local_chrome_version()
+        if not refresh and os.path.exists(cache_path):
+            try:
+                with open(cache_path, "r") as f:
+                    cached = json.load(f)
+                path = cached.get("path")
+                if path and os.access(path, os.X_OK) and (chrome is None or _major(chrome) == _major(cached.get("driver_version"))):
+                    return path
+                print(f"   [DEBUG] Cached driver is stale (Chrome {chrome}, driver {cached.get('driver_version')}).")
+            except (OSError, ValueError) as e:
+                print(f"   [DEBUG] Ignoring unreadable driver cache: {e}")
+
+        print("   [DEBUG] Installing/Checking Chrome Driver...")
+        path = ChromeDriverManager().install()
+        os.makedirs(os.path.dirname(cache_path) or ".", exist_ok=True)
+        tmp_path = cache_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"path": path, "driver_version": _driver_version(path), "chrome_version": chrome}, f, indent=2)
+        os.replace(tmp_path, cache_path)
+        return path
+
+# Resolves once the page has been quiet for `quiet` ms: document loaded, no DOM mutations
+# and no new resource fetches in that window. Resolves false at the hard deadline.
+# arguments: quiet ms, deadline ms, async callback.
+DOM_IDLE_JS = """
+const quiet = arguments[0], deadline = arguments[1], done = arguments[arguments.length - 1];
+const resources = () => performance.getEntriesByType('resource').length;
+let last = performance.now(), seen = resources(), finished = false;
+const observer = new MutationObserver(() => { last = performance.now(); });
+observer.observe(document.documentElement || document, {childList: true, subtree: true, attributes: true, characterData: true});
+const finish = idle => {
+    if (finished) return;
+    finished = true;
+    observer.disconnect();
+    clearInterval(poll);
+    clearTimeout(hard);
+    done(idle);
+};
+const poll = setInterval(() => {
+    const now = performance.now(), count = resources();
+    if (count !== seen || document.readyState !== 'complete') { seen = count; last = now; }
+    if (now - last >= quiet) finish(true);
+}, 50);
+const hard = setTimeout(() => finish(false), deadline);
+"""
 
 class BrowserEngine:
-    def __init__(self, headless=False):
-        self.driver = self._setup_driver(headless)
+    def __init__(self, headless=False, verbose_waits=True, extra_args=None, profile_dir=None, lean=False):
+        """
+        :param headless: Run Chrome without a window
+        :param verbose_waits: Print every readiness wait (and page load stats) as it completes
+        :param extra_args: Additional Chrome command-line switches
+        :param profile_dir: Persistent Chrome profile (--user-data-dir), so logins survive restarts.
+                            One Chrome at a time can use a profile.
+        :param lean: Block images, media, fonts and third-party trackers (for scraping, not for the visible window)
+        """
+        self.lean = lean
+        # phase -> seconds
+        self.startup_timings = {}
+        self.driver = self._setup_driver(headless, extra_args or [], profile_dir)
         self.wait = WebDriverWait(self.driver, 10)
+        self.verbose_waits = verbose_waits
+        # label -> [calls, total seconds, timeouts]
+        self.wait_stats = {}
+        # label -> [pages, bytes, load ms]
+        self.page_stats = {}
 
-    def _setup_driver(self, headless):
+    def _setup_driver(self, headless, extra_args=(), profile_dir=None):
         print("   [DEBUG] Setting up Chrome options...")
+        phase_start = start = time.perf_counter()
         options = Options()
+        if profile_dir:
+            os.makedirs(profile_dir, exist_ok=True)
+            options.add_argument(f"--user-data-dir={os.path.abspath(profile_dir)}")
         if headless:
             options.add_argument("--headless=new")
+        for arg in extra_args:
+            options.add_argument(arg)
         
         # Performance / Space optimizations
         options.add_argument("--disable-gpu")
@@ -28,28 +175,145 @@ class BrowserEngine:
         # User agent to avoid immediate bot detection (basic)
         options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
 
-        print("   [DEBUG] Installing/Checking Chrome Driver...")
+        if self.lean:
+            options.add_experimental_option("prefs", LEAN_PREFS)
+            options.add_argument("--blink-settings=imagesEnabled=false")
+            options.add_argument("--mute-audio")
+
+        self.startup_timings["options"] = time.perf_counter() - phase_start
+
+        phase_start = time.perf_counter()
         try:
-            path = ChromeDriverManager().install()
+            path = resolve_driver_path()
             print(f"   [DEBUG] Driver path: {path}")
         except Exception as e:
             print(f"   [DEBUG] Error installing driver: {e}")
             raise e
+        self.startup_timings["driver"] = time.perf_counter() - phase_start
 
         print("   [DEBUG] Initializing WebDriver...")
+        phase_start = time.perf_counter()
         try:
-            service = Service(path)
-            driver = webdriver.Chrome(service=service, options=options)
+            try:
+                driver = webdriver.Chrome(service=Service(path), options=options)
+            except SessionNotCreatedException as e:
+                # Chrome updated since the driver was cached
+                print(f"   [DEBUG] Driver/Chrome mismatch ({str(e).splitlines()[0]}); refreshing driver...")
+                refresh_start = time.perf_counter()
+                path = resolve_driver_path(refresh=True)
+                self.startup_timings["driver"] += time.perf_counter() - refresh_start
+                driver = webdriver.Chrome(service=Service(path), options=options)
             driver.maximize_window()
+            if self.lean:
+                self._block_urls(driver)
             print("   [DEBUG] WebDriver initialized successfully.")
-            return driver
         except Exception as e:
             print(f"   [DEBUG] Error initializing WebDriver: {e}")
             raise e
+        self.startup_timings["chrome"] = time.perf_counter() - phase_start
+        print("   [DEBUG] Startup: " + ", ".join(f"{k} {v:.2f}s" for k, v in self.startup_timings.items())
+              + f" (total {time.perf_counter() - start:.2f}s)")
+        return driver
+
+    def _block_urls(self, driver):
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": LEAN_BLOCKED_URLS})
+        except WebDriverException as e:
+            print(f"   [DEBUG] URL blocking unavailable, lean mode limited to prefs: {e}")
 
-    def navigate(self, url):
+    def navigate(self, url, wait_for=None, timeout=15, label="navigate"):
+        """
+        Loads a URL and waits until it is usable: until `wait_for` (a CSS selector) is visible
+        if given, otherwise until the DOM goes idle. Records bytes transferred and load time.
+        """
         self.driver.get(url)
-        time.sleep(2)  # Basic wait for render
+        if wait_for:
+            self.wait_for_selector(wait_for, timeout=timeout, label=label)
+        else:
+            self.wait_for_dom_idle(timeout=timeout, label=label)
+        self._record_page(label)
+
+    def _record_page(self, label):
+        try:
+            stats = self.driver.execute_script(PAGE_STATS_JS) or {}
+        except WebDriverException:
+            return
+        _add_stats(self.page_stats, label, [1, stats.get("bytes", 0), stats.get("load_ms", 0)])
+        if self.verbose_waits:
+            print(f"   [Page] {label}: {stats.get('bytes', 0) / 1024:.0f} KB over {stats.get('resources', 0)} resources, "
+                  f"loaded in {stats.get('load_ms', 0) / 1000:.2f}s{' (lean)' if self.lean else ''}")
+
+    def page_summary(self):
+        """Per navigate() call site: pages, average KB transferred and average load seconds."""
+        return {
+            label: {"pages": pages, "avg_kb": round(total_bytes / pages / 1024, 1), "avg_load_s": round(load_ms / pages / 1000, 2)}
+            for label, (pages, total_bytes, load_ms) in sorted(self.page_stats.items())
+        }
+
+    # --- Readiness ---
+
+    def _record_wait(self, label, start, ok):
+        elapsed = time.perf_counter() - start
+        _add_stats(self.wait_stats, label, [1, elapsed, 0 if ok else 1])
+        if self.verbose_waits:
+            print(f"   [Wait] {label}: {elapsed:.2f}s{'' if ok else ' (deadline hit)'}")
+
+    def wait_for(self, condition, timeout=10, label="condition", poll=0.1):
+        """
+        Waits until condition(driver) is truthy (any Selenium expected condition works).
+        Returns its value, or None once the deadline passes.
+        """
+        start = time.perf_counter()
+        try:
+            result = WebDriverWait(self.driver, timeout, poll_frequency=poll).until(condition)
+        except TimeoutException:
+            result = None
+        self._record_wait(label, start, result is not None)
+        return result
+
+    def wait_for_selector(self, selector, timeout=10, visible=True, label=None):
+        """Waits for the first element matching a CSS selector (visible by default). Returns it or None."""
+        locator = (By.CSS_SELECTOR, selector)
+        condition = EC.visibility_of_element_located(locator) if visible else EC.presence_of_element_located(locator)
+        return self.wait_for(condition, timeout=timeout, label=label or selector)
+
+    def wait_for_dom_idle(self, quiet_ms=500, timeout=10, label="dom idle"):
+        """
+        Waits for a quiet period with no DOM mutations and no new network fetches, observed
+        in-page by a MutationObserver. Returns True when idle, False at the deadline.
+        """
+        start = time.perf_counter()
+        try:
+            self.driver.set_script_timeout(timeout + 5)
+            idle = bool(self.driver.execute_async_script(DOM_IDLE_JS, quiet_ms, int(timeout * 1000)))
+        except WebDriverException:
+            # Page navigated away mid-wait, or scripts are blocked
+            idle = False
+        self._record_wait(label, start, idle)
+        return idle
+
+    def wait_for_modal(self, open=True, timeout=10, label=None, selector=MODAL_SELECTOR):
+        """
+        Waits for a modal dialog to finish opening (visible, then settled) or closing (gone).
+        Returns True if the transition completed before the deadline.
+        """
+        label = label or ("modal open" if open else "modal close")
+        locator = (By.CSS_SELECTOR, selector)
+        condition = EC.visibility_of_element_located(locator) if open else EC.invisibility_of_element_located(locator)
+        if not self.wait_for(condition, timeout=timeout, label=label):
+            return False
+        if open:
+            # Let the open animation and first render settle
+            self.wait_for_dom_idle(quiet_ms=300, timeout=3, label=f"{label} settle")
+        return True
+
+    def wait_summary(self):
+        """Per call site: calls, total and average seconds spent waiting, deadline hits."""
+        return {
+            label: {"calls": calls, "total_s": round(total, 2), "avg_s": round(total / calls, 2), "timeouts": timeouts}
+            for label, (calls, total, timeouts) in sorted(self.wait_stats.items(), key=lambda kv: -kv[1][1])
+        }
 
     def current_url(self):
         return self.driver.current_url
@@ -88,3 +352,195 @@ class BrowserEngine:
         except Exception as e:
             logging.warning(f"Failed to type in {selector}: {e}")
             return False
+
+_STOP = object()
+COOKIE_KEYS = ("name", "value", "path", "domain", "secure", "httpOnly", "expiry", "sameSite")
+
+class BrowserPool:
+    """
+    N headless Chrome workers that load pages in parallel, logged in with the session
+    cookies copied from the primary (visible) window. The primary window stays free for
+    searching and the interactive apply flow.
+
+    Each worker owns its driver and thread. A worker is restarted when its page's JS heap
+    exceeds the memory limit, or after `recycle_after` pages, so long runs don't grow unbounded.
+    """
+    def __init__(self, primary, size=2, memory_limit_mb=512, recycle_after=100,
+                 session_url="https://www.linkedin.com/robots.txt", delay=0, lean=True):
+        """
+        :param primary: The logged-in BrowserEngine whose cookies the workers reuse
+        :param size: Number of worker browsers
+        :param memory_limit_mb: Per-worker JS heap cap (V8 flag) and restart threshold; None for no limit
+        :param recycle_after: Restart a worker after this many pages
+        :param session_url: Light page on the session's domain, loaded before setting cookies
+        :param delay: Minimum seconds between page loads of one worker
+        :param lean: Run workers in lean mode (see BrowserEngine)
+        """
+        self.primary = primary
+        self.size = max(1, size)
+        self.memory_limit_mb = memory_limit_mb
+        self.recycle_after = recycle_after
+        self.session_url = session_url
+        self.delay = delay
+        self.lean = lean
+        self.tasks = queue.Queue()
+        self.results = queue.Queue()
+        self.wait_stats = {}
+        self.page_stats = {}
+        self._stats_lock = threading.Lock()
+        self._cookies = []
+        self._threads = []
+        self.pages = 0
+        self.restarts = 0
+
+    def _engine_args(self):
+        if not self.memory_limit_mb:
+            return []
+        return [f"--js-flags=--max-old-space-size={int(self.memory_limit_mb)}", "--renderer-process-limit=1"]
+
+    def _new_engine(self):
+        engine = BrowserEngine(headless=True, verbose_waits=False, extra_args=self._engine_args(), lean=self.lean)
+        # Cookies can only be set for the domain currently loaded
+        engine.driver.get(self.session_url)
+        for cookie in self._cookies:
+            cookie = {k: v for k, v in cookie.items() if k in COOKIE_KEYS}
+            if cookie.get("sameSite") not in ("Strict", "Lax", "None"):
+                cookie.pop("sameSite", None)
+            try:
+                engine.driver.add_cookie(cookie)
+            except WebDriverException:
+                pass # Cookie for another (sub)domain
+        return engine
+
+    def start(self, fetch_fn):
+        """
+        Copies the session and launches the workers.
+        :param fetch_fn: fetch_fn(engine, job) -> description, run on a worker thread
+        """
+        self._cookies = self.primary.driver.get_cookies()
+        start = time.perf_counter()
+        # Drivers are created one at a time; the driver manager isn't safe to run concurrently
+        engines = [self._new_engine() for _ in range(self.size)]
+        print(f"[BrowserPool] {self.size} workers ready in {time.perf_counter() - start:.1f}s "
+              f"({len(self._cookies)} session cookies copied).")
+        for i, engine in enumerate(engines):
+            t = threading.Thread(target=self._worker, args=(engine, fetch_fn), name=f"browser-worker-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def _heap_mb(self, engine):
+        try:
+            used = engine.driver.execute_script("return performance.memory ? performance.memory.usedJSHeapSize : 0;")
+            return (used or 0) / (1024 * 1024)
+        except WebDriverException:
+            return 0
+
+    def _worker(self, engine, fetch_fn):
+        pages = 0
+        last_nav = None
+        job = None
+        try:
+            while True:
+                job = self.tasks.get()
+                if job is _STOP:
+                    return
+                if last_nav is not None and self.delay:
+                    remaining = self.delay - (time.perf_counter() - last_nav)
+                    if remaining > 0:
+                        time.sleep(remaining)
+                last_nav = time.perf_counter()
+                try:
+                    desc = fetch_fn(engine, job)
+                except Exception as e:
+                    print(f"   [BrowserPool] {threading.current_thread().name} failed on {job.get('url')}: {e}")
+                    desc = ""
+                pages += 1
+                with self._stats_lock:
+                    self.pages += 1
+                self.results.put((job, desc))
+                job = None
+
+                heap = self._heap_mb(engine)
+                if pages >= self.recycle_after or (self.memory_limit_mb and heap > self.memory_limit_mb):
+                    print(f"   [BrowserPool] Restarting {threading.current_thread().name} "
+                          f"after {pages} pages ({heap:.0f} MB JS heap).")
+                    pages = 0
+                    # The replacement is started first, so a failed start leaves the worker its old browser
+                    try:
+                        fresh = self._new_engine()
+                    except Exception as e:
+                        print(f"   [BrowserPool] Restart failed, keeping the current browser: {e}")
+                        continue
+                    self._merge_stats(engine)
+                    engine.quit()
+                    engine = fresh
+                    with self._stats_lock:
+                        self.restarts += 1
+        except Exception as e:
+            print(f"   [BrowserPool] {threading.current_thread().name} stopped: {e}")
+            if job is not None and job is not _STOP:
+                # Hand the job back without a description, so map() doesn't wait for it forever
+                self.results.put((job, ""))
+        finally:
+            self._merge_stats(engine)
+            engine.quit()
+
+    def _merge_stats(self, engine):
+        with self._stats_lock:
+            for label, values in engine.wait_stats.items():
+                _add_stats(self.wait_stats, label, values)
+            for label, values in engine.page_stats.items():
+                _add_stats(self.page_stats, label, values)
+            engine.wait_stats, engine.page_stats = {}, {}
+
+    def map(self, jobs, on_idle=None):
+        """
+        Yields (job, description) in completion order while keeping every worker busy.
+        Pulls from `jobs` lazily on the calling thread (it may drive the primary browser),
+        and calls on_idle() there between results, e.g. to run pending apply steps.
+        Raises RuntimeError if every worker has stopped with jobs still queued.
+        """
+        jobs = iter(jobs)
+        in_flight = 0
+        exhausted = False
+        while True:
+            while not exhausted and in_flight < self.size * 2:
+                try:
+                    job = next(jobs)
+                except StopIteration:
+                    exhausted = True
+                    break
+                self.tasks.put(job)
+                in_flight += 1
+            if in_flight == 0:
+                return
+            if on_idle:
+                on_idle()
+            try:
+                job, desc = self.results.get(timeout=0.2)
+            except queue.Empty:
+                if not any(t.is_alive() for t in self._threads) and self.results.empty():
+                    raise RuntimeError(f"All {self.size} browser workers stopped with {in_flight} jobs unfinished")
+                continue
+            in_flight -= 1
+            yield job, desc
+
+    def close(self):
+        """Stops the workers, quits their browsers and folds their wait/page stats into the primary's summaries."""
+        # Drop jobs nobody will consume (the caller stopped early)
+        try:
+            while True:
+                self.tasks.get_nowait()
+        except queue.Empty:
+            pass
+        for _ in self._threads:
+            self.tasks.put(_STOP)
+        for t in self._threads:
+            t.join()
+        prefix = "lean worker" if self.lean else "worker"
+        for label, values in self.wait_stats.items():
+            _add_stats(self.primary.wait_stats, f"{prefix} {label}", values)
+        for label, values in self.page_stats.items():
+            _add_stats(self.primary.page_stats, f"{prefix} {label}", values)
+        self.wait_stats, self.page_stats = {}, {}
+        self._threads = []
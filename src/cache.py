@@ -0,0 +1,120 @@
+import os
+import json
+import time
+import shutil
+import hashlib
+import tempfile
+import threading
+
+DEFAULT_CACHE_DIR = os.path.join("applications", "cache")
+
+class ResultCache:
+    """
+    Content-addressed on-disk cache for LLM results.
+    Entries are keyed by a hash of everything that determines the output
+    (model, prompt template version, inputs), so a hit can be returned as-is.
+    Each entry is one JSON file written atomically (temp file + rename).
+    """
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_entries=2000, max_bytes=200 * 1024 * 1024,
+                 max_age_days=30, enabled=True):
+        """
+        :param cache_dir: Directory holding the cache entries
+        :param max_entries: Evict oldest entries beyond this count
+        :param max_bytes: Evict oldest entries beyond this total size
+        :param max_age_days: Entries older than this are treated as misses and evicted
+        :param enabled: When False, every lookup misses and nothing is stored (--no-cache)
+        """
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_age = max_age_days * 86400
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        if self.enabled:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(*parts):
+        """Stable hash of the given parts (strings or JSON-serializable values)."""
+        raw = json.dumps(parts, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key):
+        """Returns the cached value for key, or None on a miss."""
+        if not self.enabled:
+            return None
+        path = self._path(key)
+        try:
+            if time.time() - os.path.getmtime(path) > self.max_age:
+                os.remove(path)
+                raise FileNotFoundError(path)
+            with open(path, "r", encoding="utf-8") as f:
+                value = json.load(f)
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """Stores value under key atomically, then enforces the eviction limits."""
+        if not self.enabled:
+            return
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(value, f)
+            os.replace(tmp_path, self._path(key))
+        except Exception as e:
+            print(f"[Cache] Failed to write entry: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        self.evict()
+
+    def evict(self):
+        """Drops expired entries, then the oldest ones until within the count and size limits."""
+        now = time.time()
+        entries = []
+        with self._lock:
+            for name in os.listdir(self.cache_dir):
+                if not name.endswith(".json"):
+                    continue
+                path = os.path.join(self.cache_dir, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                if now - st.st_mtime > self.max_age:
+                    os.remove(path)
+                    continue
+                entries.append((st.st_mtime, st.st_size, path))
+
+            entries.sort()
+            total = sum(size for _, size, _ in entries)
+            while entries and (len(entries) > self.max_entries or total > self.max_bytes):
+                _, size, path = entries.pop(0)
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+                total -= size
+
+    def clear(self):
+        """Removes every cache entry."""
+        if os.path.isdir(self.cache_dir):
+            shutil.rmtree(self.cache_dir)
+        if self.enabled:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    def stats(self):
+        total = self.hits + self.misses
+        rate = (self.hits / total * 100) if total else 0.0
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": rate}
@@ -0,0 +1,120 @@
+from .ollama_client import get_default_client
+from .agent import build_resume_prefix
+from .prompts import estimate_tokens, trim_to_tokens, prompt_budget
+from . import schema as json_schema
+
+# Bump whenever the compile prompt or schema changes so stored profiles are rebuilt
+PROFILE_VERSION = 1
+
+# Name under which the compiled profile is stored in the resume's sidecar cache
+PROFILE_ARTIFACT = "profile"
+
+PROFILE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "headline": {"type": "string"},
+        "total_years": {"type": "number", "minimum": 0, "maximum": 60},
+        "titles": {"type": "array", "items": {"type": "string"}},
+        "skills": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "name": {"type": "string"},
+                    "years": {"type": "number", "minimum": 0, "maximum": 60}
+                },
+                "required": ["name", "years"]
+            }
+        },
+        "highlights": {"type": "array", "items": {"type": "string"}},
+        "education": {"type": "array", "items": {"type": "string"}}
+    },
+    "required": ["headline", "total_years", "titles", "skills", "highlights", "education"]
+}
+
+COMPILE_PROMPT = """
+TASK: Compile the RESUME below into a compact candidate profile for a recruiter.
+
+- headline: one line, seniority + main role + domain.
+- total_years: years of professional experience.
+- titles: job titles held, most recent first.
+- skills: every technical or professional skill, with the years of hands-on use (estimate from dates; 0 if unknown).
+- highlights: up to 6 one-line, quantified achievements, most impressive first.
+- education: degrees and certifications, one line each.
+Leave out contact details, addresses, links and references.
+
+RESUME:
+{resume}
+
+Output JSON with the keys: headline, total_years, titles, skills, highlights, education.
+"""
+
+def compile_profile(resume_text, model, client=None):
+    """
+    Turns the full resume text into a structured profile (see PROFILE_SCHEMA) in one
+    schema-constrained generation. Returns the profile dict, or None if the output is unusable.
+    """
+    client = client or get_default_client()
+    budget = prompt_budget(client, "profile") - estimate_tokens(COMPILE_PROMPT)
+    if estimate_tokens(resume_text) > budget:
+        print(f"[Profile] Resume is ~{estimate_tokens(resume_text)} tokens; only the first ~{budget} fit the context window.")
+        resume_text = trim_to_tokens(resume_text, budget)
+    result = client.generate_json(COMPILE_PROMPT.format(resume=resume_text), model=model, format=PROFILE_SCHEMA)
+    if not isinstance(result, dict) or "error" in result:
+        return None
+    profile = json_schema.coerce(result, PROFILE_SCHEMA)
+    # Drop malformed skill entries rather than failing the whole profile over one of them
+    profile["skills"] = [s for s in profile.get("skills", [])
+                         if not json_schema.validate(s, PROFILE_SCHEMA["properties"]["skills"]["items"])]
+    problems = json_schema.validate(profile, PROFILE_SCHEMA)
+    if problems:
+        print(f"[Profile] Compiled profile invalid: {problems[:3]}")
+        return None
+    return profile
+
+def _years(value):
+    return f"{value:g}y" if value else ""
+
+def render_profile(profile):
+    """The profile as dense plain text, the form the prompts send instead of the resume."""
+    lines = [f"Headline: {profile['headline']}"]
+    if profile["total_years"]:
+        lines.append(f"Experience: {profile['total_years']:g} years")
+    if profile["titles"]:
+        lines.append(f"Titles: {'; '.join(profile['titles'])}")
+    if profile["skills"]:
+        skills = sorted(profile["skills"], key=lambda s: -s["years"])
+        lines.append("Skills: " + ", ".join(f"{s['name']} {_years(s['years'])}".strip() for s in skills))
+    if profile["highlights"]:
+        lines.append("Highlights:")
+        lines.extend(f"- {h}" for h in profile["highlights"])
+    if profile["education"]:
+        lines.append(f"Education: {'; '.join(profile['education'])}")
+    return "\n".join(lines)
+
+def load_candidate_profile(resume, model, client=None):
+    """
+    The rendered profile for a loaded Resume, compiled once per resume content (and model) and
+    stored in its sidecar cache. Prints the prompt size with the profile against the raw resume.
+    Returns None if compilation failed, in which case callers send the raw resume text.
+    """
+    stored = resume.get_artifact(PROFILE_ARTIFACT)
+    if stored and stored.get("version") == PROFILE_VERSION and stored.get("model") == model:
+        profile = stored["profile"]
+        source = "cache"
+    else:
+        print(f"[Profile] Compiling candidate profile with {model} (once per resume)...")
+        profile = compile_profile(resume.text, model, client=client)
+        if profile is None:
+            print("[Profile] Compilation failed; prompts will use the raw resume text.")
+            return None
+        resume.put_artifact(PROFILE_ARTIFACT, {"version": PROFILE_VERSION, "model": model, "profile": profile})
+        source = "compiled"
+
+    text = render_profile(profile)
+    before = estimate_tokens(build_resume_prefix(resume.text))
+    after = estimate_tokens(build_resume_prefix(text))
+    print(f"[Profile] Candidate profile ({source}): {len(profile['skills'])} skills, "
+          f"{len(profile['highlights'])} highlights. Shared prompt prefix ~{before} -> ~{after} tokens "
+          f"({len(resume.text)} resume chars, {len(text)} profile chars)")
+    return text
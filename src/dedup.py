@@ -0,0 +1,173 @@
+import re
+import copy
+import json
+import time
+import zlib
+import threading
+import numpy as np
+from .history import DEFAULT_DB_PATH, connect_db
+from .prompts import is_boilerplate
+
+# 128 MinHash permutations, split into 16 LSH bands of 8 rows: pairs with Jaccard
+# similarity around 0.7 and above land in a shared bucket with high probability
+NUM_PERM = 128
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE_WORDS = 5
+DEFAULT_THRESHOLD = 0.8
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_WORD_RE = re.compile(r"[a-z0-9][a-z0-9+#]*")
+
+# Fixed seed: signatures stored by earlier runs must stay comparable
+_rng = np.random.RandomState(1)
+_PERM_A = _rng.randint(1, _MERSENNE_PRIME, size=NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.randint(0, _MERSENNE_PRIME, size=NUM_PERM, dtype=np.uint64)
+
+def shingles(text):
+    """Hashed word 5-grams of the description, without boilerplate lines."""
+    lines = [line for line in text.splitlines() if line.strip() and not is_boilerplate(line.strip())]
+    words = _WORD_RE.findall(" ".join(lines).lower())
+    if len(words) < SHINGLE_WORDS:
+        words = words + [""] * (SHINGLE_WORDS - len(words))
+    return {zlib.crc32(" ".join(words[i:i + SHINGLE_WORDS]).encode("utf-8"))
+            for i in range(len(words) - SHINGLE_WORDS + 1)}
+
+def minhash(text):
+    """MinHash signature of a description: NUM_PERM uint32 values."""
+    hashes = np.fromiter(shingles(text), dtype=np.uint64)
+    # Universal hashing (a*x + b) mod p, in wrapping uint64 arithmetic as datasketch does
+    with np.errstate(over="ignore"):
+        permuted = ((hashes[:, None] * _PERM_A + _PERM_B) % _MERSENNE_PRIME) & _MAX_HASH
+    return permuted.min(axis=0).astype(np.uint32)
+
+def similarity(sig_a, sig_b):
+    """Estimated Jaccard similarity of the shingle sets behind two signatures."""
+    return float(np.mean(sig_a == sig_b))
+
+def _band_keys(signature):
+    return [signature[b * ROWS:(b + 1) * ROWS].tobytes() for b in range(BANDS)]
+
+def adapt_result(result, original, job):
+    """
+    The analysis and draft of a near-duplicate posting, lightly adapted to this one: the
+    earlier posting's title and company are swapped for this one's in the cover letter and email.
+    """
+    adapted = copy.deepcopy(result)
+    adapted["duplicate_of"] = original.get("job_id")
+    materials = adapted.get("materials", {})
+    swaps = [(original.get("company"), job.get("company")), (original.get("title"), job.get("title"))]
+    for key in ("cover_letter", "intro_email"):
+        text = materials.get(key)
+        if not isinstance(text, str):
+            continue
+        for old, new in swaps:
+            if old and new and old != new:
+                text = text.replace(old, new)
+        materials[key] = text
+    return adapted
+
+class NearDuplicateIndex:
+    """
+    Persistent MinHash/LSH index of analysed job descriptions, in the shared SQLite database.
+
+    The same role reposted by an agency, or for another location, under a new job ID has a
+    near-identical description. lookup() finds an earlier analysed posting like that, so its
+    analysis can be reused instead of running inference again. Results are only reused when
+    they were produced in the same context (model, prompt version, candidate).
+    """
+    def __init__(self, db_path=DEFAULT_DB_PATH, threshold=DEFAULT_THRESHOLD):
+        """
+        :param db_path: SQLite database file (shared with ApplicationHistory/ApplicationStore)
+        :param threshold: Minimum estimated Jaccard similarity of two descriptions' word 5-grams
+        """
+        self.db_path = db_path
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self.conn = connect_db(db_path)
+        self._create_tables()
+        # This run's duplicates: cluster_id -> [(job, similarity)]
+        self.run_duplicates = {}
+        self.reused = 0
+
+    def _create_tables(self):
+        with self.conn:
+            self.conn.executescript("""
+                CREATE TABLE IF NOT EXISTS dedup_jobs (
+                    job_id TEXT PRIMARY KEY,
+                    cluster_id TEXT NOT NULL,
+                    title TEXT,
+                    company TEXT,
+                    signature BLOB NOT NULL,
+                    context TEXT,
+                    result TEXT,
+                    created_at REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS dedup_bands (
+                    band INTEGER NOT NULL,
+                    bucket BLOB NOT NULL,
+                    job_id TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_dedup_bands ON dedup_bands(band, bucket);
+                CREATE INDEX IF NOT EXISTS idx_dedup_bands_job ON dedup_bands(job_id);
+                CREATE INDEX IF NOT EXISTS idx_dedup_cluster ON dedup_jobs(cluster_id);
+            """)
+
+    def lookup(self, job_id, signature):
+        """
+        The most similar indexed posting at or above the threshold (excluding job_id itself),
+        as a dict with job_id, cluster_id, title, company, context, result and similarity; or None.
+        """
+        with self._lock:
+            candidates = set()
+            for band, bucket in enumerate(_band_keys(signature)):
+                candidates.update(row[0] for row in self.conn.execute(
+                    "SELECT job_id FROM dedup_bands WHERE band = ? AND bucket = ?", (band, bucket)))
+            candidates.discard(str(job_id))
+            best = None
+            for cid in candidates:
+                row = self.conn.execute(
+                    "SELECT job_id, cluster_id, title, company, signature, context, result FROM dedup_jobs WHERE job_id = ?",
+                    (cid,)).fetchone()
+                if not row:
+                    continue
+                sim = similarity(signature, np.frombuffer(row[4], dtype=np.uint32))
+                if sim >= self.threshold and (best is None or sim > best["similarity"]):
+                    best = {"job_id": row[0], "cluster_id": row[1], "title": row[2], "company": row[3],
+                            "context": row[5], "result": json.loads(row[6]) if row[6] else None, "similarity": sim}
+        return best
+
+    def add(self, job, signature, context=None, result=None, cluster_id=None):
+        """Indexes an analysed posting (and its result, for reuse by later near-duplicates)."""
+        job_id = str(job.get('id', job['url']))
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM dedup_bands WHERE job_id = ?", (job_id,))
+            self.conn.execute("""
+                INSERT OR REPLACE INTO dedup_jobs (job_id, cluster_id, title, company, signature, context, result, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, (job_id, cluster_id or job_id, job.get('title'), job.get('company'), signature.tobytes(),
+                  context, json.dumps(result) if result is not None else None, time.time()))
+            self.conn.executemany("INSERT INTO dedup_bands (band, bucket, job_id) VALUES (?, ?, ?)",
+                                  [(band, bucket, job_id) for band, bucket in enumerate(_band_keys(signature))])
+
+    def record_duplicate(self, job, match, reused):
+        """Notes a near-duplicate seen in this run, for summary()."""
+        with self._lock:
+            self.run_duplicates.setdefault(match["cluster_id"], []).append((job, match["similarity"]))
+            if reused:
+                self.reused += 1
+
+    def summary(self):
+        """[(cluster title, company, [(job, similarity)])] for this run's duplicate clusters, largest first."""
+        with self._lock:
+            clusters = []
+            for cluster_id, members in self.run_duplicates.items():
+                row = self.conn.execute("SELECT title, company FROM dedup_jobs WHERE job_id = ?", (cluster_id,)).fetchone()
+                title, company = row if row else (None, None)
+                clusters.append((title, company, members))
+        return sorted(clusters, key=lambda c: -len(c[2]))
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
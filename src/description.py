@@ -0,0 +1,259 @@
+import os
+import json
+import time
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup
+
+# Containers that hold the job description, most specific first. Shared by the browser
+# extractor and the HTTP fast path.
+DESCRIPTION_SELECTORS = [
+    "[data-testid='expandable-text-box']",
+    ".jobs-description__content",
+    ".jobs-box__html-content",
+    "#job-details",
+    ".description__text",
+    ".show-more-less-html__markup",
+    "article.jobs-description__container",
+    ".job-view-layout .jobs-description"
+]
+
+# "Show more" buttons that un-clamp the description
+EXPAND_SELECTORS = [
+    "[data-testid='expandable-text-button']",
+    ".jobs-description__footer-button",
+    ".show-more-less-html__button"
+]
+
+# Descriptions shorter than this are treated as a failed extraction
+MIN_DESCRIPTION_CHARS = 100
+# A selector counts as a hit when its element holds more than this many characters
+MIN_BLOCK_CHARS = 50
+
+DEFAULT_SELECTOR_STATS_PATH = os.path.join("applications", "selector_stats.json")
+
+# Clicks the first expand button present, lets the page re-render, then reads every
+# description selector in the given order. Returns the first usable block plus per-selector
+# lengths (for hit statistics). arguments: expand selectors, selectors, min chars, callback.
+EXTRACT_DESCRIPTION_JS = """
+const expandSelectors = arguments[0], selectors = arguments[1], minChars = arguments[2];
+const done = arguments[arguments.length - 1];
+let expanded = null, sent = false;
+for (const sel of expandSelectors) {
+    const btn = document.querySelector(sel);
+    if (btn) {
+        try { btn.click(); } catch (e) {}
+        expanded = sel;
+        break;
+    }
+}
+const collect = () => {
+    if (sent) return;
+    sent = true;
+    let best = null;
+    const lengths = {};
+    for (const sel of selectors) {
+        const el = document.querySelector(sel);
+        const text = el ? (el.innerText || '').trim() : '';
+        lengths[sel] = text.length;
+        if (!best && text.length > minChars) best = {selector: sel, text: text};
+    }
+    done({expanded: expanded, best: best, lengths: lengths});
+};
+if (expanded) {
+    // Two frames so the un-clamped layout is in place; the timeout covers throttled rAF
+    requestAnimationFrame(() => requestAnimationFrame(collect));
+    setTimeout(collect, 150);
+} else {
+    collect();
+}
+"""
+
+DEFAULT_USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                      "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+
+try:
+    import lxml # noqa: F401
+    _PARSER = "lxml"
+except ImportError:
+    _PARSER = "html.parser"
+
+def extract_from_html(html, selectors=DESCRIPTION_SELECTORS):
+    """
+    Description text from raw page HTML: the first selector whose element holds more than
+    MIN_BLOCK_CHARS characters, same rule as the browser extractor. Returns "" if none does.
+    """
+    soup = BeautifulSoup(html, _PARSER)
+    for sel in selectors:
+        el = soup.select_one(sel)
+        if el:
+            text = el.get_text("\n", strip=True)
+            if len(text) > MIN_BLOCK_CHARS:
+                return text
+    return ""
+
+class HttpDescriptionFetcher:
+    """
+    Fetches job pages over a pooled keep-alive requests.Session and parses the description
+    out of the server-rendered HTML, without rendering the page in Chrome.
+
+    Pages that only render client-side (e.g. the signed-in SPA) yield too little text;
+    callers fall back to the browser for those.
+    """
+    def __init__(self, cookies=None, pool_size=4, timeout=10, user_agent=DEFAULT_USER_AGENT):
+        """
+        :param cookies: Selenium-style cookie dicts (driver.get_cookies()) to reuse the browser session
+        :param pool_size: Max kept-alive connections per host
+        :param timeout: Seconds per request
+        """
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({"User-Agent": user_agent, "Accept-Language": "en-US,en;q=0.9"})
+        if cookies:
+            self.set_cookies(cookies)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.seconds = 0.0
+
+    def set_cookies(self, cookies):
+        for cookie in cookies:
+            self.session.cookies.set(cookie["name"], cookie["value"],
+                                     domain=cookie.get("domain", ""), path=cookie.get("path", "/"))
+
+    def fetch(self, url):
+        """Returns the description text for a job URL, or "" if the fast path couldn't get one."""
+        start = time.perf_counter()
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+            response.raise_for_status()
+            text = extract_from_html(response.text)
+        except requests.exceptions.RequestException as e:
+            print(f"   [HTTP] Fetch failed for {url}: {e}")
+            text = ""
+        with self._lock:
+            self.seconds += time.perf_counter() - start
+            if len(text) >= MIN_DESCRIPTION_CHARS:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return text
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "avg_ms": round(1000 * self.seconds / total, 1) if total else 0.0
+        }
+
+    def close(self):
+        self.session.close()
+
+class SelectorStats:
+    """
+    Persistent per-selector hit counts. Selectors are ordered by smoothed hit rate, so the
+    one that matches LinkedIn's current DOM is tried first and dead ones sink to the end.
+    """
+    def __init__(self, path=DEFAULT_SELECTOR_STATS_PATH, save_every=20):
+        """
+        :param path: JSON file the counts persist in
+        :param save_every: Write the file after this many recorded pages (and on save())
+        """
+        self.path = path
+        self.save_every = save_every
+        self._lock = threading.Lock()
+        self._dirty = 0
+        self.counts = {}
+        if path and os.path.exists(path):
+            try:
+                with open(path, "r") as f:
+                    self.counts = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"[Selectors] Ignoring unreadable stats: {e}")
+
+    def rate(self, selector):
+        c = self.counts.get(selector, {})
+        # Laplace smoothing: unseen selectors start at 0.5, between proven and dead ones
+        return (c.get("hits", 0) + 1) / (c.get("tries", 0) + 2)
+
+    def order(self, selectors):
+        """Selectors by descending hit rate; ties keep the given order."""
+        with self._lock:
+            return sorted(selectors, key=lambda sel: -self.rate(sel))
+
+    def record(self, lengths):
+        """Records one page: {selector: text length}."""
+        with self._lock:
+            now = time.time()
+            for sel, chars in lengths.items():
+                c = self.counts.setdefault(sel, {"tries": 0, "hits": 0, "last_hit": None})
+                c["tries"] += 1
+                if chars > MIN_BLOCK_CHARS:
+                    c["hits"] += 1
+                    c["last_hit"] = now
+            self._dirty += 1
+            due = self._dirty >= self.save_every
+        if due:
+            self.save()
+
+    def hit_rates(self):
+        """[(selector, tries, hits, hit rate)] best first."""
+        with self._lock:
+            rows = [(sel, c["tries"], c["hits"], c["hits"] / c["tries"] if c["tries"] else 0.0)
+                    for sel, c in self.counts.items()]
+        return sorted(rows, key=lambda r: (-r[3], -r[1]))
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(self.counts, f, indent=2)
+            os.replace(tmp_path, self.path)
+            self._dirty = 0
+
+class DescriptionExtractor:
+    """
+    Extracts the description of the job page open in a browser with one injected script:
+    expand, then read every selector in adaptive order. Shared by all browser workers.
+    """
+    def __init__(self, selectors=DESCRIPTION_SELECTORS, expand_selectors=EXPAND_SELECTORS, stats=None):
+        self.selectors = list(selectors)
+        self.expand_selectors = list(expand_selectors)
+        self.stats = stats or SelectorStats()
+
+    def extract(self, browser):
+        """Returns the description text, or "" if no selector held a usable block."""
+        try:
+            browser.driver.set_script_timeout(10)
+            result = browser.driver.execute_async_script(
+                EXTRACT_DESCRIPTION_JS, self.expand_selectors, self.stats.order(self.selectors), MIN_BLOCK_CHARS
+            ) or {}
+        except Exception as e:
+            print(f"   [DEBUG] Description extraction failed: {e}")
+            return ""
+        self.stats.record(result.get("lengths", {}))
+        if result.get("expanded"):
+            print("   [DEBUG] Clicked 'Show more' button.")
+        best = result.get("best")
+        if not best:
+            return ""
+        print(f"   [DEBUG] Extracted description using: {best['selector']}")
+        return best["text"]
+
+_default_extractor = None
+
+def get_default_extractor():
+    global _default_extractor
+    if _default_extractor is None:
+        _default_extractor = DescriptionExtractor()
+    return _default_extractor
@@ -0,0 +1,178 @@
+import os
+import numpy as np
+import requests
+from .ollama_client import get_default_client, DEFAULT_EMBED_MODEL
+
+DEFAULT_EMBEDDINGS_PATH = os.path.join("applications", "embeddings.npz")
+# Job vectors kept in the cache; the oldest are evicted beyond this
+MAX_CACHED_VECTORS = 5000
+
+class EmbeddingFilter:
+    """
+    Ranks scraped jobs by embedding similarity to the resume before any generation runs.
+
+    The resume is embedded once per run; each job description is embedded once ever
+    (vectors are cached per job ID on disk, up to max_cached). Similarities are computed as
+    one vectorized cosine pass over the stacked job vectors. A job whose vector comes back
+    empty or of the wrong size scores 0 (non-matching) and isn't cached.
+    """
+    def __init__(self, resume_text, client=None, model=DEFAULT_EMBED_MODEL, threshold=None, top_k=None,
+                 cache_path=DEFAULT_EMBEDDINGS_PATH, max_cached=MAX_CACHED_VECTORS):
+        """
+        :param resume_text: Candidate resume text
+        :param client: Shared OllamaClient
+        :param model: Ollama embedding model
+        :param threshold: Skip jobs whose cosine similarity to the resume is below this
+        :param top_k: Only keep the K most similar jobs (buffers the whole stream, see filter())
+        :param cache_path: .npz file holding the per-job-ID embedding cache
+        :param max_cached: Job vectors kept in memory and on disk; the oldest are evicted
+        """
+        self.resume_text = resume_text
+        self.client = client or get_default_client()
+        self.model = model
+        self.threshold = threshold
+        self.top_k = top_k
+        self.cache_path = cache_path
+        self.max_cached = max(1, max_cached)
+        self.skipped = 0
+        self._resume_vec = None
+        self._ids = []
+        self._index = {}
+        self._matrix = None
+        self._pending = {}
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.cache_path):
+            return
+        try:
+            data = np.load(self.cache_path, allow_pickle=False)
+            if str(data["model"]) != self.model:
+                return # Vectors from another model aren't comparable
+            self._ids = [str(i) for i in data["ids"]]
+            self._matrix = data["vectors"].astype(np.float32)
+            self._index = {job_id: row for row, job_id in enumerate(self._ids)}
+        except Exception as e:
+            print(f"[Embeddings] Ignoring unreadable cache: {e}")
+
+    def save(self):
+        """Persists newly computed job vectors into the cache file."""
+        if not self._pending:
+            return
+        self._flush_pending()
+        os.makedirs(os.path.dirname(self.cache_path) or ".", exist_ok=True)
+        tmp_path = self.cache_path + ".tmp.npz"
+        np.savez(tmp_path, model=np.array(self.model), ids=np.array(self._ids), vectors=self._matrix)
+        os.replace(tmp_path, self.cache_path)
+
+    def _flush_pending(self):
+        if not self._pending:
+            return
+        new_ids = list(self._pending)
+        new_rows = np.stack([self._pending[i] for i in new_ids])
+        if self._matrix is not None and self._matrix.shape[1] != new_rows.shape[1]:
+            # The model now returns another size; the old vectors aren't comparable
+            self._ids, self._index, self._matrix = [], {}, None
+        self._matrix = new_rows if self._matrix is None else np.vstack([self._matrix, new_rows])
+        self._ids.extend(new_ids)
+        self._pending = {}
+        # Oldest first, so eviction drops the jobs seen longest ago
+        if len(self._ids) > self.max_cached:
+            self._ids = self._ids[-self.max_cached:]
+            self._matrix = self._matrix[-self.max_cached:]
+        self._index = {job_id: row for row, job_id in enumerate(self._ids)}
+
+    def _embed(self, text):
+        return np.asarray(self.client.embed(text[:8000], model=self.model) or [], dtype=np.float32).ravel()
+
+    def _vector(self, job_id, text, dim):
+        """The job's vector, or None if the server returned one of the wrong size."""
+        if job_id in self._pending:
+            return self._pending[job_id]
+        if job_id in self._index and self._matrix.shape[1] == dim:
+            return self._matrix[self._index[job_id]]
+        vec = self._embed(text)
+        if vec.size != dim:
+            return None
+        self._pending[job_id] = vec
+        if len(self._pending) >= self.max_cached:
+            self._flush_pending()
+        return vec
+
+    def similarities(self, items):
+        """
+        Cosine similarity of each (job, description) pair to the resume, as a NumPy array.
+        """
+        if self._resume_vec is None:
+            vec = self._embed(self.resume_text)
+            if not vec.size:
+                raise ValueError("empty resume embedding")
+            self._resume_vec = vec
+        if not items:
+            return np.zeros(0, dtype=np.float32)
+        dim = self._resume_vec.size
+        rows = []
+        for job, desc in items:
+            vec = self._vector(str(job.get('id', job['url'])), desc, dim)
+            if vec is None:
+                print(f"   [Embeddings] Unusable embedding for {job['title']}; scoring it as non-matching.")
+                vec = np.zeros(dim, dtype=np.float32)
+            rows.append(vec)
+        jobs = np.stack(rows)
+        norms = np.linalg.norm(jobs, axis=1) * np.linalg.norm(self._resume_vec)
+        norms[norms == 0] = 1.0
+        return (jobs @ self._resume_vec) / norms
+
+    def filter(self, stream):
+        """
+        Filters a stream of (job, description) pairs.
+        With only a threshold, jobs pass through one at a time so the pipeline stays overlapped.
+        With top_k, the whole stream is scraped first, ranked in one pass, and the best K yielded.
+        If the embedding model is unavailable, everything passes through unfiltered.
+        """
+        try:
+            if self.top_k:
+                yield from self._filter_top_k(list(stream))
+            else:
+                yield from self._filter_threshold(stream)
+        finally:
+            self.save()
+
+    def _disable(self, error):
+        print(f"[Embeddings] Embedding model '{self.model}' unavailable ({error}); pre-filter disabled.")
+
+    def _filter_threshold(self, stream):
+        enabled = True
+        for job, desc in stream:
+            if enabled:
+                try:
+                    score = float(self.similarities([(job, desc)])[0])
+                except (requests.exceptions.RequestException, ValueError) as e:
+                    self._disable(e)
+                    enabled = False
+                else:
+                    job['similarity'] = round(score, 4)
+                    if self.threshold is not None and score < self.threshold:
+                        print(f"   [Embeddings] Skipping (similarity {score:.2f} < {self.threshold}): {job['title']}")
+                        self.skipped += 1
+                        continue
+            yield job, desc
+
+    def _filter_top_k(self, items):
+        try:
+            scores = self.similarities(items)
+        except (requests.exceptions.RequestException, ValueError) as e:
+            self._disable(e)
+            yield from items
+            return
+
+        kept = 0
+        for idx in np.argsort(-scores):
+            job, desc = items[idx]
+            job['similarity'] = round(float(scores[idx]), 4)
+            if kept >= self.top_k or (self.threshold is not None and scores[idx] < self.threshold):
+                self.skipped += 1
+                continue
+            kept += 1
+            yield job, desc
+        print(f"[Embeddings] Kept top {kept} of {len(items)} jobs by resume similarity.")
@@ -2,6 +2,97 @@ import time
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import StaleElementReferenceException
+
+# Collects every form field in the Easy Apply modal (or the page if no modal is open)
+# in one injected script. Element references come back as WebElements, so filling
+# can act on them without looking them up again.
+FORM_SNAPSHOT_JS = """
+const root = document.querySelector('.jobs-easy-apply-content, [role="dialog"]') || document;
+const visible = el => !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length)
+    && getComputedStyle(el).visibility !== 'hidden';
+const clean = s => (s || '').replace(/\\s+/g, ' ').trim();
+const labelOf = el => {
+    if (el.labels && el.labels.length) return clean(el.labels[0].innerText);
+    const fs = el.closest('fieldset');
+    const legend = fs && fs.querySelector('legend');
+    return clean(el.getAttribute('aria-label') || el.getAttribute('placeholder') || (legend && legend.innerText));
+};
+const errorOf = el => {
+    const group = el.closest('.fb-dash-form-element, .jobs-easy-apply-form-element, fieldset') || el.parentElement;
+    const msg = group && group.querySelector('.artdeco-inline-feedback__message');
+    return msg && visible(msg) ? clean(msg.innerText) : '';
+};
+const required = el => el.required || el.getAttribute('aria-required') === 'true';
+const fields = [];
+
+for (const fs of root.querySelectorAll('fieldset')) {
+    const radios = [...fs.querySelectorAll('input[type="radio"]')];
+    if (!radios.length) continue;
+    const checked = radios.find(r => r.checked);
+    const legend = fs.querySelector('legend');
+    fields.push({
+        kind: 'radio', element: fs, label: clean(legend && legend.innerText), visible: visible(fs),
+        required: radios.some(required), value: checked ? labelOf(checked) : '',
+        options: radios.map(labelOf), error: errorOf(fs)
+    });
+}
+for (const el of root.querySelectorAll('select')) {
+    fields.push({
+        kind: 'select', element: el, label: labelOf(el), visible: visible(el), required: required(el),
+        value: el.value || '', options: [...el.options].map(o => clean(o.text)), error: errorOf(el)
+    });
+}
+for (const el of root.querySelectorAll('input[type="text"], input[type="tel"], input[type="email"], input[type="number"]')) {
+    fields.push({
+        kind: 'text', type: el.type, element: el, label: labelOf(el), visible: visible(el),
+        required: required(el), value: el.value || '', options: [], error: errorOf(el)
+    });
+}
+for (const el of root.querySelectorAll('textarea')) {
+    fields.push({
+        kind: 'textarea', element: el, label: labelOf(el), visible: visible(el), required: required(el),
+        value: el.value || '', options: [], error: errorOf(el)
+    });
+}
+for (const el of root.querySelectorAll('input[type="file"]')) {
+    fields.push({
+        kind: 'file', element: el, label: labelOf(el), visible: visible(el), required: required(el),
+        value: el.value || '', options: [], accept: el.accept || '', error: errorOf(el)
+    });
+}
+const errors = [...document.querySelectorAll('.artdeco-inline-feedback__message')]
+    .filter(visible).map(e => clean(e.innerText));
+return {fields: fields, errors: errors};
+"""
+
+class FormSnapshot:
+    """
+    Point-in-time model of the form: every field with its label, kind, required flag,
+    current value, options and validation message, plus the visible error messages.
+    All decisions run on this in Python, without further WebDriver calls.
+    """
+    def __init__(self, fields, errors, elapsed):
+        self.fields = fields
+        self.errors = errors
+        self.elapsed = elapsed
+
+    @classmethod
+    def capture(cls, driver):
+        start = time.perf_counter()
+        data = driver.execute_script(FORM_SNAPSHOT_JS) or {}
+        return cls(data.get("fields", []), data.get("errors", []), time.perf_counter() - start)
+
+    def visible(self, kind=None):
+        return [f for f in self.fields if f["visible"] and (kind is None or f["kind"] == kind)]
+
+    def of_kind(self, kind):
+        return [f for f in self.fields if f["kind"] == kind]
+
+    def unanswered(self):
+        """Visible radio groups with nothing picked, and visible empty selects, text inputs and textareas."""
+        return [f for f in self.fields
+                if f["visible"] and f["kind"] in ("radio", "select", "text", "textarea") and not f["value"]]
 
 class SmartFiller:
     def __init__(self, browser, config):
@@ -13,109 +104,133 @@ class SmartFiller:
         self.config = config
         self.driver = browser.driver
 
-    def fill_easy_apply_page(self, cover_letter=None):
+    def snapshot(self):
+        """Captures the current form state in one round-trip and reports how long it took."""
+        snap = FormSnapshot.capture(self.driver)
+        print(f"   [SmartFiller] Form scan: {len(snap.fields)} fields, {len(snap.errors)} errors "
+              f"in {snap.elapsed * 1000:.1f} ms (snapshot)")
+        return snap
+
+    def fill_easy_apply_page(self, cover_letter=None, snapshot=None):
         """
         Scans the current modal page and attempts to fill known fields.
         Returns:
             bool: True if it did something or looks safe, False if user intervention needed.
         """
         print("   [SmartFiller] Scanning page...")
-        
+        snap = snapshot or self.snapshot()
+
         # 1. Handle File Upload (Resume)
         # Look or input[type='file']. If present and accepts PDF/Doc, upload resume.
-        file_inputs = self.driver.find_elements(By.CSS_SELECTOR, "input[type='file']")
-        for inp in file_inputs:
+        uploaded = False
+        for field in snap.of_kind("file"):
             # Check if it's already filled? Hard to tell for file inputs usually.
             # But usually LinkedIn asks to upload if not present.
             try:
                 # We assume if there's a file input, it's for the resume/cover letter doc
-                # Check label if possible
                 resume_path = self.config.get('resume_path')
                 if resume_path:
                     # Send keys requires the element to be present, but sometimes hidden.
                     # Selenium handles hidden file inputs usually if we send to the input element itself.
-                    inp.send_keys(resume_path)
+                    field["element"].send_keys(resume_path)
                     print(f"   [SmartFiller] Uploaded resume: {resume_path}")
-                    time.sleep(1)
+                    self.browser.wait_for_dom_idle(quiet_ms=300, timeout=5, label="resume upload")
+                    uploaded = True
             except Exception as e:
                 print(f"   [SmartFiller] upload warning: {e}")
+        if uploaded:
+            # LinkedIn re-renders the step after an upload; the old snapshot's elements may be stale
+            snap = self.snapshot()
 
-        # 2. Handle Text Inputs (Mobile, City, etc.) - simple heuristics
-        text_inputs = self.driver.find_elements(By.CSS_SELECTOR, "input[type='text'], input[type='tel']")
-        for inp in text_inputs:
-            if inp.get_attribute("value"):
-                continue # Already filled (LinkedIn pre-fill)
-            
-            # Label check?
-            # This is hard to do robustly without complex DOM traversal.
-            # For now, we trust LinkedIn pre-fill. If empty + required, we'll flag it.
-            pass
+        # 2. Text Inputs (Mobile, City, etc.): we trust LinkedIn pre-fill.
+        # If empty + required, has_unanswered_questions() flags it.
 
         # 3. Handle Cover Letter (Textarea)
         if cover_letter:
-            textareas = self.driver.find_elements(By.TAG_NAME, "textarea")
-            for ta in textareas:
+            for field in snap.visible("textarea"):
                 # likely the cover letter field if visible
-                if ta.is_displayed():
-                    current_val = ta.get_attribute("value")
-                    if len(current_val) < 10: # Empty or just default text
+                if len(field["value"]) < 10: # Empty or just default text
+                    ta = field["element"]
+                    try:
                         ta.clear()
                         ta.send_keys(cover_letter)
-                        print("   [SmartFiller] Pasted cover letter.")
-                        time.sleep(1)
+                    except StaleElementReferenceException:
+                        print(f"   [SmartFiller] Skipped '{field['label'] or 'textarea'}': the field was re-rendered.")
+                        continue
+                    print("   [SmartFiller] Pasted cover letter.")
+                    self.browser.wait_for_dom_idle(quiet_ms=200, timeout=2, label="cover letter paste")
 
         return True
 
-    def has_unanswered_questions(self):
+    def has_unanswered_questions(self, snapshot=None):
         """
         Checks for visible input fields that might need user attention.
         Returns true if it finds visible radio sets, dropdowns, or empty required text fields.
+        Without a snapshot, falls back to the element-by-element scan (kept for timing comparison).
         """
-        # 1. Radio Buttons (Fieldsets usually)
-        # LinkedIn uses fieldsets for radio groups. If any fieldset is visible, we might need to pick one.
-        # We can perform a rudimentary check: is any radio within it checked?
-        fieldsets = self.driver.find_elements(By.CSS_SELECTOR, "fieldset")
-        for fs in fieldsets:
-            if fs.is_displayed():
-                # Check if any radio child is checked
-                radios = fs.find_elements(By.CSS_SELECTOR, "input[type='radio']")
-                if radios:
-                    is_checked = any(r.is_selected() for r in radios)
-                    if not is_checked:
-                        print("   [SmartFiller] Found unanswered radio question.")
-                        return True
-
-        # 2. Dropdowns (Select)
-        selects = self.driver.find_elements(By.TAG_NAME, "select")
-        for sel in selects:
-             if sel.is_displayed():
-                 # Default value is often empty or "Select..."
-                 if not sel.get_attribute("value"):
-                     print("   [SmartFiller] Found unanswered dropdown.")
-                     return True
+        if snapshot is None:
+            return self._has_unanswered_questions_legacy()
 
-        # 3. Text Inputs (Required ones)
-        # This is strictly heuristics. We look for inputs that are visible and empty.
-        text_inputs = self.driver.find_elements(By.CSS_SELECTOR, "input[type='text'], input[type='tel']")
-        for inp in text_inputs:
-            if inp.is_displayed() and not inp.get_attribute("value"):
-                 print("   [SmartFiller] Found empty text input.")
-                 return True
-
-        # 4. Textareas (Open-ended questions)
-        textareas = self.driver.find_elements(By.TAG_NAME, "textarea")
-        for ta in textareas:
-            if ta.is_displayed() and not ta.get_attribute("value"):
-                 print("   [SmartFiller] Found empty textarea.")
-                 return True
-                 
+        messages = {
+            "radio": "Found unanswered radio question",
+            "select": "Found unanswered dropdown",
+            "text": "Found empty text input",
+            "textarea": "Found empty textarea"
+        }
+        for field in snapshot.unanswered():
+            label = f": {field['label']}" if field["label"] else ""
+            print(f"   [SmartFiller] {messages[field['kind']]}{label}")
+            return True
         return False
 
-    def check_errors(self):
+    def _has_unanswered_questions_legacy(self):
+        start = time.perf_counter()
+        try:
+            # 1. Radio Buttons (Fieldsets usually)
+            fieldsets = self.driver.find_elements(By.CSS_SELECTOR, "fieldset")
+            for fs in fieldsets:
+                if fs.is_displayed():
+                    radios = fs.find_elements(By.CSS_SELECTOR, "input[type='radio']")
+                    if radios:
+                        is_checked = any(r.is_selected() for r in radios)
+                        if not is_checked:
+                            print("   [SmartFiller] Found unanswered radio question.")
+                            return True
+
+            # 2. Dropdowns (Select)
+            selects = self.driver.find_elements(By.TAG_NAME, "select")
+            for sel in selects:
+                 if sel.is_displayed():
+                     if not sel.get_attribute("value"):
+                         print("   [SmartFiller] Found unanswered dropdown.")
+                         return True
+
+            # 3. Text Inputs (Required ones)
+            text_inputs = self.driver.find_elements(By.CSS_SELECTOR, "input[type='text'], input[type='tel']")
+            for inp in text_inputs:
+                if inp.is_displayed() and not inp.get_attribute("value"):
+                     print("   [SmartFiller] Found empty text input.")
+                     return True
+
+            # 4. Textareas (Open-ended questions)
+            textareas = self.driver.find_elements(By.TAG_NAME, "textarea")
+            for ta in textareas:
+                if ta.is_displayed() and not ta.get_attribute("value"):
+                     print("   [SmartFiller] Found empty textarea.")
+                     return True
+
+            return False
+        finally:
+            print(f"   [SmartFiller] Question scan took {(time.perf_counter() - start) * 1000:.1f} ms (element-by-element)")
+
+    def check_errors(self, snapshot=None):
         """Checks for visible error messages on the form."""
-        errors = self.driver.find_elements(By.CSS_SELECTOR, ".artdeco-inline-feedback__message")
-        visible_errors = [e for e in errors if e.is_displayed()]
-        if visible_errors:
-            print(f"   [SmartFiller] Detected {len(visible_errors)} validation errors.")
+        if snapshot is not None:
+            count = len(snapshot.errors)
+        else:
+            errors = self.driver.find_elements(By.CSS_SELECTOR, ".artdeco-inline-feedback__message")
+            count = len([e for e in errors if e.is_displayed()])
+        if count:
+            print(f"   [SmartFiller] Detected {count} validation errors.")
             return True # Has errors
         return False
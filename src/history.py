@@ -0,0 +1,156 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+
+DEFAULT_DB_PATH = os.path.join("applications", "jobaru.db")
+LEGACY_HISTORY_PATH = os.path.join("applications", "history.json")
+
+def connect_db(db_path):
+    """
+    A connection to the shared SQLite database, usable from several threads (callers
+    serialise access with their own lock), in WAL mode so readers don't block the writer.
+    """
+    os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+class ApplicationHistory:
+    """
+    Durable per-job history backed by SQLite (WAL mode).
+
+    `history` holds the current state of each job ID (indexed, O(1)-ish membership checks
+    without loading anything into memory); `history_events` is an append-only log of every
+    state change with its timestamp. compact() trims the log and stale rows.
+    """
+    STATES = ("seen", "drafted", "applied", "failed")
+    # Jobs in these states are not searched / analysed again
+    DONE_STATES = ("drafted", "applied", "failed")
+
+    def __init__(self, db_path=DEFAULT_DB_PATH, legacy_path=LEGACY_HISTORY_PATH, retention_days=90):
+        """
+        :param db_path: SQLite database file
+        :param legacy_path: Old history.json, imported once if present
+        :param retention_days: compact() drops events and never-processed 'seen' rows older than this
+        """
+        self.db_path = db_path
+        self.retention = retention_days * 86400
+        self._lock = threading.Lock()
+        self.conn = connect_db(db_path)
+        self._create_tables()
+        self._import_legacy(legacy_path)
+        self._maybe_compact()
+
+    def _create_tables(self):
+        with self.conn:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS history (
+                    job_id TEXT PRIMARY KEY,
+                    state TEXT NOT NULL,
+                    title TEXT,
+                    company TEXT,
+                    first_seen REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )""")
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS history_events (
+                    job_id TEXT NOT NULL,
+                    state TEXT NOT NULL,
+                    at REAL NOT NULL
+                )""")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_history_events_at ON history_events(at)")
+            self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+
+    def _import_legacy(self, legacy_path):
+        """One-time migration from the old rewrite-everything history.json list."""
+        if not legacy_path or not os.path.exists(legacy_path):
+            return
+        try:
+            with open(legacy_path, 'r') as f:
+                job_ids = json.load(f)
+        except Exception as e:
+            print(f"[History] Could not read legacy history: {e}")
+            return
+        # Old history only recorded attempted applies
+        self.record_many([(str(job_id), "applied", None, None) for job_id in job_ids])
+        os.replace(legacy_path, legacy_path + ".migrated")
+        print(f"[History] Imported {len(job_ids)} jobs from {legacy_path}")
+
+    def __contains__(self, job_id):
+        return self.is_processed(job_id)
+
+    def is_processed(self, job_id):
+        """True if the job was already drafted, applied to, or failed."""
+        with self._lock:
+            row = self.conn.execute("SELECT state FROM history WHERE job_id = ?", (str(job_id),)).fetchone()
+        return bool(row) and row[0] in self.DONE_STATES
+
+    def get_state(self, job_id):
+        with self._lock:
+            row = self.conn.execute("SELECT state FROM history WHERE job_id = ?", (str(job_id),)).fetchone()
+        return row[0] if row else None
+
+    def record(self, job_id, state, title=None, company=None):
+        """Records a state change for one job."""
+        self.record_many([(str(job_id), state, title, company)])
+
+    def record_many(self, rows):
+        """
+        Records (job_id, state, title, company) rows in one transaction.
+        States never go backwards: 'seen' never overwrites a later state and 'drafted' never
+        overwrites an apply outcome (a batched 'drafted' can land after the job was applied to).
+        """
+        if not rows:
+            return
+        for _, state, _, _ in rows:
+            if state not in self.STATES:
+                raise ValueError(f"Unknown history state: {state}")
+        now = time.time()
+        with self._lock, self.conn:
+            self.conn.executemany(
+                "INSERT INTO history_events (job_id, state, at) VALUES (?, ?, ?)",
+                [(str(job_id), state, now) for job_id, state, _, _ in rows]
+            )
+            self.conn.executemany("""
+                INSERT INTO history (job_id, state, title, company, first_seen, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(job_id) DO UPDATE SET
+                    state = CASE
+                        WHEN excluded.state = 'seen' THEN history.state
+                        WHEN excluded.state = 'drafted' AND history.state IN ('applied', 'failed') THEN history.state
+                        ELSE excluded.state
+                    END,
+                    title = COALESCE(excluded.title, history.title),
+                    company = COALESCE(excluded.company, history.company),
+                    updated_at = excluded.updated_at
+            """, [(str(job_id), state, title, company, now, now) for job_id, state, title, company in rows])
+
+    def counts(self):
+        """Number of jobs per current state."""
+        with self._lock:
+            return dict(self.conn.execute("SELECT state, COUNT(*) FROM history GROUP BY state").fetchall())
+
+    def compact(self):
+        """Drops old events and stale 'seen' rows, then reclaims the space."""
+        cutoff = time.time() - self.retention
+        with self._lock:
+            with self.conn:
+                self.conn.execute("DELETE FROM history_events WHERE at < ?", (cutoff,))
+                self.conn.execute("DELETE FROM history WHERE state = 'seen' AND updated_at < ?", (cutoff,))
+                self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('last_compact', ?)", (str(time.time()),))
+            self.conn.execute("VACUUM")
+
+    def _maybe_compact(self, interval_days=7):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'last_compact'").fetchone()
+        if row is None:
+            with self.conn:
+                self.conn.execute("INSERT INTO meta (key, value) VALUES ('last_compact', ?)", (str(time.time()),))
+        elif time.time() - float(row[0]) > interval_days * 86400:
+            self.compact()
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
@@ -0,0 +1,113 @@
+import json
+
+_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', 'b': '\b', 'f': '\f', '"': '"', '\\': '\\', '/': '/'}
+
+class IncrementalJSONParser:
+    """
+    Character-level JSON scanner fed with streamed tokens.
+
+    It tracks nesting so feed() can report the moment the top-level object closes
+    (anything the model adds afterwards is never needed), and it can forward the
+    decoded contents of top-level string fields to sinks while they are still
+    being generated, e.g. {"cover_letter": file.write}.
+    """
+    def __init__(self, field_sinks=None):
+        self.field_sinks = field_sinks or {}
+        self.done = False
+        self._chars = []
+        self._started = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._unicode = None
+        self._high_surrogate = None
+        self._expect_key = False
+        self._key_chars = None
+        self._current_key = None
+        self._sink = None
+
+    @property
+    def text(self):
+        """The JSON text seen so far, starting at the first '{'."""
+        return "".join(self._chars)
+
+    def result(self):
+        """Parses the completed object."""
+        return json.loads(self.text)
+
+    def feed(self, chunk):
+        """Consumes a chunk of model output. Returns True once the top-level object is complete."""
+        for ch in chunk:
+            if self.done:
+                break
+            if not self._started:
+                # Skip any chatter before the object starts
+                if ch == '{':
+                    self._started = True
+                    self._depth = 1
+                    self._expect_key = True
+                    self._chars.append(ch)
+                continue
+
+            self._chars.append(ch)
+            if self._in_string:
+                self._string_char(ch)
+            elif ch == '"':
+                self._in_string = True
+                if self._depth == 1 and self._expect_key:
+                    self._key_chars = []
+                elif self._depth == 1:
+                    self._sink = self.field_sinks.get(self._current_key)
+            elif ch in '{[':
+                self._depth += 1
+            elif ch in '}]':
+                self._depth -= 1
+                if self._depth == 0:
+                    self.done = True
+            elif ch == ',' and self._depth == 1:
+                self._expect_key = True
+            elif ch == ':' and self._depth == 1:
+                self._expect_key = False
+        return self.done
+
+    def _string_char(self, ch):
+        if self._unicode is not None:
+            self._unicode += ch
+            if len(self._unicode) == 4:
+                try:
+                    code = int(self._unicode, 16)
+                except ValueError:
+                    code = 0xFFFD
+                self._unicode = None
+                if 0xD800 <= code < 0xDC00:
+                    # High surrogate: wait for the low half so sinks only ever see valid text
+                    self._high_surrogate = code
+                    return
+                if 0xDC00 <= code < 0xE000 and self._high_surrogate is not None:
+                    code = 0x10000 + ((self._high_surrogate - 0xD800) << 10) + (code - 0xDC00)
+                self._high_surrogate = None
+                self._emit(chr(code) if not 0xD800 <= code < 0xE000 else "\ufffd")
+            return
+        if self._escape:
+            self._escape = False
+            if ch == 'u':
+                self._unicode = ""
+            else:
+                self._emit(_ESCAPES.get(ch, ch))
+            return
+        if ch == '\\':
+            self._escape = True
+        elif ch == '"':
+            self._in_string = False
+            if self._key_chars is not None:
+                self._current_key = "".join(self._key_chars)
+                self._key_chars = None
+            self._sink = None
+        else:
+            self._emit(ch)
+
+    def _emit(self, decoded):
+        if self._key_chars is not None:
+            self._key_chars.append(decoded)
+        elif self._sink:
+            self._sink(decoded)
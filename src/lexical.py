@@ -0,0 +1,141 @@
+import re
+import math
+import numpy as np
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.\-/]*")
+
+STOP_WORDS = frozenset("""
+a about above after again all also am an and any are as at be because been before being below between both but by
+can could did do does doing down during each etc few for from further had has have having he her here hers him his
+how i if in into is it its itself just me more most my no nor not now of off on once only or other our ours out over
+own per same she should so some such than that the their theirs them then there these they this those through to too
+under until up very via was we were what when where which while who whom why will with within without would you your
+yours years year experience work working team teams role strong ability skills skill knowledge plus including using
+looking join new well good great excellent must required preferred responsibilities requirements across help build
+""".split())
+
+# Common skill terms recognised in job descriptions even when the resume doesn't mention them,
+# so they can be reported as missing.
+SKILL_TERMS = frozenset("""
+python java javascript typescript go golang rust c c++ c# ruby php scala kotlin swift r sql nosql bash
+react angular vue node.js node django flask fastapi spring rails .net express next.js
+aws azure gcp docker kubernetes terraform ansible jenkins ci/cd git linux unix serverless lambda
+postgresql postgres mysql mongodb redis elasticsearch kafka spark hadoop airflow snowflake dbt bigquery
+pandas numpy pytorch tensorflow scikit-learn ml ai nlp llm mlops statistics tableau excel powerbi
+graphql rest grpc microservices api apis html css sass webpack agile scrum jira figma
+security oauth networking devops sre observability prometheus grafana datadog
+leadership mentoring communication stakeholder management
+""".split())
+
+def tokenize(text):
+    """Lowercased word tokens that keep tech spellings intact (c++, c#, node.js, ci/cd)."""
+    tokens = []
+    for tok in _TOKEN_RE.findall(text.lower()):
+        tok = tok.rstrip(".-/")
+        if tok and tok not in STOP_WORDS and not tok.isdigit():
+            tokens.append(tok)
+    return tokens
+
+class LexicalScorer:
+    """
+    Zero-LLM fit scorer. Builds a term vocabulary from the resume and scores job
+    descriptions against it with BM25, as a batch over a document-term matrix.
+
+    Besides the BM25 rank it returns, per job, the resume terms the job mentions
+    (matched) and the skill terms it asks for that the resume lacks (missing), plus a
+    0-100 match_score: the share of the job's skill and resume terms that the resume
+    covers, skill terms counting double. match_score depends on the job and the resume
+    only, so a --min-lexical-score threshold means the same for every job in the stream.
+    """
+    def __init__(self, resume_text, k1=1.5, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self.vocab = sorted(set(tokenize(resume_text)))
+        self.term_index = {t: i for i, t in enumerate(self.vocab)}
+        self.skipped = 0
+
+    def match_score(self, tokens):
+        """0-100 coverage of the job's skill and resume terms by the resume."""
+        matched_weight = total = 0
+        for t in set(tokens):
+            skill, known = t in SKILL_TERMS, t in self.term_index
+            if not (skill or known):
+                continue # Words the resume can't be expected to mention
+            weight = 2 if skill else 1
+            total += weight
+            if known:
+                matched_weight += weight
+        return int(round(100 * matched_weight / total)) if total else 0
+
+    def score_batch(self, descriptions):
+        """
+        Scores every description. Returns a list of dicts sorted best-first:
+        {"index", "bm25", "match_score", "matched_skills", "missing_skills"}.
+        IDF and the average length come from this batch alone, so the BM25 ranking within a
+        batch doesn't depend on anything scored before it.
+        """
+        token_lists = [tokenize(d) for d in descriptions]
+        if not token_lists:
+            return []
+        n_docs = len(token_lists)
+        df = {}
+        for tokens in token_lists:
+            for t in set(tokens):
+                df[t] = df.get(t, 0) + 1
+
+        def idf(term):
+            n = df.get(term, 0)
+            return math.log(1 + (n_docs - n + 0.5) / (n + 0.5))
+
+        # Document-term counts restricted to the resume vocabulary
+        tf = np.zeros((n_docs, len(self.vocab)), dtype=np.float32)
+        for row, tokens in enumerate(token_lists):
+            for t in tokens:
+                col = self.term_index.get(t)
+                if col is not None:
+                    tf[row, col] += 1
+
+        doc_len = np.array([len(t) for t in token_lists], dtype=np.float32)
+        avg_len = float(doc_len.mean())
+        idf_vec = np.array([idf(t) for t in self.vocab], dtype=np.float32)
+
+        denom = tf + self.k1 * (1 - self.b + self.b * doc_len[:, None] / max(avg_len, 1.0))
+        contrib = idf_vec[None, :] * tf * (self.k1 + 1) / np.where(denom == 0, 1, denom)
+        bm25 = contrib.sum(axis=1)
+
+        results = []
+        for row, tokens in enumerate(token_lists):
+            hits = np.nonzero(tf[row])[0]
+            matched = [self.vocab[c] for c in hits[np.argsort(-contrib[row, hits])]]
+            missing = sorted({t for t in tokens if t in SKILL_TERMS and t not in self.term_index},
+                             key=lambda t: (-idf(t), t))
+            results.append({
+                "index": row,
+                "bm25": round(float(bm25[row]), 4),
+                "match_score": self.match_score(tokens),
+                "matched_skills": matched[:15],
+                "missing_skills": missing[:15]
+            })
+
+        results.sort(key=lambda r: -r["bm25"])
+        return results
+
+    def rank_jobs(self, jobs, field="title"):
+        """Orders search results (no descriptions yet) best-first by BM25 over one text field."""
+        scored = self.score_batch([job.get(field, "") for job in jobs])
+        return [jobs[r["index"]] for r in scored]
+
+    def filter(self, stream, min_score=None):
+        """
+        Filters a stream of (job, description) pairs as they arrive, attaching the lexical
+        result to job['lexical'] and skipping jobs whose match_score is below min_score.
+        """
+        for job, desc in stream:
+            result = self.score_batch([desc])[0]
+            result.pop("index")
+            job['lexical'] = result
+            if min_score is not None and result["match_score"] < min_score:
+                print(f"   [Lexical] Skipping (match {result['match_score']} < {min_score}): {job['title']}")
+                self.skipped += 1
+                continue
+            yield job, desc
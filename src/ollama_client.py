@@ -1,54 +1,207 @@
 import requests
 import json
+import sys
+import threading
+from requests.adapters import HTTPAdapter
+from .json_stream import IncrementalJSONParser
 
 DEFAULT_MODEL = "mistral"
-OLLAMA_API_URL = "http://localhost:11434/api/generate"
+DEFAULT_EMBED_MODEL = "nomic-embed-text"
+DEFAULT_BASE_URL = "http://localhost:11434"
+DEFAULT_KEEP_ALIVE = "30m"
+# Context window the prompts are budgeted for (matches the Modelfile)
+DEFAULT_NUM_CTX = 4096
+OLLAMA_API_URL = f"{DEFAULT_BASE_URL}/api/generate"
 
-def check_connection():
-    """Checks if Ollama is running."""
-    try:
-        response = requests.get("http://localhost:11434/")
-        return response.status_code == 200
-    except requests.exceptions.ConnectionError:
-        return False
+class OllamaClient:
+    """
+    Reusable Ollama client backed by a pooled, keep-alive requests.Session.
+    Create one per run and share it, so every LLM call reuses the same
+    TCP connection(s) to the Ollama server instead of opening a new one.
+    """
+    def __init__(self, base_url=DEFAULT_BASE_URL, pool_size=4, options=None, timeout=300,
+                 keep_alive=DEFAULT_KEEP_ALIVE, verbose=True):
+        """
+        :param base_url: Root URL of the Ollama server
+        :param pool_size: Max keep-alive connections held open (match the number of inference workers)
+        :param options: Default Ollama model options (e.g. {"temperature": 0.7}), merged into every request
+        :param timeout: Read timeout in seconds for a single generation
+        :param keep_alive: How long Ollama keeps the model (and its evaluated prompt prefix) loaded between calls
+        :param verbose: Print prompt-eval timing after every generation
+        """
+        self.base_url = base_url.rstrip('/')
+        self.options = dict(options or {})
+        self.timeout = timeout
+        self.keep_alive = keep_alive
+        self.verbose = verbose
 
-def generate_response(prompt, model=DEFAULT_MODEL, stream=False):
-    """Generates a response from the Ollama model."""
-    payload = {
-        "model": model,
-        "prompt": prompt,
-        "stream": stream
-    }
-    
-    try:
-        response = requests.post(OLLAMA_API_URL, json=payload)
-        response.raise_for_status()
-        
-        if stream:
-            # Handle streaming if needed, for now assuming non-streaming for simplicity in core logic
-            full_response = ""
+        # Per-call timing reported by Ollama, used to measure prefill savings
+        self.metrics = []
+        self._metrics_lock = threading.Lock()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def _url(self, path):
+        return f"{self.base_url}{path}"
+
+    def check_connection(self):
+        """Checks if Ollama is running."""
+        try:
+            response = self.session.get(self._url("/"), timeout=5)
+            return response.status_code == 200
+        except requests.exceptions.RequestException:
+            return False
+
+    def _payload(self, prompt, model, stream, options, system, format):
+        payload = {
+            "model": model,
+            "prompt": prompt,
+            "stream": stream,
+            "keep_alive": self.keep_alive
+        }
+        if system is not None:
+            payload["system"] = system
+        if format is not None:
+            payload["format"] = format
+        merged_options = {**self.options, **(options or {})}
+        if merged_options:
+            payload["options"] = merged_options
+        return payload
+
+    def generate_response(self, prompt, model=DEFAULT_MODEL, stream=False, options=None, system=None, format=None):
+        """
+        Generates a response from the Ollama model.
+        Pass the part of the prompt that is identical across calls as `system`: Ollama renders it
+        first, so consecutive calls share an already-evaluated prefix.
+        `format` is passed through to Ollama: "json" or a JSON schema dict for constrained decoding.
+        """
+        try:
+            if stream:
+                return "".join(self.stream_response(prompt, model=model, options=options, system=system, format=format))
+
+            payload = self._payload(prompt, model, False, options, system, format)
+            response = self.session.post(self._url("/api/generate"), json=payload, timeout=self.timeout)
+            response.raise_for_status()
+            data = response.json()
+            self._record_metrics(data)
+            return data.get('response', '')
+
+        except requests.exceptions.RequestException as e:
+            return f"Error communicating with Ollama: {str(e)}"
+
+    def stream_response(self, prompt, model=DEFAULT_MODEL, options=None, system=None, format=None):
+        """
+        Yields response tokens as Ollama produces them.
+        Closing the generator early closes the HTTP connection, which makes Ollama stop generating.
+        Raises requests.exceptions.RequestException on transport errors.
+        """
+        payload = self._payload(prompt, model, True, options, system, format)
+        response = self.session.post(self._url("/api/generate"), json=payload, stream=True, timeout=self.timeout)
+        try:
+            response.raise_for_status()
             for line in response.iter_lines():
-                if line:
-                    decoded = json.loads(line.decode('utf-8'))
-                    full_response += decoded.get('response', '')
-                    if decoded.get('done'):
-                        break
-            return full_response
-        else:
-            return response.json().get('response', '')
-            
-    except requests.exceptions.RequestException as e:
-        return f"Error communicating with Ollama: {str(e)}"
+                if not line:
+                    continue
+                decoded = json.loads(line.decode('utf-8'))
+                token = decoded.get('response', '')
+                if token:
+                    yield token
+                if decoded.get('done'):
+                    self._record_metrics(decoded)
+                    break
+        finally:
+            response.close()
 
-def generate_json(prompt, model=DEFAULT_MODEL):
-    """
-    Generates a structured JSON response.
-    Appends instructions to force JSON output.
-    """
-    json_prompt = f"{prompt}\n\nIMPORTANT: Respond ONLY with valid JSON. Do not include markdown formatting or explanations."
-    response_text = generate_response(json_prompt, model=model)
-    
-    # Simple cleanup to find JSON blob if model chatters
+    def generate_json(self, prompt, model=DEFAULT_MODEL, options=None, system=None, format=None,
+                      stream=False, echo=False, field_sinks=None):
+        """
+        Generates a structured JSON response.
+        Appends instructions to force JSON output.
+        With stream=True, tokens are parsed as they arrive (optionally echoed to the terminal and
+        forwarded to field_sinks) and the request is cut off as soon as the top-level object closes.
+        """
+        json_prompt = f"{prompt}\n\nIMPORTANT: Respond ONLY with valid JSON. Do not include markdown formatting or explanations."
+        if not stream:
+            response_text = self.generate_response(json_prompt, model=model, options=options, system=system, format=format)
+            return extract_json(response_text)
+
+        parser = IncrementalJSONParser(field_sinks)
+        raw = []
+        tokens = self.stream_response(json_prompt, model=model, options=options, system=system, format=format)
+        try:
+            for token in tokens:
+                raw.append(token)
+                if echo:
+                    sys.stdout.write(token)
+                    sys.stdout.flush()
+                if parser.feed(token):
+                    # Early stop: Ollama never generates the trailing chatter (and so never sends
+                    # its final timing message for this call)
+                    break
+        except requests.exceptions.RequestException as e:
+            return {"error": f"Error communicating with Ollama: {str(e)}", "raw_response": "".join(raw)}
+        finally:
+            tokens.close()
+            if echo:
+                print()
+
+        if parser.done:
+            try:
+                return parser.result()
+            except json.JSONDecodeError:
+                pass
+        return extract_json("".join(raw))
+
+    def embed(self, text, model=DEFAULT_EMBED_MODEL):
+        """
+        Returns the embedding vector for text (list of floats) from Ollama's embeddings endpoint.
+        Raises requests.exceptions.RequestException on failure.
+        """
+        payload = {"model": model, "prompt": text, "keep_alive": self.keep_alive}
+        response = self.session.post(self._url("/api/embeddings"), json=payload, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json().get("embedding", [])
+
+    def _record_metrics(self, data):
+        """Stores the timing fields Ollama returns with the final response (durations are in ns)."""
+        if "prompt_eval_duration" not in data and "eval_duration" not in data:
+            return
+        entry = {
+            "prompt_eval_count": data.get("prompt_eval_count", 0),
+            "prompt_eval_ms": data.get("prompt_eval_duration", 0) / 1e6,
+            "eval_count": data.get("eval_count", 0),
+            "eval_ms": data.get("eval_duration", 0) / 1e6,
+            "total_ms": data.get("total_duration", 0) / 1e6
+        }
+        with self._metrics_lock:
+            self.metrics.append(entry)
+        if self.verbose:
+            print(f"   [Ollama] prompt eval: {entry['prompt_eval_count']} tokens in {entry['prompt_eval_ms']:.0f} ms | "
+                  f"generation: {entry['eval_count']} tokens in {entry['eval_ms']:.0f} ms")
+
+    def metrics_summary(self):
+        """Aggregate prompt-eval / generation timing over every call made so far."""
+        with self._metrics_lock:
+            calls = list(self.metrics)
+        if not calls:
+            return {"calls": 0}
+        prompt_ms = sum(c["prompt_eval_ms"] for c in calls)
+        return {
+            "calls": len(calls),
+            "prompt_eval_tokens": sum(c["prompt_eval_count"] for c in calls),
+            "prompt_eval_ms": prompt_ms,
+            "avg_prompt_eval_ms": prompt_ms / len(calls),
+            "eval_ms": sum(c["eval_ms"] for c in calls)
+        }
+
+    def close(self):
+        self.session.close()
+
+def extract_json(response_text):
+    """Simple cleanup to find JSON blob if model chatters."""
     try:
         start = response_text.find('{')
         end = response_text.rfind('}') + 1
@@ -59,3 +212,27 @@ def generate_json(prompt, model=DEFAULT_MODEL):
             return {"error": "No JSON found in response", "raw_response": response_text}
     except json.JSONDecodeError:
         return {"error": "Failed to parse JSON", "raw_response": response_text}
+
+# Module-level default client so the legacy function API shares one pool too.
+_default_client = None
+
+def get_default_client():
+    global _default_client
+    if _default_client is None:
+        _default_client = OllamaClient()
+    return _default_client
+
+def check_connection():
+    """Checks if Ollama is running."""
+    return get_default_client().check_connection()
+
+def generate_response(prompt, model=DEFAULT_MODEL, stream=False):
+    """Generates a response from the Ollama model."""
+    return get_default_client().generate_response(prompt, model=model, stream=stream)
+
+def generate_json(prompt, model=DEFAULT_MODEL):
+    """
+    Generates a structured JSON response.
+    Appends instructions to force JSON output.
+    """
+    return get_default_client().generate_json(prompt, model=model)
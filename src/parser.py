@@ -1,29 +0,0 @@
-import os
-import pypdf
-
-def extract_text_from_pdf(pdf_path):
-    """Extracts text from a PDF file."""
-    text = ""
-    try:
-        with open(pdf_path, 'rb') as file:
-            reader = pypdf.PdfReader(file)
-            for page in reader.pages:
-                text += page.extract_text() + "\n"
-    except Exception as e:
-        return f"Error reading PDF: {str(e)}"
-    return text
-
-def extract_text_from_file(file_path):
-    """Detects file type and extracts text accordingly."""
-    if not os.path.exists(file_path):
-        raise FileNotFoundError(f"File not found: {file_path}")
-        
-    _, ext = os.path.splitext(file_path)
-    
-    if ext.lower() == '.pdf':
-        return extract_text_from_pdf(file_path)
-    elif ext.lower() in ['.txt', '.md']:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return f.read()
-    else:
-        raise ValueError(f"Unsupported file format: {ext}")
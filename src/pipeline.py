@@ -0,0 +1,238 @@
+import os
+import json
+import time
+import queue
+import shutil
+import threading
+from .agent import process_job_application, PROMPT_VERSION
+from .cache import ResultCache
+from .dedup import minhash, adapt_result
+from .store import make_application_dir
+
+_STOP = object()
+
+class JobPipeline:
+    """
+    Producer/consumer pipeline for the agent loop.
+
+    The browser thread scrapes descriptions and submits them into a bounded
+    queue. A pool of inference workers drains that queue through Ollama,
+    and a single writer thread persists results. Anything that needs the
+    browser (auto-apply) is handed back to the browser thread, which runs it
+    between scrapes via run_pending_applies(), so WebDriver is never touched
+    from two threads.
+    """
+    def __init__(self, config, client=None, apply_fn=None, inference_workers=1, queue_size=4,
+                 applications_dir="applications", cache=None, history=None, store=None, flush_interval=5,
+                 dedup=None):
+        """
+        :param config: The user configuration dict
+        :param client: Shared OllamaClient
+        :param cache: Optional ResultCache for analyses and drafts
+        :param history: Optional ApplicationHistory; drafted jobs are recorded so later runs skip them
+        :param store: Optional ApplicationStore; results are batched into it (markdown only if export_markdown,
+                      which is also what enables streaming the cover letter to its file)
+        :param flush_interval: Seconds of writer idleness after which buffered results are committed
+        :param dedup: Optional NearDuplicateIndex; near-duplicates of analysed postings reuse their analysis
+        :param apply_fn: Callable(job, result) run on the browser thread when auto-apply is on
+        :param inference_workers: Number of concurrent Ollama generations
+        :param queue_size: Max scraped jobs waiting for inference (back-pressure on the scraper)
+        """
+        self.config = config
+        self.client = client
+        self.cache = cache
+        self.history = history
+        self.store = store
+        self.dedup = dedup
+        self.flush_interval = flush_interval
+        self._drafted = []
+        self.apply_fn = apply_fn
+        self.applications_dir = applications_dir
+        self.inference_workers = max(1, inference_workers)
+
+        self.scrape_queue = queue.Queue(maxsize=max(1, queue_size))
+        self.write_queue = queue.Queue()
+        self.apply_queue = queue.Queue()
+
+        self._workers = []
+        self._writer = None
+        self._closed = False
+        self._aborted = False
+        self._count_lock = threading.Lock()
+        self.saved = 0
+        self.failed = 0
+
+    def start(self):
+        for n in range(self.inference_workers):
+            t = threading.Thread(target=self._inference_worker, name=f"inference-{n}", daemon=True)
+            t.start()
+            self._workers.append(t)
+        self._writer = threading.Thread(target=self._writer_loop, name="writer", daemon=True)
+        self._writer.start()
+
+    def submit(self, job, job_desc):
+        """Queues a scraped job for inference. Blocks while the queue is full, running pending applies meanwhile."""
+        while True:
+            try:
+                self.scrape_queue.put((job, job_desc), timeout=0.5)
+                return
+            except queue.Full:
+                self.run_pending_applies()
+
+    def run_pending_applies(self):
+        """Runs queued auto-apply steps. Must be called from the browser thread."""
+        while True:
+            try:
+                job, result = self.apply_queue.get_nowait()
+            except queue.Empty:
+                return
+            if self.apply_fn and not self._aborted:
+                self.apply_fn(job, result)
+
+    def close(self, abort=False):
+        """
+        Signals end of input and waits for every stage, serving applies until the writer is done.
+        With abort (the run was interrupted), jobs still waiting for inference are dropped and no
+        more applies run; results already generated are still written and committed.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        if abort:
+            self._aborted = True
+            dropped = 0
+            while True:
+                try:
+                    self.scrape_queue.get_nowait()
+                    dropped += 1
+                except queue.Empty:
+                    break
+            if dropped:
+                print(f"   [Pipeline] Dropped {dropped} queued jobs; finishing analyses in progress...")
+        for _ in self._workers:
+            self.scrape_queue.put(_STOP)
+        while any(t.is_alive() for t in self._workers):
+            self.run_pending_applies()
+            time.sleep(0.2)
+        self.write_queue.put(_STOP)
+        while self._writer.is_alive():
+            self.run_pending_applies()
+            time.sleep(0.2)
+        self.run_pending_applies()
+
+    def _inference_worker(self):
+        while True:
+            item = self.scrape_queue.get()
+            if item is _STOP:
+                return
+            job, job_desc = item
+
+            # When streaming with markdown export, the output directory exists up front so the
+            # cover letter can be written to disk while it is generated. With only the store
+            # (the default), drafts are committed whole; streaming still echoes and stops early.
+            stream = self.config.get('stream', False)
+            output_dir = self._make_output_dir(job) if stream and self._exports_markdown() else None
+            cover_letter_path = os.path.join(output_dir, "cover_letter.md") if output_dir else None
+            # The compiled profile is much shorter than the resume it was built from
+            candidate = self.config.get('candidate_profile') or self.config['resume_text']
+            signature = match = context = None
+            if self.dedup:
+                signature = minhash(job_desc)
+                match = self.dedup.lookup(job.get('id', job['url']), signature)
+                # Earlier results are only valid for the same model, prompts and candidate
+                context = ResultCache.make_key("dedup", self.config['model'], PROMPT_VERSION, candidate)
+            if match and match["result"] and match["context"] == context:
+                print(f"   [Dedup] Near-duplicate of {match['title']} at {match['company']} "
+                      f"({match['similarity']:.0%} similar); reusing its analysis and adapting the draft")
+                self.dedup.record_duplicate(job, match, reused=True)
+                result = adapt_result(match["result"], match, job)
+                self.dedup.add(job, signature, context, result, cluster_id=match["cluster_id"])
+                self.write_queue.put((job, job_desc, result, output_dir))
+                continue
+            print(f"   [Inference] Analyzing and drafting: {job['title']}")
+            try:
+                result = process_job_application(candidate, job_desc,
+                                                  model=self.config['model'], client=self.client,
+                                                  cache=self.cache, single_pass=self.config.get('single_pass', False),
+                                                  stream=stream, echo=stream and self.inference_workers == 1,
+                                                  cover_letter_path=cover_letter_path)
+            except Exception as e:
+                result = {"error": "Inference crashed", "details": str(e)}
+
+            if "error" in result:
+                print(f"   [Inference] Error in analysis for {job['title']}: {result['error']}")
+                with self._count_lock:
+                    self.failed += 1
+                if output_dir:
+                    shutil.rmtree(output_dir, ignore_errors=True)
+                continue
+            if self.dedup:
+                if match:
+                    self.dedup.record_duplicate(job, match, reused=False)
+                self.dedup.add(job, signature, context, result, cluster_id=match["cluster_id"] if match else None)
+            self.write_queue.put((job, job_desc, result, output_dir))
+
+    def _exports_markdown(self):
+        # Without a store, the per-job folders are the only output
+        return self.store is None or self.config.get('export_markdown', False)
+
+    def _writer_loop(self):
+        while True:
+            try:
+                item = self.write_queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                # Idle: commit whatever is buffered so a crash loses little
+                self._flush()
+                continue
+            if item is _STOP:
+                self._flush()
+                return
+            job, job_desc, result, output_dir = item
+            try:
+                if self.store:
+                    self._drafted.append((str(job.get('id', job['url'])), "drafted", job.get('title'), job.get('company')))
+                    if self.store.add_result(job, result, job_desc, model=self.config.get('model')):
+                        self._record_drafted()
+                if self._exports_markdown():
+                    output_dir = self._save_result(job, result, output_dir)
+                    print(f"   [Writer] Success! Saved to {output_dir}")
+                else:
+                    print(f"   [Writer] Success! Stored draft for {job['title']}")
+                with self._count_lock:
+                    self.saved += 1
+                if not self.store and self.history:
+                    self.history.record(job.get('id', job['url']), "drafted", job.get('title'), job.get('company'))
+            except Exception as e:
+                print(f"   [Writer] Failed to save {job['title']}: {e}")
+                continue
+
+            if self.config.get('auto_apply'):
+                self.apply_queue.put((job, result))
+
+    def _flush(self):
+        if self.store:
+            self.store.flush()
+            self._record_drafted()
+
+    def _record_drafted(self):
+        # History is only marked once the draft itself is committed, so a crash can't
+        # leave a job marked 'drafted' with no stored draft
+        drafted, self._drafted = self._drafted, []
+        if self.history and drafted:
+            self.history.record_many(drafted)
+
+    def _make_output_dir(self, job):
+        return make_application_dir(self.applications_dir, job.get('id', job['url']), job.get('title'))
+
+    def _save_result(self, job, result, output_dir=None):
+        output_dir = output_dir or self._make_output_dir(job)
+
+        # Save Cover Letter (rewritten even when streamed, so the file holds the final sanitized text)
+        with open(os.path.join(output_dir, "cover_letter.md"), "w", encoding="utf-8") as f:
+            f.write(str(result["materials"].get("cover_letter", "")))
+
+        # Save Metadata
+        with open(os.path.join(output_dir, "job_data.json"), "w", encoding="utf-8") as f:
+            json.dump({**job, "analysis": result}, f, indent=2)
+
+        return output_dir
@@ -1,4 +1,3 @@
-import time
 from .base import JobPlatform
 from ..filler import SmartFiller
 
@@ -12,7 +11,6 @@ class GenericPlatform(JobPlatform):
     def apply_to_job(self, job_url):
         print(f"[Generic] Navigating to {job_url}")
         self.browser.navigate(job_url)
-        time.sleep(3)
         
         # Use Smart Filler
         print("[Generic] Attempting to auto-fill form...")
@@ -1,49 +1,116 @@
 import time
 import os
+import heapq
+from urllib.parse import quote_plus
 from .base import JobPlatform
-from .generic import GenericPlatform
+from ..history import ApplicationHistory
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
+# Overridable with the linkedin_base_url config key (the offline benchmarks point it at fixtures)
+LINKEDIN_URL = "https://www.linkedin.com"
+CARD_SELECTOR = ".job-card-container, li.jobs-search-results__list-item"
+SIGNED_IN_SELECTOR = "#global-nav"
+# Either the signed-in nav bar or a login form, whichever the page turns out to be
+LOGIN_STATE_SELECTOR = "#global-nav, #username, #session_key"
+PAGE_SIZE = 25 # Results per search page (the start= offset step)
+APPLY_BUTTON_SELECTOR = "[data-view-name='job-apply-button'], .jobs-apply-button"
+PRIMARY_BUTTON_SELECTOR = "button.artdeco-button--primary"
+CARD_ANCHOR_SELECTORS = ["a.job-card-list__title", "a.base-card__full-link", "a.job-card-container__link", ".job-card-list__title"]
+
+# Walks the result list in the page and returns plain data for every card, so the
+# whole list costs one WebDriver call. arguments: card selector, anchor selectors.
+EXTRACT_CARDS_JS = """
+const cards = document.querySelectorAll(arguments[0]);
+const anchorSelectors = arguments[1];
+const textOf = (root, selectors) => {
+    for (const sel of selectors) {
+        const el = root.querySelector(sel);
+        if (el && el.innerText && el.innerText.trim()) return el.innerText.trim();
+    }
+    return "";
+};
+const out = [];
+for (const card of cards) {
+    let anchor = null;
+    for (const sel of anchorSelectors) {
+        const el = card.querySelector(sel);
+        if (el && el.getAttribute("href")) { anchor = el; break; }
+    }
+    if (!anchor) continue;
+    const time = card.querySelector("time");
+    out.push({
+        title: (anchor.innerText || "").trim() || anchor.getAttribute("aria-label") || "",
+        url: anchor.href,
+        company: textOf(card, [".job-card-container__company-name", ".artdeco-entity-lockup__subtitle", ".base-search-card__subtitle"]),
+        location: textOf(card, [".job-card-container__metadata-item", ".job-search-card__location"]),
+        posted: time ? (time.getAttribute("datetime") || time.innerText.trim()) : "",
+        job_id: card.getAttribute("data-job-id") || card.getAttribute("data-occludable-job-id") || ""
+    });
+}
+return out;
+"""
+
+# Cards that have a job link (LinkedIn renders empty placeholders until they scroll into view).
+# arguments: card selector, anchor selectors.
+COUNT_CARDS_JS = """
+let n = 0;
+for (const card of document.querySelectorAll(arguments[0])) {
+    if (arguments[1].some(sel => { const a = card.querySelector(sel); return a && a.getAttribute("href"); })) n++;
+}
+return n;
+"""
+
+# Scrolls the results list by one screen (the window if the list isn't scrollable).
+# Returns true once the bottom is reached. arguments: list selector.
+SCROLL_RESULTS_JS = """
+const list = document.querySelector(arguments[0]);
+if (list && list.scrollHeight > list.clientHeight) {
+    list.scrollTop += list.clientHeight;
+    return list.scrollTop + list.clientHeight >= list.scrollHeight - 2;
+}
+window.scrollBy(0, window.innerHeight);
+return window.innerHeight + window.scrollY >= document.documentElement.scrollHeight - 2;
+"""
+
 class LinkedIn(JobPlatform):
     def login(self):
         """
-        Logs in to LinkedIn. 
-        Note: This is sensitive to bot detection. 
-        For this persistent local agent, we assume user logs in once manually 
-        or we use a specified cookie if 'pc space' allows.
-        For now, we pause and ask user to login if not detected.
+        Makes sure the browser is logged in to LinkedIn. Reuses a valid session (e.g. from a
+        persistent Chrome profile) without prompting; otherwise pauses for a manual login,
+        which avoids most bot detection. Returns True if a session is active afterwards.
         """
         print("[LinkedIn] checking login...")
-        self.browser.navigate("https://www.linkedin.com/feed/")
-        if "login" in self.browser.current_url():
-            print("Please log in to LinkedIn in the browser window manually.")
-            input("Press Enter after you have logged in...")
+        start = time.perf_counter()
+        self.browser.navigate(f"{self.base_url}/feed/", wait_for=LOGIN_STATE_SELECTOR, timeout=10, label="login check")
+        if self.is_logged_in():
+            print(f"[LinkedIn] Existing session found; skipping manual login ({time.perf_counter() - start:.1f}s).")
+            self.browser.startup_timings["login"] = time.perf_counter() - start
+            return True
+
+        if "login" not in self.browser.current_url():
+            self.browser.navigate(f"{self.base_url}/login", wait_for=LOGIN_STATE_SELECTOR, timeout=10, label="login page")
+        print("Please log in to LinkedIn in the browser window manually.")
+        input("Press Enter after you have logged in...")
+        self.browser.navigate(f"{self.base_url}/feed/", wait_for=LOGIN_STATE_SELECTOR, timeout=10, label="login check")
+        logged_in = self.is_logged_in()
+        if not logged_in:
+            print("[LinkedIn] Warning: no active session detected; results may be limited.")
+        self.browser.startup_timings["login"] = time.perf_counter() - start
+        return logged_in
+
+    def is_logged_in(self):
+        """True if the current page shows the signed-in navigation bar (not a login/authwall page)."""
+        url = self.browser.current_url()
+        if any(marker in url for marker in ("/login", "/authwall", "/checkpoint", "/uas/")):
+            return False
+        return self.browser.find_element(SIGNED_IN_SELECTOR) is not None
         
-    def __init__(self, browser, config):
+    def __init__(self, browser, config, history=None):
         super().__init__(browser, config)
-        self.history_path = os.path.join("applications", "history.json")
-        self.processed_jobs = self._load_history()
-
-    def _load_history(self):
-        import json
-        if os.path.exists(self.history_path):
-            try:
-                with open(self.history_path, 'r') as f:
-                    return set(json.load(f))
-            except: return set()
-        return set()
-
-    def _save_history(self, job_id):
-        import json
-        self.processed_jobs.add(job_id)
-        try:
-            os.makedirs("applications", exist_ok=True)
-            with open(self.history_path, 'w') as f:
-                json.dump(list(self.processed_jobs), f)
-        except Exception as e:
-            print(f"[Warn] Failed to save history: {e}")
+        self.base_url = config.get('linkedin_base_url', LINKEDIN_URL).rstrip('/')
+        # Queried per job ID; nothing is loaded into memory up front
+        self.history = history or ApplicationHistory()
 
     def _get_job_id(self, url):
         # Extract numeric ID from linkedin url
@@ -51,88 +118,153 @@ class LinkedIn(JobPlatform):
         match = re.search(r"view/(\d+)", url) or re.search(r"currentJobId=(\d+)", url)
         return match.group(1) if match else url
 
-    def search_jobs(self, query, location="Remote"):
+    def search_url(self, query, location="Remote", start=0):
         # Sort by Date (DD) and filter to Past 24 Hours (r86400) to ensure freshness
-        url = f"https://www.linkedin.com/jobs/search/?keywords={query}&location={location}&sortBy=DD&f_TPR=r86400"
-        self.browser.navigate(url)
-        time.sleep(3)
-        
-        job_results = []
-        # Scroll results to load more
-        # Scroll results to load more
-        print("[LinkedIn] Scrolling deeper for more results...")
-        try:
-            results_container = self.browser.driver.find_element(By.CSS_SELECTOR, ".jobs-search-results-list")
-            # Scroll significantly more to load backlog
-            for _ in range(15):
-                self.browser.driver.execute_script("arguments[0].scrollTop = arguments[0].scrollTop + 1000;", results_container)
-                time.sleep(1)
-        except:
-             # Fallback for main window scroll
-             for _ in range(10):
-                self.browser.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(1)
-
-        # Collect cards
-        card_selector = ".job-card-container, li.jobs-search-results__list-item"
-        cards = self.browser.driver.find_elements(By.CSS_SELECTOR, card_selector)
-            
-        print(f"[LinkedIn] Found {len(cards)} total cards. Filtering for fresh ones...")
+        url = (f"{self.base_url}/jobs/search/?keywords={quote_plus(query)}"
+               f"&location={quote_plus(location)}&sortBy=DD&f_TPR=r86400")
+        return url + (f"&start={start}" if start else "")
 
-        processed_count = 0
-        for i, card in enumerate(cards):
-            # Limit to processing 50 fresh jobs per run
-            if len(job_results) >= 50: break
-            
-            try:
-                # Attempt to find anchor (title link)
-                anchor = None
-                selectors = ["a.job-card-list__title", "a.base-card__full-link", "a.job-card-container__link", ".job-card-list__title"]
-                
-                for sel in selectors:
-                    try:
-                        el = card.find_element(By.CSS_SELECTOR, sel)
-                        if el.get_attribute("href"):
-                            anchor = el
-                            break
-                    except: continue
-                
-                if anchor:
-                    url = anchor.get_attribute("href")
-                    job_id = self._get_job_id(url)
-                    
-                    # HISTORY CHECK
-                    if job_id in self.processed_jobs:
-                         # print(f"   [Skip] Already applied: {job_id}")
-                         continue
-                    
-                    title = anchor.text.strip() or anchor.get_attribute("aria-label") or "Unknown Role"
-                    
-                    # Try company
-                    company = "Unknown"
-                    try:
-                        company = card.find_element(By.CSS_SELECTOR, ".job-card-container__company-name").text.strip()
-                    except: pass
-                        
-                    job_results.append({
-                        "title": title,
-                        "company": company,
-                        "url": url,
-                        "id": job_id
-                    })
-            except Exception as e:
-                pass
-        
+    def search_jobs(self, query, location="Remote", limit=50):
+        """
+        Searches one role/location and returns up to `limit` jobs not yet in history.
+        """
+        job_results = list(self.iter_jobs([query], [location], limit=limit))
         print(f"[LinkedIn] Identified {len(job_results)} NEW jobs to apply to.")
         return job_results
-        
-        print(f"[LinkedIn] Returning {len(job_results)} parsed jobs.")
-        return job_results
+
+    def iter_jobs(self, queries, locations, limit=50, max_pages=3):
+        """
+        Lazily yields up to `limit` fresh jobs across every query x location, newest first.
+
+        Each query walks its result pages (start= offset) only when the merged stream needs
+        more jobs. A job ID found by several queries is yielded once, through one index.
+        """
+        streams = [self._search_pages(q, loc, max_pages) for q in queries for loc in locations]
+        # LinkedIn's <time datetime> is often date-only, so within the 24h filter most keys tie.
+        # Ranking by position within the stream on a tie takes same-day jobs round-robin from
+        # every query instead of draining the first one.
+        ranked = [(((job["posted"], -rank), job) for rank, job in enumerate(stream)) for stream in streams]
+        seen_ids = set()
+        fresh = duplicates = 0
+        # Each stream is date-sorted, so a k-way merge keeps the combined stream newest first
+        for _, job in heapq.merge(*ranked, key=lambda item: item[0], reverse=True):
+            if job["id"] in seen_ids:
+                duplicates += 1
+                continue
+            seen_ids.add(job["id"])
+
+            # HISTORY CHECK
+            if self.history.is_processed(job["id"]):
+                continue
+            self.history.record(job["id"], "seen", job["title"], job["company"])
+            fresh += 1
+            yield job
+            if fresh >= limit:
+                break
+        print(f"[LinkedIn] Search done: {fresh} new jobs from {len(streams)} queries "
+              f"({duplicates} cross-query duplicates dropped).")
+
+    def _search_pages(self, query, location, max_pages):
+        """Yields the jobs of one query page by page, newest first within each page."""
+        for page in range(max_pages):
+            self.browser.navigate(self.search_url(query, location, page * PAGE_SIZE),
+                                  wait_for=CARD_SELECTOR, timeout=10, label="search results")
+            # Load the whole page; freshness is judged across queries in iter_jobs()
+            cards = self.load_results(target_fresh=PAGE_SIZE)
+            jobs = {}
+            for card in cards:
+                job = self._parse_card(card)
+                if job and job["id"] not in jobs:
+                    job["query"] = f"{query} @ {location}"
+                    jobs[job["id"]] = job
+            jobs = list(jobs.values())
+            print(f"[LinkedIn] '{query}' in '{location}', page {page + 1}: {len(jobs)} cards.")
+            # Stable sort, so same-day postings keep LinkedIn's order
+            jobs.sort(key=lambda j: j["posted"], reverse=True)
+            yield from jobs
+            if len(jobs) < PAGE_SIZE:
+                return # Last page
+
+    def load_results(self, target_fresh=50, max_scrolls=30, idle_timeout=2.0, plateau=3):
+        """
+        Scrolls the results list until enough fresh (not yet processed) jobs are loaded or the
+        card count stops growing, and returns the raw cards (see extract_cards()).
+
+        After each scroll it waits only until new cards appear, or idle_timeout passes.
+        Stops at the bottom of the list once a scroll adds nothing, or after `plateau`
+        scrolls in a row add nothing.
+        """
+        start = time.perf_counter()
+        driver = self.browser.driver
+        processed = {}  # job ID -> already processed, so history is queried once per card
+        scrolls = stalls = 0
+        reason = "max scrolls"
+
+        while True:
+            cards = self.extract_cards()
+            fresh_ids = set()
+            for card in cards:
+                job = self._parse_card(card)
+                if not job:
+                    continue
+                if job["id"] not in processed:
+                    processed[job["id"]] = self.history.is_processed(job["id"])
+                if not processed[job["id"]]:
+                    fresh_ids.add(job["id"])
+            fresh = len(fresh_ids)
+            if fresh >= target_fresh:
+                reason = "target reached"
+                break
+            if scrolls >= max_scrolls:
+                break
+
+            count = len(cards)
+            at_bottom = driver.execute_script(SCROLL_RESULTS_JS, ".jobs-search-results-list")
+            scrolls += 1
+            grew = self.browser.wait_for(
+                lambda d: d.execute_script(COUNT_CARDS_JS, CARD_SELECTOR, CARD_ANCHOR_SELECTORS) > count,
+                timeout=idle_timeout, label="results scroll"
+            )
+            stalls = 0 if grew else stalls + 1
+            if stalls and (at_bottom or stalls >= plateau):
+                reason = "plateau"
+                break
+
+        print(f"[LinkedIn] Loaded {len(cards)} cards ({fresh} fresh) with {scrolls} scrolls "
+              f"in {time.perf_counter() - start:.1f}s (stopped: {reason}).")
+        return cards
+
+    def extract_cards(self):
+        """Returns the raw result cards on the current search page (list of dicts) via one injected script."""
+        try:
+            return self.browser.driver.execute_script(EXTRACT_CARDS_JS, CARD_SELECTOR, CARD_ANCHOR_SELECTORS) or []
+        except Exception as e:
+            print(f"[LinkedIn] Card extraction failed: {e}")
+            return []
+
+    def _parse_card(self, card):
+        url = card.get("url")
+        if not url:
+            return None
+        job_id = self._get_job_id(url)
+        if job_id == url and card.get("job_id"):
+            job_id = str(card["job_id"])
+        return {
+            "title": card.get("title") or "Unknown Role",
+            "company": card.get("company") or "Unknown",
+            "url": url,
+            "id": job_id,
+            "location": card.get("location") or "",
+            "posted": card.get("posted") or ""
+        }
 
     def apply_to_job(self, job_url, cover_letter=None):
+        """
+        Runs the Easy Apply flow for one job.
+        Returns the outcome: "applied", "external", "not_found", "modal_failed" or "max_steps".
+        """
         print(f"[LinkedIn] Viewing job: {job_url}")
-        self.browser.navigate(job_url)
-        time.sleep(2)
+        self.browser.navigate(job_url, wait_for=APPLY_BUTTON_SELECTOR, timeout=10, label="apply button")
         
         # Check for Easy Apply or External
         # BROAD SEARCH FOR APPLY BUTTON
@@ -197,7 +329,7 @@ class LinkedIn(JobPlatform):
              except Exception as e:
                  print(f"[LinkedIn] Failed to save debug info: {e}")
 
-             return
+             return "not_found"
 
         print("[LinkedIn] 'Apply' button found. Clicking...")
         
@@ -206,28 +338,24 @@ class LinkedIn(JobPlatform):
         try:
             # Scroll into view first
             self.browser.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", easy_apply_btn)
-            time.sleep(1)
+            self.browser.wait_for(EC.element_to_be_clickable(easy_apply_btn), timeout=3, label="apply button clickable")
             
             easy_apply_btn.click()
-            # Wait for modal - Broadened selector and increased timeout
-            WebDriverWait(self.browser.driver, 10).until(
-                lambda d: d.find_element(By.CSS_SELECTOR, ".jobs-easy-apply-content") or 
-                          d.find_element(By.CSS_SELECTOR, "[role='dialog']")
-            )
-            modal_present = True
-        except:
+            # Wait for modal - Broadened selector
+            modal_present = self.browser.wait_for_modal(timeout=10, label="easy apply modal")
+        except Exception:
+            pass
+        if not modal_present:
              print("[LinkedIn] Standard click failed or modal didn't appear. Retrying with JS...")
              try:
                  self.browser.driver.execute_script("arguments[0].click();", easy_apply_btn)
-                 WebDriverWait(self.browser.driver, 10).until(
-                    lambda d: d.find_element(By.CSS_SELECTOR, ".jobs-easy-apply-content") or 
-                              d.find_element(By.CSS_SELECTOR, "[role='dialog']")
-                 )
-                 modal_present = True
+                 modal_present = self.browser.wait_for_modal(timeout=10, label="easy apply modal (js click)")
              except:
                  pass
 
-        time.sleep(3)
+        if not modal_present:
+            # External applies open a new tab instead of the modal
+            self.browser.wait_for(lambda d: len(d.window_handles) > 1, timeout=3, label="external window")
         
         # Check if external (New window) - If so, we are done
         if len(self.browser.driver.window_handles) > 1:
@@ -235,7 +363,7 @@ class LinkedIn(JobPlatform):
             self.browser.driver.switch_to.window(self.browser.driver.window_handles[-1])
             self.browser.driver.close()
             self.browser.driver.switch_to.window(self.browser.driver.window_handles[0])
-            return
+            return "external"
 
         if not modal_present:
              print("[LinkedIn] Error: Easy Apply modal did not appear. (Might be external or blocked).")
@@ -255,7 +383,7 @@ class LinkedIn(JobPlatform):
                  print(f"[LinkedIn] Debug artifacts saved to {debug_dir}")
              except Exception as e: 
                  print(f"[LinkedIn] Failed to save debug info: {e}")
-             return
+             return "modal_failed"
 
         # Internal Easy Apply Flow
         print("[LinkedIn] Starting Easy Apply flow...")
@@ -267,7 +395,8 @@ class LinkedIn(JobPlatform):
         step = 0
         while step < max_steps:
             step += 1
-            time.sleep(2)
+            # The previous click swaps the modal page; wait for it to settle
+            self.browser.wait_for_dom_idle(quiet_ms=300, timeout=5, label="apply step")
             
             # 1. Check for Primary Action Button (Next/Review/Submit)
             # Strategy: Find any visible button that looks like a primary action inside the modal
@@ -289,7 +418,7 @@ class LinkedIn(JobPlatform):
                 
                 # Fallback to just class if text match failed
                 if not primary_btn:
-                     btns = self.browser.driver.find_elements(By.CSS_SELECTOR, "button.artdeco-button--primary")
+                     btns = self.browser.driver.find_elements(By.CSS_SELECTOR, PRIMARY_BUTTON_SELECTOR)
                      for btn in btns:
                          if btn.is_displayed():
                              primary_btn = btn
@@ -298,25 +427,21 @@ class LinkedIn(JobPlatform):
                 print(f"   [Debug] Error finding button: {e}")
 
             if not primary_btn:
-                print("   [Auto-Apply] No primary button found. Waiting 2s more...")
-                time.sleep(2)
+                print("   [Auto-Apply] No primary button found. Waiting for one to appear...")
                 # Retry once
-                btns = self.browser.driver.find_elements(By.CSS_SELECTOR, "button.artdeco-button--primary")
-                for btn in btns:
-                     if btn.is_displayed():
-                         primary_btn = btn
-                         break
+                primary_btn = self.browser.wait_for_selector(PRIMARY_BUTTON_SELECTOR, timeout=4, label="primary button")
                 
             if not primary_btn:
                 # One last check: Did we already succeed? (Greentick / 'Application sent')
                 if "application sent" in self.browser.driver.page_source.lower():
                      print("   [Auto-Apply] Application Sent detected!")
+                     self.history.record(self._get_job_id(job_url), "applied")
                      # Try finding 'Done' button
                      try:
                          done_btn = self.browser.driver.find_element(By.XPATH, "//button[contains(., 'Done')]")
                          done_btn.click()
                      except: pass
-                     return
+                     return "applied"
 
                 print("   [Auto-Apply] Still no primary button. Stuck? Manual intervention needed.")
                 input("   >>> check browser. Press Enter to continue loop...")
@@ -326,11 +451,13 @@ class LinkedIn(JobPlatform):
             print(f"   [Auto-Apply] Step {step}: Found button '{btn_text}'")
 
             # 2. Fill Page
-            filler.fill_easy_apply_page(cover_letter)
+            filler.fill_easy_apply_page(cover_letter, snapshot=filler.snapshot())
             
             # 3. Check for Errors OR Unanswered Questions OR Critical Step
-            has_errors = filler.check_errors()
-            needs_input = filler.has_unanswered_questions()
+            # One fresh scan after filling serves both checks
+            form = filler.snapshot()
+            has_errors = filler.check_errors(form)
+            needs_input = filler.has_unanswered_questions(form)
             
             # Auto-Pause on Submit/Review to let user verify
             is_critical_step = 'submit' in btn_text or 'review' in btn_text
@@ -352,19 +479,23 @@ class LinkedIn(JobPlatform):
                 if 'submit' in btn_text:
                     print("   [Auto-Apply] Submitting application...")
                     primary_btn.click()
-                    time.sleep(3)
                     print("   [Auto-Apply] Application Submitted!")
                     
                     # Verify Success
-                    if "application sent" in self.browser.driver.page_source.lower():
+                    sent = self.browser.wait_for(
+                        lambda d: d.execute_script("return document.body.innerText.toLowerCase().includes('application sent');"),
+                        timeout=8, label="submit confirmation"
+                    )
+                    if sent:
                         print("   [Auto-Apply] Success confirmed.")
+                    self.history.record(self._get_job_id(job_url), "applied")
                     
                     try:
                         dismiss_btn = self.browser.driver.find_element(By.CSS_SELECTOR, "[aria-label='Dismiss']")
                         if dismiss_btn: dismiss_btn.click()
                     except:
                         pass
-                    return
+                    return "applied"
                 else:
                     primary_btn.click()
             except Exception as e:
@@ -373,6 +504,5 @@ class LinkedIn(JobPlatform):
 
         print("[Auto-Apply] Max steps reached.")
         # Mark as processed (even if max steps reached, we tried)
-        # Assuming we can get 'id' context if we pass it, but for now we extract from current URL
-        job_id = self._get_job_id(self.browser.current_url())
-        self._save_history(job_id)
+        self.history.record(self._get_job_id(job_url), "failed")
+        return "max_steps"
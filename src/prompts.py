@@ -0,0 +1,186 @@
+import re
+from .ollama_client import DEFAULT_NUM_CTX
+
+# Rough characters-per-token ratio for English text with Llama/Mistral tokenizers
+CHARS_PER_TOKEN = 4
+# Estimates are rough, so only this share of the computed budget is filled
+SAFETY_MARGIN = 0.9
+# Chat template, the JSON instruction generate_json appends, and similar fixed overhead
+FIXED_OVERHEAD_TOKENS = 64
+
+# Tokens kept free for the generated output, per task
+OUTPUT_TOKENS = {
+    "fit": 400,
+    "materials": 1000,
+    "single_pass": 1400,
+    "repair": 900,
+    "roles": 100,
+    "profile": 700
+}
+
+# Section headings, most relevant first. The rank decides which sections survive when the
+# description doesn't fit its budget; DROP sections are never sent.
+DROP = None
+SECTION_RANKS = [
+    (0, r"requirements|qualifications|what you('ll| will)? (need|bring)|who you are|must[- ]haves?|"
+        r"(required |key |technical )?skills|what we('re| are) looking for|you (have|bring)|about you|"
+        r"(minimum |basic )?experience"),
+    (1, r"responsibilities|what you('ll| will) (do|be doing)|about the (job|role|position)|the role|your role|"
+        r"duties|day[- ]to[- ]day|in this role|(role|job|position) (overview|summary|description)|your impact"),
+    (2, r"nice[- ]to[- ]haves?|preferred|bonus( points)?|pluses|desired|good to have"),
+    (4, r"about (us|the (company|team))|about \w+( \w+)?|who we are|our (mission|story|culture|values|team)|"
+        r"company (overview|description)|why join( us)?|life at"),
+    (5, r"benefits|perks|what we offer|compensation|salary|pay (range|transparency)|why you('ll| will) love"),
+    (DROP, r"equal (employment )?opportunity|eeo|diversity( and| &) inclusion|accommodations?|privacy|"
+           r"disclaimer|legal|e-verify|how to apply|application process")
+]
+_SECTION_RES = [(rank, re.compile(rf"(?:{pattern})\b")) for rank, pattern in SECTION_RANKS]
+# Rank of an untitled or unrecognised section (the intro, usually)
+DEFAULT_RANK = 3
+
+# Lines that are boilerplate wherever they appear: EEO and legal statements, page chrome
+# picked up with the description, tracking hashtags.
+BOILERPLATE_PATTERNS = [
+    r"equal (employment )?opportunity",
+    r"without regard to",
+    r"reasonable accommodation",
+    r"protected veteran",
+    r"sexual orientation|gender identity",
+    r"\be-?verify\b",
+    r"is an? .{0,40}\bemployer\b",
+    r"privacy (policy|notice)",
+    r"(recruit(ment|ing)|staffing) agenc(y|ies)",
+    r"fraudulent|scam",
+    r"^(show|see) (more|less)$",
+    r"^(easy )?apply( now)?$",
+    r"^(save|share|report this job)$",
+    r"^#\w+$",
+    r"^li-\w+$"
+]
+_BOILERPLATE_RES = [re.compile(pattern) for pattern in BOILERPLATE_PATTERNS]
+
+_BULLET_RE = re.compile(r"^[\-\*•·▪–o]\s")
+_HEADING_CLEAN_RE = re.compile(r"^[^\w]+|[\s:?!]+$")
+
+def estimate_tokens(text):
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+def trim_to_tokens(text, max_tokens):
+    """Cuts text to about max_tokens, at a word boundary."""
+    max_chars = max(0, max_tokens) * CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text
+    cut = text[:max_chars]
+    return cut[:cut.rfind(" ")] if " " in cut else cut
+
+def prompt_budget(client, task):
+    """
+    Tokens available to the whole input of a task: the client's num_ctx (falling back to the
+    Modelfile's 4096) minus the output reserved for the task.
+    """
+    num_ctx = (getattr(client, "options", None) or {}).get("num_ctx", DEFAULT_NUM_CTX)
+    return int((num_ctx - OUTPUT_TOKENS[task] - FIXED_OVERHEAD_TOKENS) * SAFETY_MARGIN)
+
+def is_boilerplate(line):
+    lowered = line.lower()
+    return any(p.search(lowered) for p in _BOILERPLATE_RES)
+
+def _heading_rank(line):
+    """The rank of a heading line, DEFAULT_RANK for an unknown heading, or False for body text."""
+    if _BULLET_RE.match(line) or line.endswith(".") or len(line) > 60:
+        return False
+    title = _HEADING_CLEAN_RE.sub("", line).lower()
+    if not title or len(title.split()) > 6:
+        return False
+    colon = line.rstrip().endswith(":")
+    for rank, pattern in _SECTION_RES:
+        # The whole line must be the heading; a line that only starts with one ("Experience
+        # with Kubernetes", "About 50% travel") is body text unless it ends with a colon
+        if pattern.fullmatch(title) or (colon and pattern.match(title)):
+            return rank
+    return DEFAULT_RANK if colon else False
+
+def split_sections(text):
+    """
+    Splits a description into sections at recognised headings.
+    Returns [{"heading", "rank", "lines", "stripped"}] in document order; boilerplate and
+    repeated lines are removed and counted under "stripped".
+    """
+    sections = [{"heading": None, "rank": DEFAULT_RANK, "lines": [], "stripped": 0}]
+    seen = set()
+    for raw in text.splitlines():
+        line = " ".join(raw.split())
+        if not line:
+            continue
+        rank = _heading_rank(line)
+        if rank is not False:
+            sections.append({"heading": line, "rank": rank, "lines": [], "stripped": 0})
+            continue
+        # Expanded descriptions often repeat lines (the clamped preview plus the full text)
+        if is_boilerplate(line) or line in seen:
+            sections[-1]["stripped"] += 1
+            continue
+        seen.add(line)
+        sections[-1]["lines"].append(line)
+    return [s for s in sections if s["lines"] or s["stripped"]]
+
+def fit_job_description(text, budget):
+    """
+    The job description rewritten to fit budget tokens: boilerplate lines and sections are
+    removed, then sections are taken strictly by rank (requirements, responsibilities,
+    nice-to-haves, untitled, company, benefits). The first section that doesn't fit whole is
+    cut to the remaining budget and everything ranked below it is left out. Kept sections
+    stay in document order. Returns (text, stats).
+    """
+    sections = split_sections(text)
+    stats = {
+        "tokens_in": estimate_tokens(text),
+        "budget": budget,
+        "stripped_lines": sum(s["stripped"] for s in sections),
+        "dropped": []
+    }
+    order = sorted(range(len(sections)), key=lambda i: (sections[i]["rank"] is DROP, sections[i]["rank"] or 0, i))
+    kept = {}
+    remaining = budget
+    for i in order:
+        section = sections[i]
+        heading = section["heading"]
+        if not section["lines"]:
+            # Nothing left after stripping boilerplate and repeated lines; not a budget cut
+            continue
+        if section["rank"] is DROP or remaining <= 8:
+            if heading:
+                stats["dropped"].append(heading)
+            continue
+        lines = ([heading] if heading else []) + section["lines"]
+        partial = []
+        for line in lines:
+            line_cost = estimate_tokens(line) + 1
+            if line_cost > remaining:
+                if remaining > 8:
+                    partial.append(trim_to_tokens(line, remaining - 1))
+                # Lower-ranked sections only get budget this one didn't need
+                remaining = 0
+                break
+            partial.append(line)
+            remaining -= line_cost
+        if len(partial) > (1 if heading else 0):
+            kept[i] = partial
+        if heading and len(partial) < len(lines):
+            stats["dropped"].append(f"{heading} (partly)" if i in kept else heading)
+    result = "\n".join(line for i in sorted(kept) for line in kept[i])
+    stats["tokens_out"] = estimate_tokens(result)
+    return result, stats
+
+def render_with_description(template, job_description, client, system, task, **fields):
+    """
+    Formats a prompt template around a job description fitted into what is left of the
+    task's budget after the system prefix and the rest of the prompt.
+    """
+    overhead = estimate_tokens(system or "") + estimate_tokens(template.format(job_description="", **fields))
+    description, stats = fit_job_description(job_description, prompt_budget(client, task) - overhead)
+    if stats["tokens_out"] < stats["tokens_in"]:
+        dropped = f"; dropped: {', '.join(stats['dropped'])}" if stats["dropped"] else ""
+        print(f"   [Prompt] {task}: description ~{stats['tokens_in']} -> ~{stats['tokens_out']} tokens "
+              f"(budget {stats['budget']}, {stats['stripped_lines']} boilerplate/duplicate lines stripped{dropped})")
+    return template.format(job_description=description, **fields)
@@ -1,28 +1,135 @@
-
 import os
+import json
+import time
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
 try:
     from pypdf import PdfReader
 except ImportError:
     PdfReader = None
 
-def extract_text_from_pdf(pdf_path):
+DEFAULT_RESUME_CACHE_DIR = os.path.join("applications", "resume_cache")
+# Below this many pages, worker process start-up costs more than it saves
+PARALLEL_MIN_PAGES = 4
+
+def _extract_page_range(args):
+    """Extracts a contiguous range of pages in a worker process (each opens its own reader)."""
+    pdf_path, start, stop = args
+    reader = PdfReader(pdf_path)
+    return [reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
+def extract_text_from_pdf(pdf_path, max_workers=None):
+    """
+    Extracts text from a PDF, one string per page joined at the end. Documents with many
+    pages are split into page ranges extracted in parallel processes.
+    """
     if not PdfReader:
         # Fallback or error if pypdf not available
         return ""
     try:
         reader = PdfReader(pdf_path)
-        text = ""
-        for page in reader.pages:
-            text += page.extract_text() + "\n"
-        return text
+        n_pages = len(reader.pages)
+        if n_pages < PARALLEL_MIN_PAGES:
+            pages = [page.extract_text() or "" for page in reader.pages]
+        else:
+            workers = min(max_workers or os.cpu_count() or 1, n_pages)
+            step = -(-n_pages // workers)
+            ranges = [(pdf_path, start, min(start + step, n_pages)) for start in range(0, n_pages, step)]
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                pages = [text for chunk in pool.map(_extract_page_range, ranges) for text in chunk]
+        return "\n".join(pages) + "\n"
     except Exception as e:
         print(f"Error reading PDF: {e}")
         return ""
 
-def load_resume_text(path):
+def _read_text(path):
     if path.lower().endswith('.pdf'):
         return extract_text_from_pdf(path)
+    # Assume text/md
+    with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+        return f.read()
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+class Resume:
+    """
+    An ingested resume: its text plus derived artifacts (e.g. a compiled profile), cached
+    in a sidecar file keyed by the content hash so they're only rebuilt when the file changes.
+    """
+    def __init__(self, path, fingerprint, text, artifacts, sidecar_path):
+        self.path = path
+        self.fingerprint = fingerprint
+        self.text = text
+        self.artifacts = artifacts
+        self.sidecar_path = sidecar_path
+
+    @property
+    def sha256(self):
+        return self.fingerprint["sha256"]
+
+    def get_artifact(self, name):
+        return self.artifacts.get(name)
+
+    def put_artifact(self, name, value):
+        """Stores a derived artifact (JSON-serialisable) alongside the cached text."""
+        self.artifacts[name] = value
+        _write_json(self.sidecar_path, {"text": self.text, "artifacts": self.artifacts})
+
+def _read_json(path, default):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+def _write_json(path, data):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+def load_resume(path, cache_dir=DEFAULT_RESUME_CACHE_DIR):
+    """
+    Loads a resume through the sidecar cache.
+    The file is fingerprinted by size and mtime first; the content is only hashed when those
+    changed, and only re-parsed when the hash did too.
+    """
+    start = time.perf_counter()
+    path = os.path.abspath(path)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"File not found: {path}")
+    stat = os.stat(path)
+    index_path = os.path.join(cache_dir, "index.json")
+    index = _read_json(index_path, {})
+
+    known = index.get(path)
+    if known and known["size"] == stat.st_size and known["mtime"] == stat.st_mtime:
+        sha = known["sha256"]
     else:
-        # Assume text/md
-        with open(path, 'r', encoding='utf-8', errors='ignore') as f:
-            return f.read()
+        sha = _sha256(path)
+    fingerprint = {"size": stat.st_size, "mtime": stat.st_mtime, "sha256": sha}
+
+    sidecar_path = os.path.join(cache_dir, f"{sha}.json")
+    cached = _read_json(sidecar_path, None)
+    if cached is not None:
+        source = "cache"
+    else:
+        cached = {"text": _read_text(path), "artifacts": {}}
+        _write_json(sidecar_path, cached)
+        source = "parsed"
+    if known != fingerprint:
+        index[path] = fingerprint
+        _write_json(index_path, index)
+
+    print(f"[Resume] Loaded {os.path.basename(path)} ({source}, {sha[:8]}, "
+          f"{len(cached['text'])} chars) in {(time.perf_counter() - start) * 1000:.0f} ms")
+    return Resume(path, fingerprint, cached["text"], cached.get("artifacts", {}), sidecar_path)
+
+def load_resume_text(path):
+    return load_resume(path).text
@@ -0,0 +1,159 @@
+import re
+import json
+
+# Subset of JSON Schema understood by validate(): type, properties, required,
+# items, minimum, maximum. This is also what we hand to Ollama's `format`.
+_TYPES = {
+    "object": dict,
+    "array": list,
+    "string": str,
+    "integer": int,
+    "number": (int, float),
+    "boolean": bool
+}
+_LEADING_NUMBER_RE = re.compile(r"\s*(-?\d+(?:\.\d+)?)")
+
+def validate(value, schema, path="$"):
+    """
+    Validates value against a (small subset of) JSON Schema.
+    Returns a list of (path, message) problems; empty means valid.
+    """
+    errors = []
+    expected = schema.get("type")
+    if expected:
+        py_type = _TYPES[expected]
+        # bool is an int subclass in Python; don't let True pass as a score
+        if not isinstance(value, py_type) or (expected in ("integer", "number") and isinstance(value, bool)):
+            return [(path, f"expected {expected}, got {type(value).__name__}")]
+
+    if expected == "object":
+        for key in schema.get("required", []):
+            if key not in value:
+                errors.append((f"{path}.{key}", "missing"))
+        for key, sub in schema.get("properties", {}).items():
+            if key in value:
+                errors.extend(validate(value[key], sub, f"{path}.{key}"))
+    elif expected == "array" and "items" in schema:
+        for i, item in enumerate(value):
+            errors.extend(validate(item, schema["items"], f"{path}[{i}]"))
+    elif expected in ("integer", "number"):
+        if "minimum" in schema and value < schema["minimum"]:
+            errors.append((path, f"below minimum {schema['minimum']}"))
+        if "maximum" in schema and value > schema["maximum"]:
+            errors.append((path, f"above maximum {schema['maximum']}"))
+    return errors
+
+def coerce(value, schema):
+    """
+    Best-effort local repair of common model slip-ups, without another generation:
+    numbers as strings, out-of-range scores, comma-separated strings instead of lists,
+    nested {"text": ...} objects instead of strings. Returns the repaired value.
+    """
+    expected = schema.get("type")
+    if expected == "object" and isinstance(value, dict):
+        props = schema.get("properties", {})
+        return {k: coerce(v, props[k]) if k in props else v for k, v in value.items()}
+
+    if expected == "array":
+        if isinstance(value, str):
+            value = [part.strip() for part in value.split(",") if part.strip()]
+        if isinstance(value, list) and "items" in schema:
+            return [coerce(v, schema["items"]) for v in value]
+        return value
+
+    if expected == "string":
+        if isinstance(value, dict):
+            return value.get("text") or value.get("body") or json.dumps(value)
+        if value is None:
+            return ""
+        return value if isinstance(value, str) else str(value)
+
+    if expected in ("integer", "number"):
+        if isinstance(value, str):
+            # Only the leading number: "85/100" is 85, "85%" is 85
+            match = _LEADING_NUMBER_RE.match(value)
+            if not match:
+                return value
+            value = float(match.group(1))
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            if "minimum" in schema:
+                value = max(schema["minimum"], value)
+            if "maximum" in schema:
+                value = min(schema["maximum"], value)
+            return int(round(value)) if expected == "integer" else value
+    return value
+
+def close_truncated_json(text):
+    """
+    Salvages a JSON object that was cut off mid-generation (e.g. hit num_predict or the context
+    limit) by closing any open string, array and object.
+    Returns (result, cut): the parsed dict or None, and whether the value of its last key was
+    still being written when the text stopped (so may be incomplete) rather than finished.
+    """
+    start = text.find('{')
+    if start == -1:
+        return None, False
+    stack = []
+    in_string = False
+    escaped = False
+    in_key = False       # The open string is a top-level key
+    after_colon = False  # A top-level key has been written and its value not yet finished
+    last_comma = None    # Offset of the last top-level comma
+    body = text[start:]
+    for i, ch in enumerate(body):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == '\\':
+                escaped = True
+            elif ch == '"':
+                in_string = in_key = False
+        elif ch == '"':
+            in_string = True
+            in_key = len(stack) == 1 and not after_colon
+        elif ch in '{[':
+            stack.append('}' if ch == '{' else ']')
+        elif ch in '}]' and stack:
+            stack.pop()
+        elif len(stack) == 1 and ch == ':':
+            after_colon = True
+        elif len(stack) == 1 and ch == ',':
+            after_colon = False
+            last_comma = i
+
+    candidate = body
+    if escaped:
+        candidate = candidate[:-1]
+    if in_string:
+        candidate += '"'
+    candidate = candidate.rstrip().rstrip(',')
+    # A dangling "key": with no value can't be closed meaningfully
+    if candidate.endswith(':'):
+        candidate = candidate[:candidate.rfind(',')] if ',' in candidate else candidate[:1]
+        cut = False
+    elif len(stack) > 1 or (in_string and not in_key):
+        cut = True # Inside the last value's string, array or object
+    else:
+        # A finished string/array/object, or a bare number or literal that may have more digits
+        cut = after_colon and not candidate.endswith(('"', ']', '}'))
+    if not in_key:
+        try:
+            result = json.loads(candidate + ''.join(reversed(stack)))
+            return (result, cut) if isinstance(result, dict) else (None, False)
+        except json.JSONDecodeError:
+            pass
+    # Cut inside a key or a literal: keep only the fields before it
+    try:
+        result = json.loads(body[:last_comma] + '}') if last_comma is not None else None
+    except json.JSONDecodeError:
+        return None, False
+    return (result, False) if isinstance(result, dict) else (None, False)
+
+def sub_schema(schema, keys):
+    """Object schema restricted to the given top-level keys (used for targeted repair requests)."""
+    props = schema.get("properties", {})
+    return {
+        "type": "object",
+        "properties": {k: props[k] for k in keys if k in props},
+        "required": [k for k in keys if k in props]
+    }
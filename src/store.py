@@ -0,0 +1,269 @@
+import os
+import json
+import time
+import threading
+from collections import Counter
+from .history import DEFAULT_DB_PATH, connect_db
+
+def _safe_name(text):
+    return "".join([c for c in text if c.isalnum() or c==' ']).strip().replace(' ', '_')
+
+def make_application_dir(out_dir, job_id, title=None):
+    """
+    Creates the <timestamp>_<title>_<job id>/ folder for one job's markdown files. The job ID
+    keeps jobs with the same title, written within the same second, in separate folders.
+    """
+    output_dir = os.path.join(out_dir, f"{time.strftime('%Y%m%d_%H%M%S')}_{_safe_name(title or 'job')}"
+                                       f"_{_safe_name(str(job_id))[-32:]}")
+    os.makedirs(output_dir, exist_ok=True)
+    return output_dir
+
+class ApplicationStore:
+    """
+    Embedded SQLite store for scraped jobs, fit analyses, drafts and apply outcomes.
+    Shares the database file with ApplicationHistory.
+
+    Results are buffered and written in batches, each batch in a single transaction,
+    so the agent loop doesn't pay an fsync per job. Markdown files are only produced
+    on demand via export_markdown().
+    """
+    def __init__(self, db_path=DEFAULT_DB_PATH, batch_size=10):
+        """
+        :param db_path: SQLite database file
+        :param batch_size: Buffered results that trigger a flush
+        """
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self._buffer = []
+        self._lock = threading.Lock()
+        self.conn = connect_db(db_path)
+        self._create_tables()
+
+    def _create_tables(self):
+        with self.conn:
+            self.conn.executescript("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    job_id TEXT PRIMARY KEY,
+                    title TEXT,
+                    company TEXT,
+                    url TEXT,
+                    location TEXT,
+                    description TEXT,
+                    extra TEXT,
+                    created_at REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS analyses (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    job_id TEXT NOT NULL,
+                    model TEXT,
+                    match_score INTEGER,
+                    matched_skills TEXT,
+                    missing_skills TEXT,
+                    analysis TEXT,
+                    created_at REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS drafts (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    job_id TEXT NOT NULL,
+                    cover_letter TEXT,
+                    intro_email TEXT,
+                    created_at REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS outcomes (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    job_id TEXT NOT NULL,
+                    outcome TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_jobs_company ON jobs(company);
+                CREATE INDEX IF NOT EXISTS idx_jobs_created ON jobs(created_at);
+                CREATE INDEX IF NOT EXISTS idx_analyses_job ON analyses(job_id);
+                CREATE INDEX IF NOT EXISTS idx_analyses_score ON analyses(match_score);
+                CREATE INDEX IF NOT EXISTS idx_analyses_created ON analyses(created_at);
+                CREATE INDEX IF NOT EXISTS idx_drafts_job ON drafts(job_id);
+                CREATE INDEX IF NOT EXISTS idx_outcomes_job ON outcomes(job_id);
+            """)
+
+    # --- Writes ---
+
+    def add_result(self, job, result, description="", model=None):
+        """
+        Buffers one processed job (job dict + process_job_application result).
+        Flushes when the batch is full; returns True if it did (this result included).
+        """
+        with self._lock:
+            self._buffer.append((dict(job), result, description, model, time.time()))
+            full = len(self._buffer) >= self.batch_size
+        if full:
+            self.flush()
+        return full
+
+    def flush(self):
+        """Writes all buffered results in one transaction."""
+        with self._lock:
+            batch, self._buffer = self._buffer, []
+            if not batch:
+                return
+            jobs, analyses, drafts = [], [], []
+            for job, result, description, model, at in batch:
+                job_id = str(job.get('id', job.get('url')))
+                known = {'id', 'title', 'company', 'url', 'location'}
+                extra = {k: v for k, v in job.items() if k not in known}
+                jobs.append((job_id, job.get('title'), job.get('company'), job.get('url'), job.get('location'),
+                             description, json.dumps(extra), at))
+                analysis = result.get("analysis", {})
+                analyses.append((job_id, model, _as_int(analysis.get("match_score")),
+                                 json.dumps(analysis.get("matched_skills", [])),
+                                 json.dumps(analysis.get("missing_skills", [])),
+                                 str(analysis.get("analysis", "")), at))
+                materials = result.get("materials", {})
+                drafts.append((job_id, materials.get("cover_letter", ""), materials.get("intro_email", ""), at))
+
+            with self.conn:
+                self.conn.executemany("""
+                    INSERT INTO jobs (job_id, title, company, url, location, description, extra, created_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(job_id) DO UPDATE SET
+                        title = excluded.title, company = excluded.company, url = excluded.url,
+                        location = COALESCE(excluded.location, jobs.location),
+                        description = excluded.description, extra = excluded.extra
+                """, jobs)
+                self.conn.executemany("""
+                    INSERT INTO analyses (job_id, model, match_score, matched_skills, missing_skills, analysis, created_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)""", analyses)
+                self.conn.executemany("""
+                    INSERT INTO drafts (job_id, cover_letter, intro_email, created_at)
+                    VALUES (?, ?, ?, ?)""", drafts)
+
+    def record_outcome(self, job_id, outcome):
+        """Records an apply outcome (e.g. applied, failed, external, not_found)."""
+        with self._lock, self.conn:
+            self.conn.execute("INSERT INTO outcomes (job_id, outcome, created_at) VALUES (?, ?, ?)",
+                              (str(job_id), outcome, time.time()))
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            self.conn.close()
+
+    # --- Queries ---
+
+    def query_jobs(self, company=None, min_score=None, since=None, limit=50):
+        """
+        Latest analysis per job, newest first.
+        :param company: Case-insensitive substring match on company
+        :param min_score: Minimum match score
+        :param since: Only jobs analysed at/after this epoch timestamp
+        """
+        sql = """
+            SELECT j.job_id, j.title, j.company, j.url, a.match_score, a.created_at,
+                   (SELECT outcome FROM outcomes o WHERE o.job_id = j.job_id ORDER BY o.created_at DESC LIMIT 1)
+            FROM jobs j
+            JOIN analyses a ON a.id = (SELECT MAX(id) FROM analyses WHERE job_id = j.job_id)
+            WHERE 1 = 1
+        """
+        params = []
+        if company:
+            sql += " AND j.company LIKE ?"
+            params.append(f"%{company}%")
+        if min_score is not None:
+            sql += " AND a.match_score >= ?"
+            params.append(min_score)
+        if since is not None:
+            sql += " AND a.created_at >= ?"
+            params.append(since)
+        sql += " ORDER BY a.created_at DESC LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self.conn.execute(sql, params).fetchall()
+        keys = ("job_id", "title", "company", "url", "match_score", "analysed_at", "outcome")
+        return [dict(zip(keys, row)) for row in rows]
+
+    def missing_skill_counts(self, top=20):
+        """Most frequently missing skills across the latest analysis of every job."""
+        with self._lock:
+            rows = self.conn.execute("""
+                SELECT missing_skills FROM analyses
+                WHERE id IN (SELECT MAX(id) FROM analyses GROUP BY job_id)
+            """).fetchall()
+        counts = Counter()
+        for (raw,) in rows:
+            try:
+                skills = json.loads(raw or "[]")
+            except ValueError:
+                continue
+            counts.update({str(s).strip().lower() for s in skills if str(s).strip()})
+        return counts.most_common(top)
+
+    def get_job(self, job_id):
+        """Job row with its latest analysis and draft, or None."""
+        with self._lock:
+            job = self.conn.execute(
+                "SELECT job_id, title, company, url, location, description, extra FROM jobs WHERE job_id = ?",
+                (str(job_id),)).fetchone()
+            if not job:
+                return None
+            analysis = self.conn.execute("""
+                SELECT match_score, matched_skills, missing_skills, analysis, model FROM analyses
+                WHERE job_id = ? ORDER BY id DESC LIMIT 1""", (str(job_id),)).fetchone()
+            draft = self.conn.execute("""
+                SELECT cover_letter, intro_email FROM drafts
+                WHERE job_id = ? ORDER BY id DESC LIMIT 1""", (str(job_id),)).fetchone()
+        record = {
+            "id": job[0], "title": job[1], "company": job[2], "url": job[3], "location": job[4],
+            "description": job[5], **json.loads(job[6] or "{}")
+        }
+        if analysis:
+            record["analysis"] = {
+                "match_score": analysis[0],
+                "matched_skills": json.loads(analysis[1] or "[]"),
+                "missing_skills": json.loads(analysis[2] or "[]"),
+                "analysis": analysis[3],
+                "model": analysis[4]
+            }
+        if draft:
+            record["materials"] = {"cover_letter": draft[0], "intro_email": draft[1]}
+        return record
+
+    def job_ids(self):
+        with self._lock:
+            return [row[0] for row in self.conn.execute("SELECT job_id FROM jobs ORDER BY created_at")]
+
+    # --- Markdown export / import ---
+
+    def export_markdown(self, job_id, out_dir="applications"):
+        """Writes the classic <timestamp>_<title>/ folder (cover_letter.md + job_data.json) for one job."""
+        record = self.get_job(job_id)
+        if not record:
+            return None
+        output_dir = make_application_dir(out_dir, record["id"], record.get('title'))
+        materials = record.get("materials", {})
+        with open(os.path.join(output_dir, "cover_letter.md"), "w", encoding="utf-8") as f:
+            f.write(str(materials.get("cover_letter", "")))
+        with open(os.path.join(output_dir, "job_data.json"), "w", encoding="utf-8") as f:
+            json.dump({k: v for k, v in record.items() if k != "description"}, f, indent=2)
+        return output_dir
+
+    def import_legacy_dirs(self, applications_dir="applications"):
+        """Imports old per-job folders (job_data.json) into the store. Returns the number imported."""
+        count = 0
+        for name in sorted(os.listdir(applications_dir)):
+            path = os.path.join(applications_dir, name, "job_data.json")
+            if not os.path.isfile(path):
+                continue
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                continue
+            result = data.pop("analysis", {}) or {}
+            self.add_result(data, result)
+            count += 1
+        self.flush()
+        return count
+
+def _as_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None